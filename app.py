@@ -3,11 +3,16 @@ BOLETAS-V1 - Aplicación Web Flask
 Sistema de Generación de Boletas de Pago
 """
 
-from flask import Flask, render_template, request, jsonify, send_file, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, send_file, session, redirect, url_for, g, Response
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash, check_password_hash
 from functools import wraps
+import gzip
 import os
+import threading
+import time
+import zlib
+from io import BytesIO
 from datetime import datetime
 
 from config.empresa import EmpresaConfig
@@ -15,7 +20,17 @@ from models.boleta_mensual import BoletaMensual
 from models.boleta_aguinaldo import BoletaAguinaldo
 from models.boleta_liquidacion import BoletaLiquidacion
 from models.empleado import Empleado, EmpleadoManager
+from models.importacion import leer_planilla, formato_de
+from models.registro_boletas import registro_boletas
 from generators.pdf_generator import PDFGenerator
+from generators.lote import GeneradorLoteMensual
+from generators.planilla import csv_planilla, renderizar_planilla, validar_periodo
+from generators.recursos import recursos_cache
+from generators.cache_render import render_cache
+from generators.almacen import almacen_pdf
+from generators.instrumentacion import instrumentacion
+from tareas.cola import ColaTrabajos
+from monitoreo.metricas import metricas
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'boletas-v1-secret-key-2025'
@@ -30,16 +45,36 @@ os.makedirs('config', exist_ok=True)
 # Configuración de empresa
 empresa_config = EmpresaConfig()
 
+# Almacén de PDFs: mover a sus particiones los archivos de la carpeta plana anterior
+almacen_pdf.migrar()
+
 # Gestor de empleados
 empleado_manager = EmpleadoManager()
 
+# Cola de trabajos en segundo plano (los hilos se inician al registrar los tipos)
+cola_trabajos = ColaTrabajos()
+
 # Extensiones permitidas para logos
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
 
+# Sugerencias del selector de empleados: campos por defecto y máximo por consulta
+CAMPOS_SUGERENCIA = 'id,nombre_completo,ci,cargo'
+MAX_SUGERENCIAS = 50
+
+# Tamaño máximo de página de /api/empleados
+MAX_PAGINA_EMPLEADOS = 1000
+
+# Compresión de respuestas JSON: tamaño mínimo y sufijo del ETag de la variante gzip
+MIN_BYTES_GZIP = 1024
+SUFIJO_GZIP = '-gzip'
+
 # Credenciales de usuario (en producción usar base de datos)
 USUARIO = "Santandera#25"
 PASSWORD_HASH = generate_password_hash("Santandera#25")
 
+# Token opcional para proteger /metrics (Authorization: Bearer <token>)
+METRICAS_TOKEN = os.environ.get('BOLETAS_METRICAS_TOKEN')
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -52,6 +87,70 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def _ruta_metricas():
+    """Plantilla de la ruta atendida (evita una serie por cada id o archivo)"""
+    return request.url_rule.rule if request.url_rule is not None else 'sin_ruta'
+
+@app.before_request
+def iniciar_medicion():
+    g.inicio_peticion = time.perf_counter()
+
+@app.before_request
+def refrescar_configuracion():
+    """Toma los datos de empresa que haya guardado otro worker (un stat por petición)"""
+    empresa_config.refrescar()
+
+@app.after_request
+def registrar_metricas(response):
+    """Cuenta la petición y su latencia por ruta"""
+    inicio = g.pop('inicio_peticion', None)
+    if inicio is not None:
+        ruta = _ruta_metricas()
+        metricas.incrementar('boletas_http_requests_total',
+                             {'metodo': request.method, 'ruta': ruta, 'estado': response.status_code})
+        metricas.observar('boletas_http_request_duration_seconds', time.perf_counter() - inicio, {'ruta': ruta})
+        if response.status_code >= 400:
+            metricas.incrementar('boletas_errores_total', {'ruta': ruta, 'estado': response.status_code})
+    return response
+
+@app.after_request
+def comprimir_respuesta(response):
+    """Comprime con gzip las respuestas JSON grandes si el cliente lo acepta"""
+    if (response.mimetype != 'application/json' or response.status_code != 200
+            or response.direct_passthrough or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '')):
+        return response
+    cuerpo = response.get_data()
+    if len(cuerpo) < MIN_BYTES_GZIP:
+        return response
+    response.set_data(gzip.compress(cuerpo, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    # Cada codificación es una representación distinta: su propio ETag fuerte
+    etag, debil = response.get_etag()
+    if etag:
+        response.set_etag(etag + SUFIJO_GZIP, weak=debil)
+    return response
+
+@app.teardown_request
+def registrar_excepcion(error):
+    """Cuenta las excepciones que no controló ningún endpoint"""
+    if error is not None:
+        metricas.incrementar('boletas_excepciones_total',
+                             {'ruta': _ruta_metricas(), 'tipo': type(error).__name__})
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Métricas de todos los procesos en formato de texto de Prometheus"""
+    if METRICAS_TOKEN and request.headers.get('Authorization') != f"Bearer {METRICAS_TOKEN}":
+        return Response('No autorizado\n', status=401, mimetype='text/plain')
+    try:
+        texto = metricas.exportar()
+    except TimeoutError:
+        # Otro proceso retiene el bloqueo de las métricas: mejor un scrape fallido que un total inconsistente
+        return Response('Métricas ocupadas, reintente\n', status=503, mimetype='text/plain')
+    return Response(texto, mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/login', methods=['GET'])
 def login():
     """Página de inicio de sesión"""
@@ -160,6 +259,58 @@ def save_empresa():
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
+def _responder_boleta(tipo, boleta, data):
+    """
+    Genera el PDF de una boleta y arma la respuesta
+    
+    Con ?directo=1 el PDF se genera en memoria y se devuelve en la misma
+    respuesta. La boleta se registra antes de responder; solo la copia en
+    output/ se escribe en segundo plano, salvo que se envíe "persistir": false
+    (su PDF se regenera desde /api/download con los datos del registro). Sin el parámetro se guarda en output/ y se
+    devuelve el nombre del archivo para /api/download. La boleta mensual
+    acepta "motor": "canvas" para el dibujo directo sin layout platypus.
+    """
+    pdf_gen = PDFGenerator(empresa_config)
+    motor = data.get('motor', 'platypus')
+    
+    if request.args.get('directo') == '1':
+        # Sin copia en disco el PDF se regenera en cada descarga: queda en caché
+        persistir = data.get('persistir', True)
+        contenido = pdf_gen.renderizar(tipo, boleta, motor, cache=not persistir)
+        filename = pdf_gen.nombre_archivo(tipo, boleta)
+        # El número ya se usó: la boleta queda registrada aunque el proceso
+        # termine antes de escribir el archivo, que se regenera si falta
+        pdf_gen.registrar([(tipo, boleta)], motor)
+        if persistir:
+            threading.Thread(target=pdf_gen.guardar_boleta, args=(tipo, boleta, contenido, motor, False),
+                             daemon=True).start()
+        
+        response = send_file(BytesIO(contenido), mimetype='application/pdf',
+                             as_attachment=True, download_name=filename)
+        response.headers['X-Numero-Boleta'] = boleta.numero_boleta
+        return response
+    
+    filename = pdf_gen.generar(tipo, boleta, motor)
+    return jsonify({
+        'success': True,
+        'message': 'Boleta generada correctamente',
+        'filename': os.path.basename(filename),
+        'numero_boleta': boleta.numero_boleta
+    })
+
+# Constructores de boletas por tipo a partir de los datos del formulario
+CREADORES_BOLETA = {
+    'mensual': BoletaMensual.from_payload,
+    'aguinaldo': BoletaAguinaldo.from_payload,
+    'liquidacion': BoletaLiquidacion.from_payload,
+}
+
+def _nueva_boleta(tipo, data):
+    """Crea una boleta del tipo indicado y le asigna el siguiente número"""
+    boleta = CREADORES_BOLETA[tipo](data)
+    boleta.numero_boleta = empresa_config.get_next_numero_boleta()
+    return boleta
+
 @app.route('/api/boleta/mensual', methods=['POST'])
 @login_required
 def generar_boleta_mensual():
@@ -167,42 +318,59 @@ def generar_boleta_mensual():
     try:
         data = request.json
         
-        # Crear boleta
-        boleta = BoletaMensual()
-        boleta.nombre_completo = data.get('nombre_completo', '')
-        boleta.ci = data.get('ci', '')
-        boleta.cargo = data.get('cargo', '')
-        boleta.mes_pago = data.get('mes_pago', '')
-        boleta.anio = int(data.get('anio', datetime.now().year))
-        boleta.rango_fechas = data.get('rango_fechas', '')
-        
-        # Ingresos
-        boleta.haber_basico = float(data.get('haber_basico', 0))
-        boleta.horas_extra = float(data.get('horas_extra', 0))
-        boleta.bono_antiguedad = float(data.get('bono_antiguedad', 0))
-        boleta.otros_ingresos = float(data.get('otros_ingresos', 0))
-        
-        # Egresos
-        boleta.faltas = float(data.get('faltas', 0))
-        boleta.retrasos = float(data.get('retrasos', 0))
-        boleta.reposiciones = float(data.get('reposiciones', 0))
-        boleta.otros_egresos = float(data.get('otros_egresos', 0))
-        
-        # Fecha, número y método de pago
-        fecha_str = data.get('fecha_emision', datetime.now().strftime("%d/%m/%Y"))
-        boleta.fecha_emision = datetime.strptime(fecha_str, "%d/%m/%Y")
-        boleta.numero_boleta = empresa_config.get_next_numero_boleta()
-        boleta.metodo_pago = data.get('metodo_pago', 'EFECTIVO')
+        boleta = _nueva_boleta('mensual', data)
         
         # Generar PDF
-        pdf_gen = PDFGenerator(empresa_config)
-        filename = pdf_gen.generar_boleta_mensual(boleta)
+        return _responder_boleta('mensual', boleta, data)
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+def _generar_lote_mensual(data):
+    """
+    Genera el lote de boletas mensuales descrito por data
+    
+    Returns:
+        dict: Manifiesto del lote (ver GeneradorLoteMensual.generar)
+    """
+    periodo = {
+        'mes_pago': data.get('mes_pago', ''),
+        'anio': int(data.get('anio', datetime.now().year)),
+        'fecha_emision': data.get('fecha_emision', datetime.now().strftime("%d/%m/%Y")),
+        'rango_fechas': data.get('rango_fechas', ''),
+        'metodo_pago': data.get('metodo_pago', 'EFECTIVO')
+    }
+    
+    # Ajustes por empleado: {ci: {campo: monto}}
+    ajustes = data.get('ajustes', {})
+    
+    # Por defecto se incluye toda la planilla; opcionalmente solo algunos IDs
+    empleados = empleado_manager.obtener_empleados()
+    ids = data.get('empleados')
+    if ids:
+        ids = {int(i) for i in ids}
+        empleados = [emp for emp in empleados if emp['id'] in ids]
+    
+    if not empleados:
+        raise ValueError('No hay empleados para generar boletas')
+    
+    # Opcionales: impresión dos por hoja ("copias" o "lote") y PDF consolidado
+    generador = GeneradorLoteMensual(empresa_config, motor=data.get('motor', 'platypus'))
+    return generador.generar(empleados, periodo, ajustes,
+                             impresion=data.get('impresion'),
+                             individuales=data.get('individuales', True),
+                             consolidado=data.get('consolidado', False))
+
+@app.route('/api/boleta/mensual/lote', methods=['POST'])
+@login_required
+def generar_lote_mensual():
+    """Genera las boletas mensuales de toda la planilla para un período"""
+    try:
+        manifiesto = _generar_lote_mensual(request.json)
         
         return jsonify({
-            'success': True,
-            'message': 'Boleta generada correctamente',
-            'filename': os.path.basename(filename),
-            'numero_boleta': boleta.numero_boleta
+            'success': not manifiesto['errores'],
+            'message': f"{manifiesto['generadas']} de {manifiesto['total']} boletas generadas",
+            'manifiesto': manifiesto
         })
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
@@ -214,34 +382,10 @@ def generar_boleta_aguinaldo():
     try:
         data = request.json
         
-        # Crear boleta
-        boleta = BoletaAguinaldo()
-        boleta.nombre_completo = data.get('nombre_completo', '')
-        boleta.ci = data.get('ci', '')
-        boleta.cargo = data.get('cargo', '')
-        boleta.anio = int(data.get('anio', datetime.now().year))
-        boleta.fecha_ingreso = data.get('fecha_ingreso', '')
-        boleta.fecha_inicio = data.get('fecha_inicio', '')
-        boleta.fecha_fin = data.get('fecha_fin', '')
-        boleta.promedio_ultimos_3_pagos = float(data.get('promedio_ultimos_3_pagos', 0))
-        boleta.otros = float(data.get('otros', 0))
-        
-        # Fecha, número y método de pago
-        fecha_str = data.get('fecha_emision', datetime.now().strftime("%d/%m/%Y"))
-        boleta.fecha_emision = datetime.strptime(fecha_str, "%d/%m/%Y")
-        boleta.numero_boleta = empresa_config.get_next_numero_boleta()
-        boleta.metodo_pago = data.get('metodo_pago', 'EFECTIVO')
+        boleta = _nueva_boleta('aguinaldo', data)
         
         # Generar PDF
-        pdf_gen = PDFGenerator(empresa_config)
-        filename = pdf_gen.generar_boleta_aguinaldo(boleta)
-        
-        return jsonify({
-            'success': True,
-            'message': 'Boleta generada correctamente',
-            'filename': os.path.basename(filename),
-            'numero_boleta': boleta.numero_boleta
-        })
+        return _responder_boleta('aguinaldo', boleta, data)
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
@@ -252,71 +396,307 @@ def generar_boleta_liquidacion():
     try:
         data = request.json
         
-        # Crear boleta
-        boleta = BoletaLiquidacion()
-        boleta.nombre_completo = data.get('nombre_completo', '')
-        boleta.ci = data.get('ci', '')
-        boleta.domicilio_trabajador = data.get('domicilio_trabajador', '')
-        boleta.cargo = data.get('cargo', '')
-        boleta.fecha_ingreso = data.get('fecha_ingreso', '')
-        boleta.fecha_retiro = data.get('fecha_retiro', '')
+        boleta = _nueva_boleta('liquidacion', data)
         
-        # Remuneraciones
-        boleta.ultimo_sueldo = float(data.get('ultimo_sueldo', 0))
-        boleta.promedio_ultimos_3_sueldos = float(data.get('promedio_ultimos_3_sueldos', 0))
+        # Generar PDF
+        return _responder_boleta('liquidacion', boleta, data)
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/boletas/consolidado', methods=['POST'])
+@login_required
+def generar_boletas_consolidado():
+    """Genera varias boletas de cualquier tipo en un único PDF"""
+    try:
+        data = request.json
+        items = data.get('boletas', [])
+        if not items:
+            return jsonify({'success': False, 'message': 'No hay boletas para consolidar'}), 400
         
-        # Beneficios
-        boleta.indemnizacion = float(data.get('indemnizacion', 0))
-        boleta.aguinaldo = float(data.get('aguinaldo', 0))
-        boleta.vacaciones = float(data.get('vacaciones', 0))
-        boleta.otros_beneficios = float(data.get('otros_beneficios', 0))
+        # Validar los tipos antes de consumir números de boleta
+        for item in items:
+            if item.get('tipo') not in CREADORES_BOLETA:
+                return jsonify({'success': False, 'message': f"Tipo de boleta inválido: {item.get('tipo')}"}), 400
         
-        # Deducciones
-        boleta.anticipos = float(data.get('anticipos', 0))
-        boleta.prestamos = float(data.get('prestamos', 0))
-        boleta.otras_deducciones = float(data.get('otras_deducciones', 0))
+        boletas = [(item['tipo'], _nueva_boleta(item['tipo'], item)) for item in items]
+        numeros = [boleta.numero_boleta for _, boleta in boletas]
         
-        # Fecha, número y método de pago
-        fecha_str = data.get('fecha_emision', datetime.now().strftime("%d/%m/%Y"))
-        boleta.fecha_emision = datetime.strptime(fecha_str, "%d/%m/%Y")
-        boleta.numero_boleta = empresa_config.get_next_numero_boleta()
-        boleta.metodo_pago = data.get('metodo_pago', 'EFECTIVO')
+        nombre = secure_filename(data.get('nombre', ''))
+        if not nombre:
+            nombre = f"Boletas_Consolidado_{numeros[0]}-{numeros[-1]}.pdf"
+        elif not nombre.lower().endswith('.pdf'):
+            nombre += '.pdf'
         
-        # Generar PDF
         pdf_gen = PDFGenerator(empresa_config)
-        filename = pdf_gen.generar_boleta_liquidacion(boleta)
+        filename = pdf_gen.generar_consolidado(boletas, nombre)
         
         return jsonify({
             'success': True,
-            'message': 'Boleta generada correctamente',
+            'message': f"{len(boletas)} boletas consolidadas en un PDF",
             'filename': os.path.basename(filename),
-            'numero_boleta': boleta.numero_boleta
+            'numeros_boleta': numeros
         })
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
+# API Endpoints - Registro de boletas
+
+@app.route('/api/boletas', methods=['GET'])
+@login_required
+def listar_boletas():
+    """
+    Lista las boletas emitidas, de la más reciente a la más antigua
+    
+    Parámetros opcionales: ci, tipo, periodo (AAAA o AAAA-MM), limite y
+    cursor (la respuesta incluye 'siguiente' si hay más páginas).
+    """
+    try:
+        boletas, siguiente = registro_boletas.buscar(
+            ci=request.args.get('ci'),
+            tipo=request.args.get('tipo'),
+            periodo=request.args.get('periodo'),
+            limite=request.args.get('limite', 100, type=int),
+            cursor=request.args.get('cursor')
+        )
+        return jsonify({'success': True, 'boletas': boletas, 'siguiente': siguiente})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/boletas/<numero_boleta>', methods=['GET'])
+@login_required
+def get_boleta(numero_boleta):
+    """Obtiene los datos completos de una boleta emitida"""
+    try:
+        boleta = registro_boletas.obtener(numero_boleta)
+        if boleta is None:
+            return jsonify({'success': False, 'message': 'Boleta no encontrada'}), 404
+        return jsonify({'success': True, 'boleta': boleta})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/planilla', methods=['GET'])
+@login_required
+def get_planilla():
+    """
+    Descarga la planilla de sueldos de un mes con las boletas mensuales emitidas
+    
+    Parámetros: periodo (AAAA-MM) y formato ('pdf' por defecto, o 'csv',
+    que se envía en streaming por bloques de filas).
+    """
+    try:
+        periodo = validar_periodo(request.args.get('periodo', ''))
+        formato = request.args.get('formato', 'pdf')
+        if formato not in ('pdf', 'csv'):
+            return jsonify({'success': False, 'message': f"Formato inválido: {formato}"}), 400
+        if not registro_boletas.buscar(tipo='mensual', periodo=periodo, limite=1)[0]:
+            return jsonify({'success': False, 'message': f"No hay boletas mensuales registradas para {periodo}"}), 404
+        
+        nombre = f"Planilla_Sueldos_{periodo}.{formato}"
+        if formato == 'csv':
+            return Response(csv_planilla(periodo), mimetype='text/csv',
+                            headers={'Content-Disposition': f'attachment; filename={nombre}'})
+        return send_file(BytesIO(renderizar_planilla(periodo, empresa_config)), mimetype='application/pdf',
+                         as_attachment=True, download_name=nombre)
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+# API Endpoints - Trabajos en segundo plano
+
+def _trabajo_boleta(payload):
+    """Genera una boleta encolada; el número se asignó al encolarla"""
+    tipo = payload['tipo']
+    boleta = CREADORES_BOLETA[tipo](payload['datos'])
+    boleta.numero_boleta = payload['numero_boleta']
+    
+    # Los trabajos corren fuera de una petición: refrescar aquí también
+    empresa_config.refrescar()
+    pdf_gen = PDFGenerator(empresa_config)
+    filename = pdf_gen.generar(tipo, boleta, payload['datos'].get('motor', 'platypus'))
+    return {
+        'filename': os.path.basename(filename),
+        'numero_boleta': boleta.numero_boleta
+    }
+
+def _trabajo_lote(payload):
+    """Genera un lote mensual encolado con la configuración vigente"""
+    empresa_config.refrescar()
+    return _generar_lote_mensual(payload)
+
+# Un trabajo en proceso por más tiempo se da por colgado y se marca con error
+cola_trabajos.registrar('boleta', _trabajo_boleta, timeout=300)
+cola_trabajos.registrar('lote', _trabajo_lote, timeout=3600)
+# Con "python app.py" los procesos del pool del lote (forkserver) vuelven a
+# importar este módulo como __mp_main__: ahí no se atiende la cola
+if __name__ != '__mp_main__':
+    cola_trabajos.iniciar()
+
+@app.route('/api/trabajos', methods=['POST'])
+@login_required
+def crear_trabajo():
+    """Encola la generación de una boleta o de un lote mensual"""
+    try:
+        data = request.json
+        tipo = data.get('tipo')
+        datos = data.get('datos', {})
+        
+        if tipo in CREADORES_BOLETA:
+            # Validar los datos y reservar el número antes de encolar
+            boleta = _nueva_boleta(tipo, datos)
+            trabajo = cola_trabajos.encolar('boleta', {
+                'tipo': tipo,
+                'datos': datos,
+                'numero_boleta': boleta.numero_boleta
+            })
+        elif tipo == 'lote':
+            trabajo = cola_trabajos.encolar('lote', datos)
+        else:
+            return jsonify({'success': False, 'message': f"Tipo de trabajo inválido: {tipo}"}), 400
+        
+        return jsonify({'success': True, 'trabajo': trabajo}), 202
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/trabajos/<trabajo_id>', methods=['GET'])
+@login_required
+def get_trabajo(trabajo_id):
+    """Obtiene el estado de un trabajo"""
+    try:
+        trabajo = cola_trabajos.obtener(trabajo_id)
+        if trabajo is None:
+            return jsonify({'success': False, 'message': 'Trabajo no encontrado'}), 404
+        return jsonify({'success': True, 'trabajo': trabajo})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/trabajos/<trabajo_id>/resultado', methods=['GET'])
+@login_required
+def get_resultado_trabajo(trabajo_id):
+    """Descarga el PDF de un trabajo de boleta o retorna el manifiesto de un lote"""
+    try:
+        trabajo = cola_trabajos.obtener(trabajo_id)
+        if trabajo is None:
+            return jsonify({'success': False, 'message': 'Trabajo no encontrado'}), 404
+        if trabajo['estado'] != 'completado':
+            return jsonify({
+                'success': False,
+                'message': f"El trabajo está en estado {trabajo['estado']}",
+                'trabajo': trabajo
+            }), 409
+        
+        resultado = trabajo['resultado']
+        if trabajo['tipo'] == 'lote':
+            return jsonify({'success': True, 'manifiesto': resultado})
+        
+        filepath = _resolver_pdf(resultado['filename'])
+        if filepath is None:
+            return jsonify({'success': False, 'message': 'Archivo no encontrado'}), 404
+        return send_file(filepath, as_attachment=True)
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+def _resolver_pdf(filename):
+    """
+    Obtiene la ruta de un PDF del almacén
+    
+    Si el archivo ya no está (política de retención, borrado manual) y es el
+    PDF individual de una boleta registrada, se vuelve a generar con los
+    datos, el motor y la configuración de empresa con que se emitió.
+    
+    Returns:
+        str: Ruta del archivo o None si no existe ni puede regenerarse
+    """
+    filepath = almacen_pdf.resolver(filename)
+    if filepath is None:
+        registro = registro_boletas.obtener_archivo(filename)
+        if registro is not None:
+            boleta, empresa = registro_boletas.reconstruir(registro)
+            filepath = PDFGenerator(empresa).generar(registro['tipo'], boleta, registro['motor'], cache=True)
+            metricas.incrementar('boletas_pdfs_regenerados_total', {'tipo': registro['tipo']})
+    return filepath
+
 @app.route('/api/download/<filename>')
 @login_required
 def download_pdf(filename):
-    """Descarga un PDF generado"""
+    """Descarga un PDF generado (regenerándolo desde el registro si se descartó)"""
     try:
-        filepath = os.path.join('output', filename)
-        if os.path.exists(filepath):
+        filepath = _resolver_pdf(filename)
+        if filepath:
             return send_file(filepath, as_attachment=True)
         else:
             return jsonify({'success': False, 'message': 'Archivo no encontrado'}), 404
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
+@app.route('/api/instrumentacion', methods=['GET'])
+@login_required
+def get_instrumentacion():
+    """Obtiene los histogramas de duración por etapa de la generación de PDFs"""
+    return jsonify({'success': True, 'instrumentacion': instrumentacion.estadisticas()})
+
+@app.route('/api/almacen', methods=['GET'])
+@login_required
+def get_uso_almacen():
+    """Obtiene el uso de disco del almacén de PDFs"""
+    try:
+        return jsonify({'success': True, 'almacen': almacen_pdf.uso()})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/almacen/limpiar', methods=['POST'])
+@login_required
+def limpiar_almacen():
+    """Aplica la política de retención del almacén de inmediato"""
+    try:
+        liberado = almacen_pdf.aplicar_politica()
+        return jsonify({
+            'success': True,
+            'message': f"{liberado['archivos']} archivos eliminados",
+            'liberado': liberado,
+            'almacen': almacen_pdf.uso()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/cache', methods=['GET'])
+@login_required
+def get_estadisticas_cache():
+    """Obtiene las estadísticas de las cachés de generación"""
+    return jsonify({
+        'success': True,
+        'recursos': recursos_cache.estadisticas(),
+        'render': render_cache.estadisticas()
+    })
+
 # API Endpoints - Empleados
 
 @app.route('/api/empleados', methods=['GET'])
 @login_required
 def get_empleados():
-    """Obtiene todos los empleados"""
+    """
+    Obtiene los empleados
+    
+    Parámetros opcionales: limite y cursor (paginación por ID; la respuesta
+    incluye 'siguiente' si hay más páginas) y fields (campos separados por coma).
+    Responde 304 si el ETag enviado en If-None-Match sigue vigente.
+    """
     try:
-        empleados = empleado_manager.obtener_empleados()
-        return jsonify({'success': True, 'empleados': empleados})
+        # El ETag depende de la versión de la planilla y de los parámetros
+        etag = f"{empleado_manager.huella()}-{zlib.crc32(request.query_string):08x}"
+        if request.if_none_match.contains(etag) or request.if_none_match.contains(etag + SUFIJO_GZIP):
+            respuesta = Response(status=304)
+            respuesta.set_etag(etag)
+            return respuesta
+        
+        limite = request.args.get('limite', type=int)
+        if limite is not None:
+            limite = max(1, min(limite, MAX_PAGINA_EMPLEADOS))
+        campos = request.args.get('fields')
+        empleados, siguiente = empleado_manager.listar_empleados(
+            limite, request.args.get('cursor'), campos.split(',') if campos else None)
+        
+        respuesta = jsonify({'success': True, 'empleados': empleados, 'siguiente': siguiente})
+        respuesta.set_etag(etag)
+        return respuesta
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
@@ -345,6 +725,34 @@ def agregar_empleado():
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
+@app.route('/api/empleados/importar', methods=['POST'])
+@login_required
+def importar_empleados():
+    """
+    Importa empleados desde un archivo CSV o XLSX (campo 'archivo')
+    
+    Opciones del formulario: parcial=0 cancela todo si alguna fila tiene
+    errores; validar=1 solo valida sin guardar.
+    """
+    try:
+        if 'archivo' not in request.files or not request.files['archivo'].filename:
+            return jsonify({'success': False, 'message': 'No se envió ningún archivo'}), 400
+        archivo = request.files['archivo']
+        
+        filas = leer_planilla(archivo.stream, formato_de(archivo.filename))
+        resultado = empleado_manager.importar_empleados(
+            filas,
+            parcial=request.form.get('parcial', '1') != '0',
+            solo_validar=request.form.get('validar', '0') == '1'
+        )
+        return jsonify({
+            'success': not resultado['total_errores'],
+            'message': f"{resultado['importados']} empleados importados, {resultado['total_errores']} filas con errores",
+            'resultado': resultado
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
 @app.route('/api/empleados/<int:id_empleado>', methods=['GET'])
 @login_required
 def get_empleado(id_empleado):
@@ -397,6 +805,19 @@ def buscar_empleados():
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
+@app.route('/api/empleados/sugerencias', methods=['GET'])
+@login_required
+def sugerir_empleados():
+    """Sugerencias para el selector de empleados: las mejores coincidencias con los campos pedidos"""
+    try:
+        termino = request.args.get('q', '')
+        limite = min(int(request.args.get('limite', 10)), MAX_SUGERENCIAS)
+        campos = request.args.get('campos', CAMPOS_SUGERENCIA).split(',')
+        empleados = empleado_manager.buscar_empleados(termino, limite, campos)
+        return jsonify({'success': True, 'empleados': empleados})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     print("=" * 60)
@@ -0,0 +1,120 @@
+"""
+Coherencia de la planilla de empleados entre procesos
+Simula varios workers de gunicorn, cada uno con su propio EmpleadoManager
+sobre el mismo almacenamiento: todos registran empleados a la vez, intentan
+registrar el mismo C.I. y modifican empleados de los demás.
+
+Verifica que al terminar todos los procesos vean la misma planilla (misma
+cantidad, mismos sueldos y misma huella para el ETag), que el C.I.
+repetido se acepte una sola vez, y mide el costo de una lectura cuando no
+hubo cambios (solo la verificación de cambios).
+
+Uso:
+    python benchmarks/bench_coherencia.py [procesos] [altas por proceso]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.empleado import Empleado, EmpleadoManager
+from models.almacenamiento_empleados import crear_almacenamiento
+
+PROCESOS = 4
+ALTAS = 200
+LECTURAS = 20000
+
+
+def worker(backend, archivo, numero, procesos, altas, barrera, resultados):
+    """Registra altas propias, compite por un C.I. y modifica empleados ajenos"""
+    manager = EmpleadoManager(archivo, crear_almacenamiento(archivo, backend))
+    barrera.wait()
+
+    rechazadas = 0
+    for i in range(altas):
+        exito, _ = manager.agregar_empleado(Empleado(f"Empleado {numero}-{i}", f"{numero}-{i}", 'Operario',
+                                                     '01/01/2020', 3000))
+        rechazadas += not exito
+    repetido, _ = manager.agregar_empleado(Empleado("Repetido", "REPETIDO", 'Operario', '01/01/2020', 1))
+
+    # Cada proceso sube el sueldo de los primeros empleados del siguiente
+    barrera.wait()
+    siguiente = (numero + 1) % procesos
+    conflictos = 0
+    for i in range(altas // 10):
+        empleado = manager.obtener_empleado_por_ci(f"{siguiente}-{i}")
+        exito, _ = manager.actualizar_empleado(empleado['id'], {'sueldo': 3500})
+        conflictos += not exito
+
+    barrera.wait()
+    empleados = manager.obtener_empleados()
+    inicio = time.perf_counter()
+    for _ in range(LECTURAS):
+        manager.obtener_empleado_por_ci("0-0")
+    lectura = (time.perf_counter() - inicio) / LECTURAS * 1e6
+
+    resultados.put({
+        'cantidad': len(empleados),
+        'sueldos': sum(emp['sueldo'] for emp in empleados),
+        'huella': manager.huella(),
+        'rechazadas': rechazadas,
+        'repetido': repetido,
+        'conflictos': conflictos,
+        'lectura': lectura
+    })
+
+
+def medir_backend(backend, procesos, altas):
+    """Ejecuta los workers y verifica que todos terminen con la misma planilla"""
+    contexto = multiprocessing.get_context('fork')
+    with tempfile.TemporaryDirectory() as tmp:
+        archivo = os.path.join(tmp, 'empleados.json')
+        barrera = contexto.Barrier(procesos, timeout=120)
+        resultados = contexto.Queue()
+        inicio = time.perf_counter()
+        hijos = [contexto.Process(target=worker, args=(backend, archivo, n, procesos, altas, barrera, resultados))
+                 for n in range(procesos)]
+        for hijo in hijos:
+            hijo.start()
+        vistas = [resultados.get() for _ in hijos]
+        for hijo in hijos:
+            hijo.join()
+        segundos = time.perf_counter() - inicio
+
+    esperados = procesos * altas + 1
+    sueldos = procesos * altas * 3000 + procesos * (altas // 10) * 500 + 1
+    errores = []
+    if any(v['rechazadas'] for v in vistas):
+        errores.append(f"altas rechazadas {[v['rechazadas'] for v in vistas]}")
+    if any(v['cantidad'] != esperados for v in vistas):
+        errores.append(f"cantidades {[v['cantidad'] for v in vistas]}, se esperaban {esperados}")
+    if any(v['sueldos'] != sueldos for v in vistas):
+        errores.append(f"sueldos {[v['sueldos'] for v in vistas]}, se esperaban {sueldos}")
+    if len({v['huella'] for v in vistas}) != 1:
+        errores.append(f"huellas distintas {[v['huella'] for v in vistas]}")
+    if sum(v['repetido'] for v in vistas) != 1:
+        errores.append(f"el C.I. repetido se aceptó {sum(v['repetido'] for v in vistas)} veces")
+    if any(v['conflictos'] for v in vistas):
+        errores.append(f"modificaciones rechazadas {[v['conflictos'] for v in vistas]}")
+
+    lectura = max(v['lectura'] for v in vistas)
+    print(f"{backend:<8} {procesos:>8} {procesos * altas:>7} {segundos:>9.2f} {lectura:>12.1f}  "
+          + ('OK' if not errores else 'ERROR: ' + '; '.join(errores)))
+    return not errores
+
+
+def main():
+    procesos = int(sys.argv[1]) if len(sys.argv) > 1 else PROCESOS
+    altas = int(sys.argv[2]) if len(sys.argv) > 2 else ALTAS
+
+    print(f"{'Backend':<8} {'Procesos':>8} {'Altas':>7} {'Segundos':>9} {'Lectura µs':>12}")
+    correcto = all([medir_backend(backend, procesos, altas) for backend in ('sqlite', 'json')])
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark del almacenamiento de empleados
+Mide el costo por operación de EmpleadoManager (búsqueda por ID y C.I.,
+alta, modificación y baja) con planillas de distinto tamaño, para el
+backend SQLite y el archivo JSON
+
+En ambos backends el costo de escritura debe mantenerse plano al crecer la
+planilla: SQLite escribe una sola fila y el JSON agrega una línea al diario
+(la compactación corre en segundo plano).
+
+Uso:
+    python benchmarks/bench_empleados.py [tamaños separados por coma]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.empleado import Empleado, EmpleadoManager
+from models.almacenamiento_empleados import crear_almacenamiento
+
+TAMANOS = (100, 1000, 10000, 100000)
+LECTURAS = 2000
+ESCRITURAS = 50
+
+
+def crear_filas(cantidad):
+    """Genera empleados sintéticos con ID y C.I. únicos"""
+    return [{
+        'id': i + 1,
+        'nombre_completo': f"Empleado Número {i}",
+        'ci': f"{1000000 + i} LP",
+        'cargo': 'Operario',
+        'fecha_ingreso': '01/01/2020',
+        'sueldo': 3000.0 + i % 500
+    } for i in range(cantidad)]
+
+
+def medir(funcion, argumentos):
+    """Retorna el tiempo promedio por llamada en microsegundos"""
+    inicio = time.perf_counter()
+    for argumento in argumentos:
+        funcion(argumento)
+    return (time.perf_counter() - inicio) / len(argumentos) * 1e6
+
+
+def medir_backend(backend, cantidad):
+    """
+    Mide las operaciones del gestor sobre una planilla de cantidad empleados
+
+    Returns:
+        dict: Microsegundos por operación
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        archivo = os.path.join(tmp, 'empleados.json')
+        filas = crear_filas(cantidad)
+        crear_almacenamiento(archivo, backend).insertar_lote(filas)
+
+        inicio = time.perf_counter()
+        manager = EmpleadoManager(archivo, crear_almacenamiento(archivo, backend))
+        carga = (time.perf_counter() - inicio) * 1e6
+
+        azar = random.Random(cantidad)
+        ids = [azar.randrange(1, cantidad + 1) for _ in range(LECTURAS)]
+        cis = [f"{1000000 + i - 1} LP" for i in ids]
+        nuevos = [Empleado(f"Nuevo {i}", f"N-{i}", 'Cargo', '01/01/2025', 3500, cantidad + 1 + i)
+                  for i in range(ESCRITURAS)]
+        modificados = azar.sample(range(1, cantidad + 1), ESCRITURAS)
+
+        return {
+            'carga': carga,
+            'por_id': medir(manager.obtener_empleado_por_id, ids),
+            'por_ci': medir(manager.obtener_empleado_por_ci, cis),
+            'alta': medir(manager.agregar_empleado, nuevos),
+            'modificacion': medir(lambda i: manager.actualizar_empleado(i, {'sueldo': 4000}), modificados),
+            'baja': medir(manager.eliminar_empleado, [emp.id for emp in nuevos])
+        }
+
+
+def main():
+    tamanos = [int(t) for t in sys.argv[1].split(',')] if len(sys.argv) > 1 else TAMANOS
+    operaciones = ('por_id', 'por_ci', 'alta', 'modificacion', 'baja')
+
+    print("Microsegundos por operación (carga inicial en milisegundos)")
+    print(f"{'Backend':<8} {'Empleados':>10} {'Carga':>9} " + ' '.join(f"{op:>13}" for op in operaciones))
+    for backend in ('sqlite', 'json'):
+        for cantidad in tamanos:
+            tiempos = medir_backend(backend, cantidad)
+            print(f"{backend:<8} {cantidad:>10} {tiempos['carga'] / 1000:>9.1f} "
+                  + ' '.join(f"{tiempos[op]:>13.1f}" for op in operaciones))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark del lote columnar de boletas
+Genera boletas de los tres tipos con montos y fechas aleatorios (incluye
+fechas vacías, inválidas e invertidas, montos sin decimales y negativos) y
+verifica que LoteBoletas produzca exactamente los mismos diccionarios que
+to_dict() de cada boleta individual, y los mismos montos con dos decimales.
+
+Mide además el tiempo de calcular el líquido pagable y to_dict() fila por
+fila con los modelos frente a hacerlo por columnas para todo el lote (la
+aceleración es la de to_dict() frente a filas()).
+
+Uso:
+    python benchmarks/bench_lote_boletas.py [filas]
+"""
+
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.lote_boletas import LoteBoletas, CLASES_BOLETA, ESQUEMAS, formatear, redondear
+
+FILAS = 100000
+
+# Totales que se comparan con dos decimales por tipo
+TOTALES = {
+    'mensual': ('total_ingresos', 'total_egresos', 'liquido_pagable'),
+    'aguinaldo': ('liquido_pagable',),
+    'liquidacion': ('total_beneficios', 'total_deducciones', 'liquido_pagable'),
+}
+
+
+def fecha_aleatoria(aleatorio):
+    """Fecha dd/mm/aaaa, con algunos valores vacíos o inválidos"""
+    sorteo = aleatorio.random()
+    if sorteo < 0.02:
+        return ''
+    if sorteo < 0.03:
+        return aleatorio.choice(['31/02/2025', '2025-01-01', 'sin fecha'])
+    fecha = datetime(2015, 1, 1) + timedelta(days=aleatorio.randint(0, 4000))
+    return fecha.strftime("%d/%m/%Y")
+
+
+def monto_aleatorio(aleatorio):
+    """Monto con 0 a 3 decimales (como float, igual que los formularios); a veces cero o negativo"""
+    sorteo = aleatorio.random()
+    if sorteo < 0.1:
+        return 0.0
+    if sorteo < 0.2:
+        return float(aleatorio.randint(0, 5000))
+    if sorteo < 0.25:
+        return -round(aleatorio.uniform(0, 100), 2)
+    return round(aleatorio.uniform(0, 10000), aleatorio.randint(0, 3))
+
+
+def crear_boletas(tipo, cantidad, aleatorio):
+    """Crea boletas individuales del tipo con datos aleatorios"""
+    esquema = ESQUEMAS[tipo]
+    boletas = []
+    for n in range(cantidad):
+        boleta = CLASES_BOLETA[tipo]()
+        for campo in esquema['textos']:
+            setattr(boleta, campo, fecha_aleatoria(aleatorio) if campo.startswith('fecha') else f"{campo} {n}")
+        for campo in esquema['montos']:
+            setattr(boleta, campo, monto_aleatorio(aleatorio))
+        if 'anio' in esquema['enteros']:
+            boleta.anio = aleatorio.randint(2020, 2026)
+        boleta.fecha_emision = datetime(2025, 1, 1) + timedelta(days=aleatorio.randint(0, 365))
+        boletas.append(boleta)
+    return boletas
+
+
+def verificar(tipo, boletas, lote):
+    """Cuenta las filas cuyo to_dict() o montos redondeados difieren"""
+    distintas = 0
+    for boleta, fila in zip(boletas, lote.filas()):
+        distintas += json.dumps(boleta.to_dict()) != json.dumps(fila)
+
+    for total in TOTALES[tipo]:
+        metodo = 'calcular_' + total
+        escalares = [getattr(boleta, metodo)() for boleta in boletas]
+        columnares = lote.columna(total)
+        distintas += sum(a != b for a, b in zip(['%.2f' % v for v in escalares], formatear(columnares)))
+        distintas += sum(a != b for a, b in zip([round(v, 2) for v in escalares], redondear(columnares)))
+
+    # Ida y vuelta: las boletas individuales reconstruidas calculan lo mismo
+    for boleta, reconstruida in zip(boletas, lote.boletas()):
+        distintas += json.dumps(boleta.to_dict()) != json.dumps(reconstruida.to_dict())
+    return distintas
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else FILAS
+    aleatorio = random.Random(7)
+    correcto = True
+
+    print(f"{'Tipo':<12} {'Filas':>7} {'Líquido ms':>11} {'Columnar ms':>12} "
+          f"{'to_dict ms':>11} {'filas() ms':>11} {'Aceleración':>12}  Paridad")
+    for tipo in ESQUEMAS:
+        boletas = crear_boletas(tipo, filas, aleatorio)
+
+        inicio = time.perf_counter()
+        for boleta in boletas:
+            boleta.calcular_liquido_pagable()
+        liquido = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        for boleta in boletas:
+            boleta.to_dict()
+        diccionarios = time.perf_counter() - inicio
+
+        lote = LoteBoletas.desde_boletas(tipo, boletas)
+        inicio = time.perf_counter()
+        lote.columna('liquido_pagable')
+        liquido_columnar = time.perf_counter() - inicio
+        lote = LoteBoletas.desde_boletas(tipo, boletas)
+        inicio = time.perf_counter()
+        for _ in lote.filas():
+            pass
+        filas_columnar = time.perf_counter() - inicio
+
+        distintas = verificar(tipo, boletas, lote)
+        correcto = correcto and not distintas
+        print(f"{tipo:<12} {filas:>7} {liquido * 1000:>11.1f} {liquido_columnar * 1000:>12.1f} "
+              f"{diccionarios * 1000:>11.1f} {filas_columnar * 1000:>11.1f} "
+              f"{diccionarios / filas_columnar if filas_columnar else 0:>11.1f}x  "
+              + ('OK' if not distintas else f"ERROR: {distintas} diferencias"))
+
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark de memoria de los modelos
+Crea 100.000 instancias de cada modelo (boletas y empleados) y mide con
+tracemalloc la memoria por instancia con __slots__ frente a la misma clase
+con un __dict__ por instancia (como eran los modelos antes). Los valores de
+los campos son los mismos en los dos casos y no se cuentan.
+
+Uso:
+    python benchmarks/bench_memoria_modelos.py [instancias]
+"""
+
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.boleta_mensual import BoletaMensual
+from models.boleta_aguinaldo import BoletaAguinaldo
+from models.boleta_liquidacion import BoletaLiquidacion
+from models.empleado import Empleado
+
+INSTANCIAS = 100000
+
+
+def clase_con_dict(clase):
+    """Clase equivalente a clase con los atributos en un __dict__ por instancia"""
+    def __init__(self):
+        for campo in clase.CAMPOS:
+            setattr(self, campo.nombre, campo.valor_defecto())
+    return type(f"{clase.__name__}ConDict", (), {'__init__': __init__})
+
+
+def valores(clase, n):
+    """Valores distintos para la instancia n, según el tipo de cada campo"""
+    fecha = datetime(2025, 1, 1) + timedelta(days=n % 365)
+    datos = {}
+    for campo in clase.CAMPOS:
+        if campo.tipo is float:
+            datos[campo.nombre] = 1000.0 + n / 100
+        elif campo.tipo is int:
+            datos[campo.nombre] = 2025 if campo.nombre == 'anio' else n + 1
+        elif campo.tipo is datetime:
+            datos[campo.nombre] = fecha
+        elif campo.nombre.startswith('fecha'):
+            datos[campo.nombre] = fecha.strftime("%d/%m/%Y")
+        else:
+            datos[campo.nombre] = f"{campo.nombre} {n}"
+    return datos
+
+
+def medir(clase, filas):
+    """
+    Crea una instancia de clase por fila, asignando los valores atributo por atributo
+
+    Los valores se crean antes de empezar a medir, así solo se cuenta la
+    memoria de las instancias (la de los valores es la misma con y sin __slots__).
+
+    Returns:
+        float: Bytes por instancia
+    """
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objetos = []
+    for datos in filas:
+        objeto = clase.__new__(clase)
+        for nombre, valor in datos.items():
+            setattr(objeto, nombre, valor)
+        objetos.append(objeto)
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (despues - antes) / len(filas)
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else INSTANCIAS
+
+    print(f"{'Modelo':<20} {'Instancias':>10} {'__dict__ B':>11} {'__slots__ B':>12} "
+          f"{'__dict__ MB':>12} {'__slots__ MB':>13} {'Ahorro':>7}")
+    for modelo in (BoletaMensual, BoletaAguinaldo, BoletaLiquidacion, Empleado):
+        filas = [valores(modelo, n) for n in range(cantidad)]
+        con_dict = medir(clase_con_dict(modelo), filas)
+        con_slots = medir(modelo, filas)
+        print(f"{modelo.__name__:<20} {cantidad:>10} {con_dict:>11.0f} {con_slots:>12.0f} "
+              f"{con_dict * cantidad / 2**20:>12.1f} {con_slots * cantidad / 2**20:>13.1f} "
+              f"{1 - con_slots / con_dict:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark de la numeración de boletas bajo concurrencia
+Varios procesos piden números a la vez y se verifica que el resultado sea
+exactamente 1..N, sin huecos ni duplicados; se compara la numeración
+anterior (reescritura de settings.json en cada boleta) con la secuencia
+SQLite, número a número y reservando bloques
+
+Uso:
+    python benchmarks/bench_numeracion.py [procesos] [numeros_por_proceso]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.empresa import EmpresaConfig
+
+# Tamaño de bloque de la reserva, como en un lote mediano
+BLOQUE = 50
+
+
+def _numerar_json(config_file, cantidad):
+    """Numeración anterior: incrementar la copia en memoria y reescribir settings.json"""
+    # Otro proceso puede estar reescribiendo el archivo (lectura a medio escribir)
+    while True:
+        try:
+            config = EmpresaConfig(config_file)
+            break
+        except ValueError:
+            continue
+    numeros = []
+    for _ in range(cantidad):
+        numero = config.config["boletas"]["ultimo_numero"] + 1
+        config.config["boletas"]["ultimo_numero"] = numero
+        config.save_config()
+        numeros.append(numero)
+    return numeros
+
+
+def _numerar_siguiente(config_file, cantidad):
+    """Un número por transacción"""
+    secuencia = EmpresaConfig(config_file).numeracion
+    return [secuencia.siguiente() for _ in range(cantidad)]
+
+
+def _numerar_bloques(config_file, cantidad):
+    """Reservas de BLOQUE números por transacción"""
+    secuencia = EmpresaConfig(config_file).numeracion
+    numeros = []
+    while len(numeros) < cantidad:
+        numeros.extend(secuencia.reservar(min(BLOQUE, cantidad - len(numeros))))
+    return numeros
+
+
+def ejecutar(funcion, procesos, cantidad):
+    """
+    Ejecuta la numeración en paralelo sobre una configuración nueva
+
+    Returns:
+        tuple: (segundos, duplicados, faltantes)
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = os.path.join(tmp, 'settings.json')
+        EmpresaConfig(config_file).save_config()
+
+        with Pool(procesos) as pool:
+            inicio = time.perf_counter()
+            resultados = pool.starmap(funcion, [(config_file, cantidad)] * procesos)
+            segundos = time.perf_counter() - inicio
+
+    conteo = Counter(numero for numeros in resultados for numero in numeros)
+    duplicados = sum(veces - 1 for veces in conteo.values() if veces > 1)
+    faltantes = len(set(range(1, procesos * cantidad + 1)) - set(conteo))
+    return segundos, duplicados, faltantes
+
+
+def main():
+    procesos = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    cantidad = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    total = procesos * cantidad
+
+    print(f"Procesos: {procesos}, números por proceso: {cantidad} (bloque {BLOQUE})")
+    print(f"{'Método':<18} {'Números/s':>12} {'Duplicados':>11} {'Faltantes':>10}")
+
+    correcto = True
+    for nombre, funcion in (('json (anterior)', _numerar_json),
+                            ('sqlite siguiente', _numerar_siguiente),
+                            ('sqlite bloques', _numerar_bloques)):
+        segundos, duplicados, faltantes = ejecutar(funcion, procesos, cantidad)
+        print(f"{nombre:<18} {total / segundos:>12.0f} {duplicados:>11} {faltantes:>10}")
+        if funcion is not _numerar_json and (duplicados or faltantes):
+            correcto = False
+
+    return 0 if correcto else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
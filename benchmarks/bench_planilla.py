@@ -0,0 +1,126 @@
+"""
+Benchmark de la planilla de sueldos
+Registra boletas mensuales de prueba en un registro temporal y mide la
+generación de la planilla en CSV y en PDF para distintas cantidades de
+filas. El tiempo por fila debe mantenerse constante (armado lineal).
+
+También verifica que cada fila del CSV tenga exactamente los mismos montos
+con dos decimales que calcula BoletaMensual para esa boleta. A uno de cada
+diez empleados se le emite además una boleta corregida: la planilla debe
+tener una sola fila por empleado, con su última boleta, y los totales deben
+coincidir con la suma de esas boletas.
+
+Uso:
+    python benchmarks/bench_planilla.py [filas ...]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.empresa import EmpresaConfig
+from models.boleta_mensual import BoletaMensual
+from models.registro_boletas import RegistroBoletas
+from generators.planilla import csv_planilla, renderizar_planilla
+
+FILAS = (1000, 10000)
+PERIODO = '2025-01'
+
+
+def crear_boletas(cantidad):
+    """Crea boletas mensuales con montos aleatorios (semilla fija)"""
+    aleatorio = random.Random(1)
+    boletas = []
+    for n in range(cantidad):
+        boleta = BoletaMensual()
+        boleta.nombre_completo = f"Empleado {n}"
+        boleta.ci = str(1000000 + n)
+        boleta.cargo = 'Operario'
+        boleta.mes_pago = 'Enero'
+        boleta.anio = 2025
+        boleta.fecha_emision = datetime(2025, 1, 31)
+        boleta.numero_boleta = f"BOL-{n + 1:06d}"
+        boleta.haber_basico = round(aleatorio.uniform(2000, 9000), 2)
+        boleta.horas_extra = round(aleatorio.uniform(0, 500), 2)
+        boleta.bono_antiguedad = aleatorio.choice([0.0, 150.5, 301.0])
+        boleta.otros_ingresos = round(aleatorio.random() * 10, 3)
+        boleta.faltas = round(aleatorio.uniform(0, 300), 2)
+        boleta.retrasos = 0.1 * aleatorio.randint(0, 50)
+        boleta.otros_egresos = 1.005 * aleatorio.randint(0, 3)
+        boletas.append(boleta)
+    return boletas
+
+
+def corregir(boletas):
+    """Emite una boleta corregida (otro número y otro haber básico) para uno de cada diez empleados"""
+    corregidas = []
+    for boleta in boletas[::10]:
+        corregida = BoletaMensual.from_dict(boleta.to_dict())
+        corregida.fecha_emision = boleta.fecha_emision
+        corregida.numero_boleta = f"BOL-{len(boletas) + len(corregidas) + 1:06d}"
+        corregida.haber_basico = round(boleta.haber_basico + 100.25, 2)
+        corregidas.append(corregida)
+    return corregidas
+
+
+def montos_escalares(boleta):
+    """Montos de una fila de la planilla calculados con BoletaMensual"""
+    return ['%.2f' % valor for valor in (
+        boleta.haber_basico, boleta.horas_extra, boleta.bono_antiguedad, boleta.otros_ingresos,
+        boleta.calcular_total_ingresos(), boleta.faltas, boleta.retrasos, boleta.reposiciones,
+        boleta.otros_egresos, boleta.calcular_total_egresos(), boleta.calcular_liquido_pagable()
+    )]
+
+
+def main():
+    filas = [int(valor) for valor in sys.argv[1:]] or FILAS
+    correcto = True
+
+    print(f"{'Filas':>7} {'CSV s':>8} {'CSV µs/fila':>12} {'PDF s':>8} {'PDF µs/fila':>12} {'PDF KB':>8}  Paridad")
+    with tempfile.TemporaryDirectory() as tmp:
+        empresa_config = EmpresaConfig(os.path.join(tmp, 'settings.json'))
+        for cantidad in filas:
+            boletas = crear_boletas(cantidad)
+            corregidas = corregir(boletas)
+            registro = RegistroBoletas(os.path.join(tmp, f"boletas_{cantidad}.db"))
+            registro.registrar([('mensual', boleta, '') for boleta in boletas + corregidas], empresa_config)
+            # Última boleta de cada empleado, en el orden en que se emitió
+            vigentes = list({boleta.ci: boleta for boleta in boletas + corregidas}.values())
+            vigentes.sort(key=lambda boleta: boleta.numero_boleta)
+
+            inicio = time.perf_counter()
+            texto = ''.join(csv_planilla(PERIODO, registro))
+            segundos_csv = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            pdf = renderizar_planilla(PERIODO, empresa_config, registro)
+            segundos_pdf = time.perf_counter() - inicio
+
+            lineas = texto.splitlines()[1:-1]
+            distintas = sum(linea.split(',')[:1] + linea.split(',')[4:]
+                            != [boleta.numero_boleta] + montos_escalares(boleta)
+                            for boleta, linea in zip(vigentes, lineas))
+            # Totales: suma de la última boleta de cada empleado (con los montos de
+            # cada fila redondeados, la diferencia es a lo sumo medio centavo por fila)
+            esperados = [sum(valores) for valores in zip(*([float(monto) for monto in montos_escalares(boleta)]
+                                                           for boleta in vigentes))]
+            totales = [float(total) for total in texto.splitlines()[-1].split(',')[4:]]
+            distintas += sum(abs(total - esperado) > 0.005 * cantidad
+                             for total, esperado in zip(totales, esperados))
+            paridad = len(lineas) == cantidad and not distintas
+            correcto = correcto and paridad
+
+            print(f"{cantidad:>7} {segundos_csv:>8.3f} {segundos_csv / cantidad * 1e6:>12.1f} "
+                  f"{segundos_pdf:>8.3f} {segundos_pdf / cantidad * 1e6:>12.1f} {len(pdf) / 1024:>8.0f}  "
+                  + ('OK' if paridad else f"ERROR: {distintas} filas distintas"))
+
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
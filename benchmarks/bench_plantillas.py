@@ -0,0 +1,106 @@
+"""
+Microbenchmark de las plantillas compiladas
+Compara el tiempo de CPU por boleta construyendo los estilos en cada llamada
+(comportamiento anterior) contra el registro de plantillas de generators/plantillas.py
+
+Uso:
+    python benchmarks/bench_plantillas.py [repeticiones]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.empresa import EmpresaConfig
+from models.boleta_mensual import BoletaMensual
+from models.boleta_aguinaldo import BoletaAguinaldo
+from models.boleta_liquidacion import BoletaLiquidacion
+from generators import pdf_generator, plantillas
+from generators.almacen import AlmacenPDF
+from models.registro_boletas import RegistroBoletas
+from generators.cache_render import render_cache
+
+
+def crear_boletas():
+    """Crea una boleta de ejemplo de cada tipo"""
+    mensual = BoletaMensual()
+    mensual.nombre_completo = "Juan Carlos Pérez Mamani"
+    mensual.ci = "4567890 LP"
+    mensual.cargo = "Contador"
+    mensual.mes_pago = "ENERO"
+    mensual.anio = 2025
+    mensual.haber_basico = 4500.0
+    mensual.horas_extra = 320.5
+    mensual.bono_antiguedad = 250.0
+    mensual.faltas = 150.0
+    mensual.numero_boleta = "BOL-000001"
+    mensual.fecha_emision = datetime(2025, 1, 31)
+
+    aguinaldo = BoletaAguinaldo()
+    aguinaldo.nombre_completo = "María López"
+    aguinaldo.ci = "1234567 CB"
+    aguinaldo.fecha_inicio = "01/01/2025"
+    aguinaldo.fecha_fin = "31/12/2025"
+    aguinaldo.promedio_ultimos_3_pagos = 4200.0
+    aguinaldo.numero_boleta = "BOL-000002"
+
+    liquidacion = BoletaLiquidacion()
+    liquidacion.nombre_completo = "Carlos Gómez"
+    liquidacion.ci = "7654321 SC"
+    liquidacion.fecha_ingreso = "01/03/2019"
+    liquidacion.fecha_retiro = "30/06/2025"
+    liquidacion.indemnizacion = 25000.0
+    liquidacion.aguinaldo = 2100.0
+    liquidacion.anticipos = 500.0
+    liquidacion.numero_boleta = "BOL-000003"
+
+    return {'mensual': mensual, 'aguinaldo': aguinaldo, 'liquidacion': liquidacion}
+
+
+def medir(funcion, repeticiones):
+    """Retorna el tiempo de CPU promedio por llamada en milisegundos"""
+    inicio = time.process_time()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.process_time() - inicio) / repeticiones * 1000
+
+
+def main():
+    # Medir el renderizado real, no los aciertos de la caché de PDFs
+    render_cache.max_entradas = 0
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    boletas = crear_boletas()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        almacen = AlmacenPDF(tmp, os.path.join(tmp, 'almacen.db'))
+        registro = RegistroBoletas(os.path.join(tmp, 'boletas.db'))
+        pdf_gen = pdf_generator.PDFGenerator(EmpresaConfig(os.path.join(tmp, 'settings.json')), almacen, registro)
+
+        print(f"Repeticiones por medición: {repeticiones}")
+        print(f"{'Tipo':<12} {'Estilos':>10} {'Antes (ms)':>12} {'Después (ms)':>14} {'Ahorro':>8}")
+
+        for tipo, boleta in boletas.items():
+            generar = getattr(pdf_gen, f"generar_boleta_{tipo}")
+
+            # Solo la construcción de estilos y tablas fijas
+            solo_estilos = medir(plantillas.PLANTILLAS[tipo], repeticiones)
+
+            # Antes: la plantilla se reconstruye en cada boleta
+            pdf_generator.obtener_plantilla = lambda t: plantillas.PLANTILLAS[t]()
+            antes = medir(lambda: generar(boleta), repeticiones)
+
+            # Después: plantilla compilada una vez por proceso
+            pdf_generator.obtener_plantilla = plantillas.obtener_plantilla
+            generar(boleta)
+            despues = medir(lambda: generar(boleta), repeticiones)
+
+            ahorro = (antes - despues) / antes * 100 if antes else 0.0
+            print(f"{tipo:<12} {solo_estilos:>10.3f} {antes:>12.3f} {despues:>14.3f} {ahorro:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
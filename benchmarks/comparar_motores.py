@@ -0,0 +1,151 @@
+"""
+Comparación de los motores de renderizado de la boleta mensual
+Verifica que el motor canvas produzca los mismos textos, en las mismas
+posiciones, que el motor platypus y mide el tiempo por boleta de cada uno
+
+Los PDFs se generan sin compresión para leer directamente los operadores de
+texto del contenido de la página (solo biblioteca estándar).
+
+Uso:
+    python benchmarks/comparar_motores.py [repeticiones]
+"""
+
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab import rl_config
+
+from config.empresa import EmpresaConfig
+from generators.pdf_generator import PDFGenerator
+from generators.cache_render import render_cache
+from bench_plantillas import crear_boletas
+
+# Tolerancia en puntos para comparar posiciones de texto
+TOLERANCIA = 0.25
+
+_TOKEN = re.compile(rb'\((?:\\.|[^\\)])*\)|/[^\s/\[\]()<>]+|[-+]?\d*\.?\d+|[A-Za-z*\']+')
+_STREAM = re.compile(rb'stream\r?\n(.*?)endstream', re.S)
+
+
+def _contenido_pagina(pdf):
+    """Retorna el flujo de contenido de la página (el que contiene texto)"""
+    for flujo in _STREAM.findall(pdf):
+        if b' Tm' in flujo and b' Tf' in flujo and b'BT' in flujo:
+            return flujo
+    raise ValueError("No se encontró el contenido de la página")
+
+
+def extraer_textos(pdf):
+    """
+    Extrae los textos dibujados con su fuente y posición absoluta
+
+    Interpreta solo los operadores necesarios: q/Q/cm para la matriz de
+    transformación y Tf/TL/Tm/Td/T*/Tj para el texto.
+
+    Returns:
+        list: Tuplas (texto, fuente, tamaño, x, y) ordenadas por posición
+    """
+    textos = []
+    pila = []
+    ctm = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+    fuente, tamano, interlineado = None, 0.0, 0.0
+    linea = (0.0, 0.0)
+    operandos = []
+
+    for token in _TOKEN.findall(_contenido_pagina(pdf)):
+        if token[:1] in b'(/' or token[:1].isdigit() or token[:1] in b'-+.':
+            operandos.append(token)
+            continue
+
+        op = token.decode('latin-1')
+        if op == 'q':
+            pila.append(ctm)
+        elif op == 'Q':
+            ctm = pila.pop()
+        elif op == 'cm':
+            a, b, c, d, e, f = (float(v) for v in operandos[-6:])
+            A, B, C, D, E, F = ctm
+            ctm = (a*A + b*C, a*B + b*D, c*A + d*C, c*B + d*D, e*A + f*C + E, e*B + f*D + F)
+        elif op == 'Tf':
+            fuente, tamano = operandos[-2].decode('latin-1'), float(operandos[-1])
+        elif op == 'TL':
+            interlineado = float(operandos[-1])
+        elif op == 'Tm':
+            linea = (float(operandos[-2]), float(operandos[-1]))
+        elif op == 'Td':
+            linea = (linea[0] + float(operandos[-2]), linea[1] + float(operandos[-1]))
+        elif op == 'T*':
+            linea = (linea[0], linea[1] - interlineado)
+        elif op == 'Tj':
+            texto = operandos[-1][1:-1].decode('latin-1')
+            x = ctm[0]*linea[0] + ctm[2]*linea[1] + ctm[4]
+            y = ctm[1]*linea[0] + ctm[3]*linea[1] + ctm[5]
+            textos.append((texto, fuente, tamano, x, y))
+        operandos = []
+
+    return sorted(textos, key=lambda t: (-round(t[4], 1), round(t[3], 1), t[0]))
+
+
+def comparar(textos_a, textos_b):
+    """Retorna la lista de diferencias entre dos extracciones de texto"""
+    diferencias = []
+    if len(textos_a) != len(textos_b):
+        diferencias.append(f"Cantidad de textos distinta: {len(textos_a)} vs {len(textos_b)}")
+    for a, b in zip(textos_a, textos_b):
+        if (a[0] != b[0] or a[2] != b[2]
+                or abs(a[3] - b[3]) > TOLERANCIA or abs(a[4] - b[4]) > TOLERANCIA):
+            diferencias.append(f"{a[0]!r} ({a[3]:.2f}, {a[4]:.2f}) vs {b[0]!r} ({b[3]:.2f}, {b[4]:.2f})")
+    return diferencias
+
+
+def medir(funcion, repeticiones):
+    """Retorna el tiempo de CPU promedio por llamada en milisegundos"""
+    inicio = time.process_time()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.process_time() - inicio) / repeticiones * 1000
+
+
+def main():
+    # Medir el renderizado real, no los aciertos de la caché de PDFs
+    render_cache.max_entradas = 0
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    boleta = crear_boletas()['mensual']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_gen = PDFGenerator(EmpresaConfig(os.path.join(tmp, 'settings.json')))
+
+        # Equivalencia: PDFs sin comprimir para leer el contenido de la página
+        rl_config.pageCompression = 0
+        textos = {motor: extraer_textos(pdf_gen.renderizar('mensual', boleta, motor))
+                  for motor in ('platypus', 'canvas')}
+        rl_config.pageCompression = 1
+
+        diferencias = comparar(textos['platypus'], textos['canvas'])
+        print(f"Textos comparados: {len(textos['platypus'])}")
+        if diferencias:
+            print("Diferencias:")
+            for diferencia in diferencias:
+                print(f"  {diferencia}")
+        else:
+            print(f"Sin diferencias (tolerancia {TOLERANCIA} pt)")
+
+        # Rendimiento por boleta
+        print(f"\nRepeticiones por medición: {repeticiones}")
+        tiempos = {}
+        for motor in ('platypus', 'canvas'):
+            pdf_gen.renderizar('mensual', boleta, motor)
+            tiempos[motor] = medir(lambda: pdf_gen.renderizar('mensual', boleta, motor), repeticiones)
+            print(f"{motor:<10} {tiempos[motor]:>8.3f} ms/boleta")
+        print(f"Aceleración: {tiempos['platypus'] / tiempos['canvas']:.2f}x")
+
+    return 1 if diferencias else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
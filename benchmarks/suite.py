@@ -0,0 +1,381 @@
+"""
+Suite de benchmarks de generación de boletas
+Mide la generación de los tres tipos de boleta directamente con PDFGenerator,
+en lote y a través de los endpoints Flask (test client), y compara el
+resultado con una línea base guardada para detectar regresiones
+
+Todo se ejecuta sin red en una carpeta temporal (configuración, logo,
+empleados y PDFs de prueba), sin tocar los datos reales.
+
+Métricas por escenario: latencia p50/p95 (ms), tamaño del PDF (bytes) y
+boletas por segundo. Al final se reporta el pico de memoria (RSS) del proceso.
+
+Uso:
+    python benchmarks/suite.py                      # ejecutar y comparar con la línea base
+    python benchmarks/suite.py --guardar-baseline   # ejecutar y guardar como línea base
+    python benchmarks/suite.py -n 50 --lote 200 --tolerancia 0.10 --salida resultados.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import reportlab
+
+from config.empresa import EmpresaConfig
+from models.boleta_mensual import BoletaMensual
+from models.boleta_aguinaldo import BoletaAguinaldo
+from models.boleta_liquidacion import BoletaLiquidacion
+from generators.pdf_generator import PDFGenerator
+from generators.lote import GeneradorLoteMensual
+from generators.cache_render import render_cache
+
+BASELINE = os.path.join(RAIZ, 'benchmarks', 'baseline.json')
+
+# Métricas comparadas con la línea base: True si un valor mayor es peor
+METRICAS = {
+    'p50_ms': True,
+    'p95_ms': True,
+    'bytes_pdf': True,
+    'boletas_por_segundo': False,
+}
+
+NOMBRE_NORMAL = "Juan Carlos Pérez Mamani"
+NOMBRE_LARGO = "María de los Ángeles Fernández de Córdova Villarroel Quispe Mamani"
+
+
+def percentil(muestras, p):
+    """Percentil p (0-100) con interpolación lineal"""
+    ordenadas = sorted(muestras)
+    if not ordenadas:
+        return 0.0
+    k = (len(ordenadas) - 1) * p / 100.0
+    inferior = int(k)
+    superior = min(inferior + 1, len(ordenadas) - 1)
+    return ordenadas[inferior] + (ordenadas[superior] - ordenadas[inferior]) * (k - inferior)
+
+
+def resumen(latencias, tamanos, boletas, duracion):
+    """
+    Resume las mediciones de un escenario
+
+    Args:
+        latencias: Segundos por operación
+        tamanos: Bytes de cada PDF (puede estar vacío)
+        boletas: Cantidad de boletas generadas
+        duracion: Segundos totales del escenario
+    """
+    return {
+        'p50_ms': round(percentil(latencias, 50) * 1000, 3),
+        'p95_ms': round(percentil(latencias, 95) * 1000, 3),
+        'bytes_pdf': round(sum(tamanos) / len(tamanos)) if tamanos else None,
+        'boletas_por_segundo': round(boletas / duracion, 2) if duracion > 0 else 0.0,
+        'muestras': len(latencias),
+    }
+
+
+def rss_pico_mb():
+    """Pico de memoria residente del proceso en MB (None si no está disponible)"""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS bytes
+    return round(pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024, 1)
+
+
+def preparar_entorno(carpeta):
+    """
+    Crea configuración, logo y carpetas de trabajo en una carpeta temporal
+
+    Returns:
+        dict: Configuraciones {'con_logo': EmpresaConfig, 'sin_logo': EmpresaConfig}
+    """
+    os.chdir(carpeta)
+    from crear_logo import crear_logo
+    crear_logo()
+
+    datos = dict(
+        nombre="Servicios Integrales Andinos S.R.L.",
+        eslogan="Excelencia en Servicios Contables y Administrativos",
+        contabilidad="Lic. Roberto Gutiérrez Salazar",
+        direccion="Av. 6 de Agosto #2450, Edificio Torre Azul, Piso 8, La Paz",
+        telefono="591-2-2441234",
+        nit="1020304050",
+        actividad="Servicios profesionales"
+    )
+    con_logo = EmpresaConfig(os.path.join('config', 'settings.json'))
+    con_logo.set_empresa_data(logo_path=os.path.join('static', 'uploads', 'logo.png'), **datos)
+    sin_logo = EmpresaConfig(os.path.join('config', 'sin_logo.json'))
+    sin_logo.set_empresa_data(logo_path=os.path.join('static', 'uploads', 'no_existe.png'), **datos)
+    return {'con_logo': con_logo, 'sin_logo': sin_logo}
+
+
+def crear_boleta(tipo, extrema, numero):
+    """
+    Crea una boleta con datos realistas
+
+    Args:
+        tipo: 'mensual', 'aguinaldo' o 'liquidacion'
+        extrema: Si es True usa nombre largo y montos grandes
+        numero: Número correlativo de la boleta
+    """
+    factor = 1000 if extrema else 1
+    nombre = NOMBRE_LARGO if extrema else NOMBRE_NORMAL
+
+    if tipo == 'mensual':
+        boleta = BoletaMensual()
+        boleta.cargo = "Jefe de Contabilidad y Finanzas" if extrema else "Contador"
+        boleta.mes_pago = "DICIEMBRE"
+        boleta.anio = 2025
+        boleta.rango_fechas = "01/12/2025 - 31/12/2025"
+        boleta.haber_basico = 4500.0 * factor
+        boleta.horas_extra = 320.5 * factor
+        boleta.bono_antiguedad = 250.75 * factor
+        boleta.otros_ingresos = 180.0 * factor
+        boleta.faltas = 150.0 * factor
+        boleta.retrasos = 45.5 * factor
+        boleta.reposiciones = 12.25 * factor
+        boleta.otros_egresos = 30.0 * factor
+    elif tipo == 'aguinaldo':
+        boleta = BoletaAguinaldo()
+        boleta.cargo = "Contador"
+        boleta.anio = 2025
+        boleta.fecha_ingreso = "15/03/2019"
+        boleta.fecha_inicio = "01/01/2025"
+        boleta.fecha_fin = "31/12/2025"
+        boleta.promedio_ultimos_3_pagos = 4200.0 * factor
+        boleta.otros = 150.0 * factor
+    else:
+        boleta = BoletaLiquidacion()
+        boleta.cargo = "Contador"
+        boleta.domicilio_trabajador = "Calle Jaén #745, Zona Central, La Paz"
+        boleta.fecha_ingreso = "01/03/2019"
+        boleta.fecha_retiro = "30/06/2025"
+        boleta.ultimo_sueldo = 4500.0 * factor
+        boleta.promedio_ultimos_3_sueldos = 4400.0 * factor
+        boleta.indemnizacion = 25000.0 * factor
+        boleta.aguinaldo = 2100.0 * factor
+        boleta.vacaciones = 1500.0 * factor
+        boleta.otros_beneficios = 300.0 * factor
+        boleta.anticipos = 500.0 * factor
+        boleta.prestamos = 1000.0 * factor
+        boleta.otras_deducciones = 80.0 * factor
+
+    boleta.nombre_completo = nombre
+    boleta.ci = "4567890 LP"
+    boleta.fecha_emision = datetime(2025, 12, 31)
+    boleta.numero_boleta = f"BOL-{numero:06d}"
+    return boleta
+
+
+def medir_renderizado(configs, repeticiones):
+    """Escenarios de PDFGenerator.renderizar para cada tipo, logo y variante de datos"""
+    resultados = {}
+    numero = 0
+    combinaciones = [(tipo, 'platypus') for tipo in ('mensual', 'aguinaldo', 'liquidacion')]
+    combinaciones.insert(1, ('mensual', 'canvas'))
+
+    for tipo, motor in combinaciones:
+        for logo, config in configs.items():
+            pdf_gen = PDFGenerator(config)
+            for extrema in (False, True):
+                nombre = f"render/{tipo}{'-canvas' if motor == 'canvas' else ''}/{logo}/{'extrema' if extrema else 'normal'}"
+                latencias, tamanos = [], []
+                inicio = time.perf_counter()
+                for _ in range(repeticiones):
+                    numero += 1
+                    boleta = crear_boleta(tipo, extrema, numero)
+                    t0 = time.perf_counter()
+                    contenido = pdf_gen.renderizar(tipo, boleta, motor)
+                    latencias.append(time.perf_counter() - t0)
+                    tamanos.append(len(contenido))
+                resultados[nombre] = resumen(latencias, tamanos, repeticiones, time.perf_counter() - inicio)
+    return resultados
+
+
+def empleados_ficticios(cantidad):
+    """Planilla de prueba como lista de diccionarios"""
+    return [{
+        'id': i + 1,
+        'nombre_completo': NOMBRE_LARGO if i % 10 == 0 else f"{NOMBRE_NORMAL} {i}",
+        'ci': f"{1000000 + i} LP",
+        'cargo': "Contador",
+        'fecha_ingreso': "01/01/2020",
+        'sueldo': 3000.0 + i,
+    } for i in range(cantidad)]
+
+
+def medir_lote(config, cantidad):
+    """Escenarios de generación en lote en un proceso y con todos los núcleos"""
+    resultados = {}
+    periodo = {'mes_pago': 'DICIEMBRE', 'anio': 2025, 'fecha_emision': '31/12/2025'}
+    empleados = empleados_ficticios(cantidad)
+
+    for procesos in sorted({1, os.cpu_count() or 1}):
+        for motor in ('platypus', 'canvas'):
+            generador = GeneradorLoteMensual(config, max_procesos=procesos, motor=motor)
+            inicio = time.perf_counter()
+            manifiesto = generador.generar(empleados, periodo)
+            duracion = time.perf_counter() - inicio
+            # En lote solo se conoce la duración total: la latencia es el promedio por boleta
+            por_boleta = duracion / max(manifiesto['generadas'], 1)
+            resultados[f"lote/{motor}/{procesos}_procesos"] = resumen(
+                [por_boleta], [], manifiesto['generadas'], duracion)
+    return resultados
+
+
+def medir_endpoints(repeticiones, cantidad_lote):
+    """Escenarios de los endpoints Flask a través del test client"""
+    import app as aplicacion
+    from models.empleado import Empleado
+
+    cliente = aplicacion.app.test_client()
+    with cliente.session_transaction() as sesion:
+        sesion['logged_in'] = True
+
+    formularios = {
+        'mensual': {'nombre_completo': NOMBRE_NORMAL, 'ci': '4567890 LP', 'cargo': 'Contador',
+                    'mes_pago': 'DICIEMBRE', 'anio': 2025, 'haber_basico': 4500, 'horas_extra': 320.5,
+                    'bono_antiguedad': 250, 'faltas': 150, 'fecha_emision': '31/12/2025'},
+        'aguinaldo': {'nombre_completo': NOMBRE_NORMAL, 'ci': '4567890 LP', 'cargo': 'Contador',
+                      'anio': 2025, 'fecha_ingreso': '15/03/2019', 'fecha_inicio': '01/01/2025',
+                      'fecha_fin': '31/12/2025', 'promedio_ultimos_3_pagos': 4200, 'fecha_emision': '31/12/2025'},
+        'liquidacion': {'nombre_completo': NOMBRE_NORMAL, 'ci': '4567890 LP', 'cargo': 'Contador',
+                        'fecha_ingreso': '01/03/2019', 'fecha_retiro': '30/06/2025', 'ultimo_sueldo': 4500,
+                        'indemnizacion': 25000, 'aguinaldo': 2100, 'anticipos': 500, 'fecha_emision': '31/12/2025'},
+    }
+
+    resultados = {}
+    for tipo, formulario in formularios.items():
+        for url, modo in ((f'/api/boleta/{tipo}', 'json'), (f'/api/boleta/{tipo}?directo=1', 'directo')):
+            latencias, tamanos = [], []
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                t0 = time.perf_counter()
+                respuesta = cliente.post(url, json=dict(formulario, persistir=False))
+                latencias.append(time.perf_counter() - t0)
+                if respuesta.status_code != 200:
+                    raise RuntimeError(f"{url} respondió {respuesta.status_code}: {respuesta.get_data(as_text=True)}")
+                if modo == 'directo':
+                    tamanos.append(len(respuesta.data))
+            resultados[f"http/{tipo}/{modo}"] = resumen(latencias, tamanos, repeticiones, time.perf_counter() - inicio)
+
+    # Lote a través del endpoint con la planilla registrada
+    for emp in empleados_ficticios(cantidad_lote):
+        aplicacion.empleado_manager.agregar_empleado(Empleado(
+            emp['nombre_completo'], emp['ci'], emp['cargo'], emp['fecha_ingreso'], emp['sueldo'], emp['id']))
+    inicio = time.perf_counter()
+    respuesta = cliente.post('/api/boleta/mensual/lote', json={
+        'mes_pago': 'DICIEMBRE', 'anio': 2025, 'fecha_emision': '31/12/2025'})
+    duracion = time.perf_counter() - inicio
+    generadas = respuesta.get_json()['manifiesto']['generadas']
+    resultados['http/lote'] = resumen([duracion / max(generadas, 1)], [], generadas, duracion)
+    return resultados
+
+
+def comparar_baseline(resultados, baseline, tolerancia):
+    """
+    Compara los escenarios con la línea base e imprime las diferencias
+
+    Returns:
+        int: Cantidad de métricas que empeoraron más que la tolerancia
+    """
+    regresiones = 0
+    print(f"\nComparación con la línea base ({baseline.get('fecha', '?')}), tolerancia {tolerancia:.0%}")
+    for nombre, actual in resultados['escenarios'].items():
+        anterior = baseline.get('escenarios', {}).get(nombre)
+        if anterior is None:
+            print(f"  {nombre:<45} (nuevo)")
+            continue
+        for metrica, mayor_es_peor in METRICAS.items():
+            antes, ahora = anterior.get(metrica), actual.get(metrica)
+            if not antes or ahora is None:
+                continue
+            cambio = (ahora - antes) / antes
+            empeoro = cambio > tolerancia if mayor_es_peor else cambio < -tolerancia
+            if empeoro:
+                regresiones += 1
+                print(f"  {nombre:<45} {metrica:<20} {antes:>10} -> {ahora:>10} ({cambio:+.1%}) REGRESIÓN")
+    if not regresiones:
+        print("  Sin regresiones")
+    return regresiones
+
+
+def imprimir(resultados):
+    """Imprime la tabla de resultados"""
+    print(f"{'Escenario':<45} {'p50 ms':>9} {'p95 ms':>9} {'bytes':>8} {'boletas/s':>10}")
+    for nombre, r in resultados['escenarios'].items():
+        print(f"{nombre:<45} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+              f"{r['bytes_pdf'] if r['bytes_pdf'] is not None else '-':>8} {r['boletas_por_segundo']:>10.2f}")
+    print(f"\nPico de memoria (RSS): {resultados['rss_pico_mb']} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de generación de boletas")
+    parser.add_argument('-n', '--repeticiones', type=int, default=20, help="Boletas por escenario")
+    parser.add_argument('--lote', type=int, default=100, help="Empleados de los escenarios en lote")
+    parser.add_argument('--baseline', default=BASELINE, help="Archivo JSON de la línea base")
+    parser.add_argument('--guardar-baseline', action='store_true', help="Guardar esta ejecución como línea base")
+    parser.add_argument('--tolerancia', type=float, default=0.15, help="Empeoramiento aceptado (0.15 = 15%%)")
+    parser.add_argument('--salida', help="Guardar también los resultados en este archivo JSON")
+    args = parser.parse_args()
+
+    # Medir el renderizado real, no los aciertos de la caché de PDFs
+    render_cache.max_entradas = 0
+
+    resultados = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'reportlab': reportlab.Version,
+        'plataforma': platform.platform(),
+        'repeticiones': args.repeticiones,
+        'lote': args.lote,
+        'escenarios': {},
+    }
+
+    directorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            configs = preparar_entorno(tmp)
+            resultados['escenarios'].update(medir_renderizado(configs, args.repeticiones))
+            resultados['escenarios'].update(medir_lote(configs['con_logo'], args.lote))
+            resultados['escenarios'].update(medir_endpoints(args.repeticiones, args.lote))
+        finally:
+            os.chdir(directorio_original)
+    resultados['rss_pico_mb'] = rss_pico_mb()
+
+    imprimir(resultados)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+    if args.guardar_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\nLínea base guardada en {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo hay línea base en {args.baseline}; use --guardar-baseline para crearla")
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    return 1 if comparar_baseline(resultados, baseline, args.tolerancia) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,21 +5,69 @@ Maneja la carga y guardado de configuración de la empresa
 
 import json
 import os
+import threading
 from datetime import datetime
 
+from config.numeracion import SecuenciaNumeracion
+from monitoreo.metricas import metricas
+
 class EmpresaConfig:
     def __init__(self, config_file="config/settings.json"):
         self.config_file = config_file
+        # Firma (mtime, tamaño, inodo) del archivo leído o escrito por última vez
+        self._firma = None
+        self._lock = threading.Lock()
         self.config = self.load_config()
+        # Se incrementa cada vez que cambian los datos de empresa o el logo
+        self.version = 0
+        # La numeración vive en su propia base, compartida por todos los procesos;
+        # ultimo_numero de settings.json solo se usa para migrar la secuencia
+        self.numeracion = SecuenciaNumeracion(
+            os.path.join(os.path.dirname(config_file), "numeracion.db"),
+            inicial=self.config["boletas"].get("ultimo_numero", 0)
+        )
+    
+    def _firma_archivo(self, stat=None):
+        """Retorna la firma del archivo de configuración o None si no existe"""
+        if stat is None:
+            try:
+                stat = os.stat(self.config_file)
+            except FileNotFoundError:
+                return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
     
     def load_config(self):
         """Carga la configuración desde el archivo JSON"""
         if os.path.exists(self.config_file):
             with open(self.config_file, 'r', encoding='utf-8') as f:
+                # La firma se toma del archivo abierto: si otro proceso lo
+                # reemplaza mientras tanto, el próximo refrescar() lo detecta
+                self._firma = self._firma_archivo(os.fstat(f.fileno()))
                 return json.load(f)
         else:
+            self._firma = None
             return self.get_default_config()
     
+    def refrescar(self):
+        """
+        Recarga la configuración si otro proceso la guardó
+        
+        Solo hace un stat del archivo; el JSON se vuelve a leer únicamente
+        cuando cambió, y en ese caso se incrementa la versión para invalidar
+        las cachés de logo, párrafos y PDFs.
+        
+        Returns:
+            bool: True si la configuración se recargó
+        """
+        if self._firma_archivo() == self._firma:
+            return False
+        with self._lock:
+            if self._firma_archivo() == self._firma:
+                return False
+            self.config = self.load_config()
+            self.version += 1
+        return True
+    
     def get_default_config(self):
         """Retorna configuración por defecto"""
         return {
@@ -40,10 +88,28 @@ class EmpresaConfig:
         }
     
     def save_config(self):
-        """Guarda la configuración en el archivo JSON"""
-        os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, indent=4, ensure_ascii=False)
+        """Guarda la configuración en el archivo JSON (escritura atómica)"""
+        directorio = os.path.dirname(self.config_file)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        # Temporal en la misma carpeta y os.replace: los demás procesos leen
+        # el archivo anterior o el nuevo, nunca uno a medio escribir
+        temporal = f"{self.config_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(self.config, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+                firma = self._firma_archivo(os.fstat(f.fileno()))
+            os.replace(temporal, self.config_file)
+        except BaseException:
+            try:
+                os.remove(temporal)
+            except FileNotFoundError:
+                pass
+            raise
+        # El propio cambio no debe provocar una recarga
+        self._firma = firma
     
     def get_empresa_data(self):
         """Retorna los datos de la empresa"""
@@ -62,15 +128,30 @@ class EmpresaConfig:
             "logo_path": logo_path
         }
         self.save_config()
+        self.version += 1
     
-    def get_next_numero_boleta(self):
-        """Obtiene el siguiente número de boleta y lo incrementa"""
-        numero = self.config["boletas"]["ultimo_numero"] + 1
-        self.config["boletas"]["ultimo_numero"] = numero
-        self.save_config()
+    def formatear_numero_boleta(self, numero):
+        """Retorna el número de boleta con prefijo: BOL-000123"""
         prefijo = self.config["boletas"]["prefijo"]
         return f"{prefijo}-{numero:06d}"
     
+    def get_next_numero_boleta(self):
+        """Obtiene el siguiente número de boleta de la secuencia compartida"""
+        numero = self.numeracion.siguiente()
+        metricas.incrementar('boletas_numeracion_total')
+        return self.formatear_numero_boleta(numero)
+    
+    def reservar_numeros_boleta(self, cantidad):
+        """
+        Reserva un bloque de números de boleta consecutivos (lotes)
+        
+        Returns:
+            list: Números de boleta con prefijo, en orden
+        """
+        numeros = self.numeracion.reservar(cantidad)
+        metricas.incrementar('boletas_numeracion_total', valor=cantidad)
+        return [self.formatear_numero_boleta(numero) for numero in numeros]
+    
     def get_logo_path(self):
         """Retorna la ruta del logo"""
         return self.config["empresa"].get("logo_path", "static/uploads/logo.png")
@@ -79,3 +160,10 @@ class EmpresaConfig:
         """Verifica si existe el archivo del logo"""
         logo_path = self.get_logo_path()
         return os.path.exists(logo_path)
+    
+    def leer_logo(self):
+        """Retorna los bytes del logo o None si no existe"""
+        if not self.logo_exists():
+            return None
+        with open(self.get_logo_path(), 'rb') as f:
+            return f.read()
@@ -0,0 +1,111 @@
+"""
+Secuencia de numeración de boletas
+Entrega números correlativos, sin huecos ni duplicados, aunque varios
+procesos (workers de gunicorn, procesos del lote) numeren a la vez
+
+El último número vive en una tabla SQLite y cada asignación es una
+transacción BEGIN IMMEDIATE: el bloqueo de escritura de SQLite serializa a
+los procesos y el incremento se confirma antes de entregar el número. Los
+lotes reservan un bloque completo en una sola transacción.
+"""
+
+import os
+import sqlite3
+import threading
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS secuencias (
+    nombre TEXT PRIMARY KEY,
+    ultimo INTEGER NOT NULL
+);
+"""
+
+
+class SecuenciaNumeracion:
+    """Contador persistente y atómico entre procesos"""
+
+    def __init__(self, db_file="config/numeracion.db", nombre="boletas", inicial=0):
+        """
+        Inicializa la secuencia
+
+        Args:
+            db_file: Ruta de la base SQLite
+            nombre: Nombre de la secuencia dentro de la base
+            inicial: Último número ya emitido antes de usar la secuencia
+                     (migración desde settings.json); nunca hace retroceder
+                     a una secuencia existente
+        """
+        self.db_file = db_file
+        self.nombre = nombre
+        self.inicial = inicial
+        self._lock = threading.Lock()
+        self._esquema_listo = False
+        self._local = threading.local()
+
+    def _conectar(self):
+        """Retorna la conexión del hilo (abrirla cuesta más que la transacción)"""
+        conn = getattr(self._local, 'conn', None)
+        # Una conexión heredada por fork no se reutiliza en el proceso hijo
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._local.conn = self._abrir()
+            self._local.pid = os.getpid()
+        return conn
+
+    def _abrir(self):
+        """Abre una conexión en modo de transacciones explícitas"""
+        if not self._esquema_listo:
+            with self._lock:
+                if not self._esquema_listo:
+                    directorio = os.path.dirname(self.db_file)
+                    if directorio:
+                        os.makedirs(directorio, exist_ok=True)
+                    conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+                    try:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(ESQUEMA)
+                        with conn:
+                            conn.execute("BEGIN IMMEDIATE")
+                            conn.execute("INSERT OR IGNORE INTO secuencias (nombre, ultimo) VALUES (?, 0)",
+                                         (self.nombre,))
+                            conn.execute("UPDATE secuencias SET ultimo = MAX(ultimo, ?) WHERE nombre = ?",
+                                         (self.inicial, self.nombre))
+                    finally:
+                        conn.close()
+                    self._esquema_listo = True
+        return sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+
+    def reservar(self, cantidad):
+        """
+        Reserva un bloque de números consecutivos
+
+        Args:
+            cantidad: Cantidad de números a reservar
+
+        Returns:
+            range: Números reservados, en orden
+        """
+        if cantidad < 1:
+            raise ValueError("La cantidad a reservar debe ser mayor a cero")
+
+        conn = self._conectar()
+        # BEGIN IMMEDIATE toma el bloqueo de escritura antes de leer
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("UPDATE secuencias SET ultimo = ultimo + ? WHERE nombre = ?",
+                         (cantidad, self.nombre))
+            ultimo = conn.execute("SELECT ultimo FROM secuencias WHERE nombre = ?",
+                                  (self.nombre,)).fetchone()[0]
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return range(ultimo - cantidad + 1, ultimo + 1)
+
+    def siguiente(self):
+        """Reserva y retorna el siguiente número"""
+        return self.reservar(1)[0]
+
+    def actual(self):
+        """Retorna el último número emitido"""
+        conn = self._conectar()
+        return conn.execute("SELECT ultimo FROM secuencias WHERE nombre = ?", (self.nombre,)).fetchone()[0]
@@ -0,0 +1,328 @@
+"""
+Almacén de PDFs generados
+Organiza los archivos en output/{anio}/{mes}/{tipo}/, mantiene un índice
+SQLite de nombre de archivo y número de boleta a ruta, y aplica un
+presupuesto de espacio y antigüedad descartando los archivos menos usados
+
+Solo se descartan PDFs individuales de boletas que están en el registro de
+boletas, porque /api/download puede volver a generarlos; los consolidados,
+los de impresión y las boletas anteriores al registro se conservan.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from models.registro_boletas import registro_boletas
+
+# Presupuesto por defecto (configurable por variables de entorno)
+MAX_BYTES = int(os.environ.get('ALMACEN_MAX_MB', 2048)) * 1024 * 1024
+MAX_DIAS = int(os.environ.get('ALMACEN_MAX_DIAS', 0))  # 0 = sin límite de antigüedad
+
+# La política se revisa cada cierta cantidad de escrituras del proceso
+INTERVALO_POLITICA = 100
+
+# Nombre de archivo de una boleta individual: BOL-000001_Mensual_Nombre.pdf
+PATRON_BOLETA = re.compile(r'^(BOL-\d+)_(Mensual|Aguinaldo|Liquidacion)_')
+
+# Condición SQL de los archivos que la política puede descartar (además deben
+# figurar en el registro de boletas)
+DESCARTABLES = "tipo IN ('mensual', 'aguinaldo', 'liquidacion') AND numero_boleta IS NOT NULL"
+
+# Archivos por consulta al revisar cuáles están en el registro
+BLOQUE_POLITICA = 500
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS archivos (
+    filename TEXT PRIMARY KEY,
+    numero_boleta TEXT,
+    tipo TEXT NOT NULL,
+    ruta TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    creado REAL NOT NULL,
+    accedido REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_archivos_numero ON archivos (numero_boleta);
+CREATE INDEX IF NOT EXISTS idx_archivos_accedido ON archivos (accedido);
+CREATE INDEX IF NOT EXISTS idx_archivos_creado ON archivos (creado);
+"""
+
+
+class AlmacenPDF:
+    """Almacén particionado e indexado de PDFs con política de retención"""
+
+    def __init__(self, base_dir="output", db_file="config/almacen.db", max_bytes=MAX_BYTES, max_dias=MAX_DIAS,
+                 registro=None):
+        """
+        Inicializa el almacén
+
+        Args:
+            base_dir: Carpeta raíz de los PDFs
+            db_file: Ruta del índice SQLite
+            max_bytes: Tamaño total máximo de los PDFs (0 = sin límite)
+            max_dias: Antigüedad máxima en días (0 = sin límite)
+            registro: Registro de boletas con el que se regeneran los PDFs
+                      descartados (por defecto, el compartido)
+        """
+        self.base_dir = base_dir
+        self.db_file = db_file
+        self.max_bytes = max_bytes
+        self.max_dias = max_dias
+        self.registro = registro or registro_boletas
+        self._lock = threading.Lock()
+        self._esquema_listo = False
+        self._escrituras = 0
+
+    def _conectar(self):
+        """Abre una conexión al índice, creando el esquema la primera vez"""
+        if not self._esquema_listo:
+            with self._lock:
+                if not self._esquema_listo:
+                    directorio = os.path.dirname(self.db_file)
+                    if directorio:
+                        os.makedirs(directorio, exist_ok=True)
+                    conn = sqlite3.connect(self.db_file, timeout=30)
+                    try:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(ESQUEMA)
+                    finally:
+                        conn.close()
+                    self._esquema_listo = True
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def ruta_relativa(self, filename, tipo, fecha):
+        """Retorna la ruta {anio}/{mes}/{tipo}/{filename} relativa a la carpeta raíz"""
+        return os.path.join(str(fecha.year), f"{fecha.month:02d}", tipo, filename)
+
+    def guardar(self, filename, contenido, tipo, fecha=None, numero_boleta=None):
+        """
+        Escribe un PDF en su partición y lo registra en el índice
+
+        Args:
+            filename: Nombre del archivo
+            contenido: Bytes del PDF
+            tipo: Tipo de boleta o de documento ('consolidado', 'impresion')
+            fecha: Fecha que define la partición (por defecto, hoy)
+            numero_boleta: Número de boleta, si el archivo es una boleta individual
+
+        Returns:
+            str: Ruta del archivo escrito
+        """
+        ruta = self.ruta_relativa(filename, tipo, fecha or datetime.now())
+        filepath = os.path.join(self.base_dir, ruta)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+        # Escritura atómica: nunca se sirve un PDF a medio escribir
+        temporal = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporal, 'wb') as f:
+            f.write(contenido)
+        os.replace(temporal, filepath)
+
+        ahora = time.time()
+        conn = self._conectar()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO archivos (filename, numero_boleta, tipo, ruta, bytes, creado, accedido) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (filename, numero_boleta, tipo, ruta, len(contenido), ahora, ahora)
+                )
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._escrituras += 1
+            revisar = self._escrituras % INTERVALO_POLITICA == 0
+        if revisar:
+            self.aplicar_politica()
+        return filepath
+
+    def resolver(self, filename):
+        """
+        Obtiene la ruta de un PDF a partir de su nombre
+
+        Returns:
+            str: Ruta del archivo o None si no existe
+        """
+        conn = self._conectar()
+        try:
+            fila = conn.execute("SELECT ruta FROM archivos WHERE filename = ?", (filename,)).fetchone()
+            if fila is not None:
+                filepath = os.path.join(self.base_dir, fila['ruta'])
+                if os.path.exists(filepath):
+                    with conn:
+                        conn.execute("UPDATE archivos SET accedido = ? WHERE filename = ?", (time.time(), filename))
+                    return filepath
+                # El archivo se borró fuera del almacén
+                with conn:
+                    conn.execute("DELETE FROM archivos WHERE filename = ?", (filename,))
+        finally:
+            conn.close()
+        return None
+
+    def buscar_numero(self, numero_boleta):
+        """Retorna los archivos registrados para un número de boleta"""
+        conn = self._conectar()
+        try:
+            filas = conn.execute(
+                "SELECT filename, tipo, ruta, bytes, creado FROM archivos WHERE numero_boleta = ? ORDER BY creado DESC",
+                (numero_boleta,)
+            ).fetchall()
+            return [dict(fila) for fila in filas]
+        finally:
+            conn.close()
+
+    def _regenerables(self, cursor):
+        """
+        Recorre las filas de la consulta cuyo PDF está en el registro de boletas
+
+        Yields:
+            sqlite3.Row: Fila del índice (filename, ruta, bytes)
+        """
+        while True:
+            filas = cursor.fetchmany(BLOQUE_POLITICA)
+            if not filas:
+                return
+            registrados = self.registro.archivos_registrados([fila['filename'] for fila in filas])
+            for fila in filas:
+                if fila['filename'] in registrados:
+                    yield fila
+
+    def aplicar_politica(self):
+        """
+        Elimina los archivos que exceden la antigüedad máxima y luego los
+        menos usados hasta quedar dentro del espacio máximo
+
+        Solo se eliminan boletas individuales registradas (ver DESCARTABLES);
+        los demás archivos cuentan en el espacio usado pero se conservan.
+
+        Returns:
+            dict: Cantidad de archivos y bytes liberados
+        """
+        eliminados = []
+        conn = self._conectar()
+        try:
+            with conn:
+                if self.max_dias:
+                    limite = time.time() - self.max_dias * 86400
+                    eliminados += self._regenerables(conn.execute(
+                        f"SELECT filename, ruta, bytes FROM archivos WHERE creado < ? AND {DESCARTABLES}", (limite,)))
+
+                if self.max_bytes:
+                    total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM archivos").fetchone()[0]
+                    exceso = total - sum(fila['bytes'] for fila in eliminados) - self.max_bytes
+                    if exceso > 0:
+                        vencidos = {fila['filename'] for fila in eliminados}
+                        for fila in self._regenerables(conn.execute(
+                                f"SELECT filename, ruta, bytes FROM archivos WHERE {DESCARTABLES} ORDER BY accedido")):
+                            if exceso <= 0:
+                                break
+                            if fila['filename'] not in vencidos:
+                                eliminados.append(fila)
+                                exceso -= fila['bytes']
+
+                conn.executemany("DELETE FROM archivos WHERE filename = ?",
+                                 [(fila['filename'],) for fila in eliminados])
+        finally:
+            conn.close()
+
+        for fila in eliminados:
+            try:
+                os.remove(os.path.join(self.base_dir, fila['ruta']))
+            except FileNotFoundError:
+                pass
+        return {
+            'archivos': len(eliminados),
+            'bytes': sum(fila['bytes'] for fila in eliminados)
+        }
+
+    def migrar(self):
+        """
+        Mueve los PDFs de la carpeta plana anterior a sus particiones
+
+        Se ejecuta al iniciar cada worker: si otro proceso ya movió un
+        archivo, se salta.
+
+        Returns:
+            int: Cantidad de archivos migrados
+        """
+        if not os.path.isdir(self.base_dir):
+            return 0
+
+        migrados = 0
+        for entrada in os.scandir(self.base_dir):
+            if not entrada.is_file() or not entrada.name.lower().endswith('.pdf'):
+                continue
+            coincidencia = PATRON_BOLETA.match(entrada.name)
+            if coincidencia:
+                numero_boleta, tipo = coincidencia.group(1), coincidencia.group(2).lower()
+            else:
+                numero_boleta, tipo = None, 'consolidado'
+
+            try:
+                stat = entrada.stat()
+                ruta = self.ruta_relativa(entrada.name, tipo, datetime.fromtimestamp(stat.st_mtime))
+                filepath = os.path.join(self.base_dir, ruta)
+                os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                os.replace(entrada.path, filepath)
+            except FileNotFoundError:
+                # Otro worker lo migró al mismo tiempo
+                continue
+
+            conn = self._conectar()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO archivos (filename, numero_boleta, tipo, ruta, bytes, creado, accedido) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (entrada.name, numero_boleta, tipo, ruta, stat.st_size, stat.st_mtime, stat.st_mtime)
+                    )
+            finally:
+                conn.close()
+            migrados += 1
+        return migrados
+
+    def uso(self):
+        """
+        Reporta el uso de disco del almacén
+
+        Returns:
+            dict: Totales, presupuesto y desglose por tipo y por período
+        """
+        conn = self._conectar()
+        try:
+            archivos, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM archivos").fetchone()
+            por_tipo = {
+                fila['tipo']: {'archivos': fila['archivos'], 'bytes': fila['bytes']}
+                for fila in conn.execute(
+                    "SELECT tipo, COUNT(*) AS archivos, SUM(bytes) AS bytes FROM archivos GROUP BY tipo")
+            }
+            # La ruta empieza con {anio}/{mes}/
+            por_periodo = {}
+            for fila in conn.execute("SELECT ruta, bytes FROM archivos"):
+                periodo = '/'.join(fila['ruta'].split(os.sep)[:2])
+                actual = por_periodo.setdefault(periodo, {'archivos': 0, 'bytes': 0})
+                actual['archivos'] += 1
+                actual['bytes'] += fila['bytes']
+        finally:
+            conn.close()
+
+        return {
+            'archivos': archivos,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'max_dias': self.max_dias,
+            'uso_porcentaje': round(total / self.max_bytes * 100, 2) if self.max_bytes else None,
+            'por_tipo': por_tipo,
+            'por_periodo': dict(sorted(por_periodo.items()))
+        }
+
+
+# Instancia compartida por todo el proceso
+almacen_pdf = AlmacenPDF()
@@ -0,0 +1,137 @@
+"""
+Caché de PDFs renderizados
+Guarda los bytes de las boletas que van a volver a pedirse, direccionados
+por el contenido de la boleta, de los datos de empresa y del logo, para no
+volver a renderizar una boleta idéntica
+
+Una boleta nueva siempre lleva otro número, así que no se repite: lo que se
+repite es el PDF de una boleta ya numerada que se envió sin copia en disco
+(respuesta directa sin persistir) y que luego se descarga o se vuelve a
+descargar desde /api/download, donde se regenera con los datos del registro.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+# Límites de la caché por proceso
+MAX_ENTRADAS = 256
+MAX_BYTES = 16 * 1024 * 1024
+
+
+class _EntradaRender:
+    """PDF en caché junto con lo que costó generarlo"""
+
+    __slots__ = ('contenido', 'duracion')
+
+    def __init__(self, contenido, duracion):
+        self.contenido = contenido
+        self.duracion = duracion
+
+
+class CacheRender:
+    """Caché LRU acotada por cantidad de entradas y por bytes"""
+
+    def __init__(self, max_entradas=MAX_ENTRADAS, max_bytes=MAX_BYTES):
+        """
+        Args:
+            max_entradas: Cantidad máxima de PDFs en memoria (0 desactiva la caché)
+            max_bytes: Tamaño total máximo de los PDFs en memoria
+        """
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.segundos_ahorrados = 0.0
+
+    def clave(self, tipo, boleta, motor, empresa_config, huella_logo):
+        """
+        Calcula la clave de contenido de una boleta
+
+        Solo depende del contenido (no del archivo de configuración ni de su
+        versión), así la boleta regenerada desde el registro, con la copia de
+        los datos de empresa guardada al emitirla, tiene la misma clave que
+        la original.
+
+        Args:
+            tipo: 'mensual', 'aguinaldo' o 'liquidacion'
+            boleta: Instancia de la boleta
+            motor: Motor de renderizado
+            empresa_config: EmpresaConfig o EmpresaRegistrada
+            huella_logo: Huella del logo vigente
+
+        Returns:
+            str: Hash sha256 en hexadecimal
+        """
+        empresa = json.dumps(empresa_config.get_empresa_data(), sort_keys=True, ensure_ascii=False)
+        datos = json.dumps(boleta.to_dict(), sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(f"{tipo}|{motor}|{huella_logo}|{empresa}|{datos}".encode('utf-8')).hexdigest()
+
+    def obtener(self, clave):
+        """
+        Retorna el PDF en caché o None
+
+        Returns:
+            bytes: Contenido del PDF, o None si no está en caché
+        """
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            self.segundos_ahorrados += entrada.duracion
+            return entrada.contenido
+
+    def guardar(self, clave, contenido, duracion):
+        """
+        Agrega un PDF a la caché, descartando los menos usados si hace falta
+
+        Args:
+            clave: Clave calculada con clave()
+            contenido: Bytes del PDF
+            duracion: Segundos que tomó renderizarlo
+        """
+        if not self.max_entradas or len(contenido) > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self.bytes -= len(anterior.contenido)
+            self._entradas[clave] = _EntradaRender(contenido, duracion)
+            self.bytes += len(contenido)
+            while len(self._entradas) > self.max_entradas or self.bytes > self.max_bytes:
+                _, descartada = self._entradas.popitem(last=False)
+                self.bytes -= len(descartada.contenido)
+                self.evictions += 1
+
+    def limpiar(self):
+        """Vacía la caché sin reiniciar los contadores"""
+        with self._lock:
+            self._entradas.clear()
+            self.bytes = 0
+
+    def estadisticas(self):
+        """Retorna el estado de la caché y el tiempo de renderizado ahorrado"""
+        total = self.hits + self.misses
+        return {
+            'entradas': len(self._entradas),
+            'bytes': self.bytes,
+            'max_entradas': self.max_entradas,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'evictions': self.evictions,
+            'segundos_ahorrados': round(self.segundos_ahorrados, 3)
+        }
+
+
+# Instancia compartida por todo el proceso
+render_cache = CacheRender()
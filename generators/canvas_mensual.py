@@ -0,0 +1,301 @@
+"""
+Renderizador directo en canvas de la boleta mensual
+Dibuja el diseño fijo de media página con coordenadas precalculadas, sin
+pasar por el layout de platypus (SimpleDocTemplate / Table)
+
+Las coordenadas reproducen las reglas de reportlab para celdas de tabla:
+leading de 12 puntos, paddings de cada TableStyle y tablas centradas en el
+marco de SimpleDocTemplate.
+
+Como el diseño ocupa media página, también permite imprimir dos boletas por
+hoja carta con marcas de corte.
+"""
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas as pdfcanvas
+
+from generators.plantillas import (obtener_plantilla, VERDE, VERDE_CLARO, VERDE_OSCURO,
+                                   ROJO, ROJO_CLARO, ROJO_OSCURO, AZUL)
+
+# Geometría de la página (márgenes de la boleta mensual + padding del Frame)
+ANCHO_PAGINA, ALTO_PAGINA = letter
+MARGEN_IZQUIERDO = 0.5*inch
+MARGEN_SUPERIOR = 0.3*inch
+PADDING_FRAME = 6
+ANCHO_UTIL = ANCHO_PAGINA - 2*MARGEN_IZQUIERDO - 2*PADDING_FRAME
+Y_INICIO = ALTO_PAGINA - MARGEN_SUPERIOR - PADDING_FRAME
+
+# Impresión dos por hoja: la mitad inferior repite los márgenes de la superior
+Y_MITAD = ALTO_PAGINA / 2.0
+Y_INICIO_INFERIOR = Y_MITAD - MARGEN_SUPERIOR - PADDING_FRAME
+MODOS_IMPRESION = ('copias', 'lote')
+ETIQUETAS_COPIAS = ('ORIGINAL - EMPLEADOR', 'COPIA - EMPLEADO')
+LARGO_MARCA_CORTE = 0.25*inch
+
+LEADING = 12
+GRIS_FONDO = colors.HexColor('#ECF0F1')
+
+
+def _columnas(anchos):
+    """Retorna las posiciones x de los bordes de columnas de una tabla centrada"""
+    x = MARGEN_IZQUIERDO + PADDING_FRAME + (ANCHO_UTIL - sum(anchos)) / 2.0
+    posiciones = [x]
+    for ancho in anchos:
+        x += ancho
+        posiciones.append(x)
+    return posiciones
+
+
+def _baseline(bottom_padding, fontsize):
+    """Distancia desde el borde inferior de la fila a la línea base (VALIGN BOTTOM)"""
+    return bottom_padding + LEADING - fontsize
+
+
+def _baseline_centrada(top_padding, bottom_padding, alto_fila, fontsize):
+    """Distancia desde el borde inferior de la fila a la línea base (VALIGN MIDDLE)"""
+    return (bottom_padding + alto_fila - top_padding + LEADING) / 2.0 - fontsize
+
+
+class RenderizadorCanvasMensual:
+    """Dibuja boletas mensuales directamente sobre un Canvas de reportlab"""
+
+    def __init__(self, plantilla=None):
+        self.plantilla = plantilla or obtener_plantilla('mensual')
+        p = self.plantilla
+
+        # Encabezado: columnas logo / título / datos de empresa
+        self.cols_header = _columnas(p.header_col_widths)
+
+        # Datos del empleado: 4 filas de 16 pt (padding 2 + leading 12 + 2)
+        self.cols_empleado = _columnas(p.empleado_col_widths)
+        self.alto_fila_empleado = LEADING + 4
+        self.base_empleado = _baseline(2, 8)
+
+        # Ingresos/egresos: encabezado de 20 pt y 5 filas de 15 pt
+        self.cols_montos = _columnas(p.combinada_col_widths)
+        self.alto_titulo_montos = LEADING + 8
+        self.alto_fila_montos = LEADING + 3
+        self.base_titulo_montos = _baseline(4, 8)
+        self.base_fila_montos = _baseline(1.5, 7)
+
+        # Líquido pagable: una fila de 24 pt
+        self.cols_liquido = _columnas(p.liquido_col_widths)
+        self.alto_liquido = LEADING + 12
+        self.base_liquido = _baseline(6, 10)
+
+        # Firmas: filas de 23, 18 y 16 pt centradas verticalmente
+        self.cols_firmas = _columnas(p.firmas_col_widths)
+        self.firmas_filas = [
+            (LEADING + 11, _baseline_centrada(8, 3, LEADING + 11, 10), 'Helvetica', 10),
+            (LEADING + 6, _baseline_centrada(3, 3, LEADING + 6, 7), 'Helvetica-Bold', 7),
+            (LEADING + 4, _baseline_centrada(1, 3, LEADING + 4, 6), 'Helvetica', 6),
+        ]
+
+        # Separación entre bloques (mismos Spacer que el diseño platypus)
+        self.espacio_header = 0.08*inch
+        self.espacio_empleado = 0.12*inch
+        self.espacio_liquido = 0.22*inch
+
+    def renderizar(self, boleta, destino, logo, titulo, datos_empresa):
+        """
+        Genera el PDF de una boleta en destino (ruta o buffer)
+
+        Args:
+            boleta: Instancia de BoletaMensual
+            destino: Ruta del archivo o buffer
+            logo: LogoEmpresa en caché o None
+            titulo: Paragraph con el título y número de boleta
+            datos_empresa: Paragraph con los datos de la empresa
+        """
+        c = pdfcanvas.Canvas(destino, pagesize=letter)
+        self.dibujar(c, boleta, Y_INICIO, logo, titulo, datos_empresa)
+        c.showPage()
+        c.save()
+
+    def renderizar_dos_por_hoja(self, mitades, destino, logo, datos_empresa):
+        """
+        Genera un PDF con dos boletas por hoja carta y marcas de corte
+
+        Args:
+            mitades: Lista de tuplas (boleta, titulo, etiqueta) en orden de
+                     impresión; la etiqueta puede ser None
+            destino: Ruta del archivo o buffer
+            logo: LogoEmpresa en caché o None
+            datos_empresa: Paragraph con los datos de la empresa
+
+        Returns:
+            int: Cantidad de hojas generadas
+        """
+        c = pdfcanvas.Canvas(destino, pagesize=letter)
+        hojas = 0
+        for i in range(0, len(mitades), 2):
+            hoja = mitades[i:i + 2]
+            for (boleta, titulo, etiqueta), y in zip(hoja, (Y_INICIO, Y_INICIO_INFERIOR)):
+                if etiqueta:
+                    self._dibujar_etiqueta(c, y, etiqueta)
+                self.dibujar(c, boleta, y, logo, titulo, datos_empresa)
+            if len(hoja) == 2:
+                self._dibujar_marcas_corte(c)
+            c.showPage()
+            hojas += 1
+        c.save()
+        return hojas
+
+    def dibujar(self, c, boleta, y, logo, titulo, datos_empresa):
+        """
+        Dibuja la boleta a partir de la altura y (borde superior)
+
+        Returns:
+            float: Coordenada y del borde inferior de la boleta
+        """
+        y = self._dibujar_header(c, y, logo, titulo, datos_empresa)
+        y = self._dibujar_empleado(c, boleta, y - self.espacio_header)
+        y = self._dibujar_montos(c, boleta, y - self.espacio_empleado)
+        y = self._dibujar_liquido(c, boleta, y)
+        return self._dibujar_firmas(c, y - self.espacio_liquido)
+
+    def _dibujar_etiqueta(self, c, y, etiqueta):
+        """Leyenda de la copia sobre la esquina superior derecha de la boleta"""
+        c.setFillColor(colors.grey)
+        c.setFont('Helvetica-Bold', 6, LEADING)
+        c.drawRightString(ANCHO_PAGINA - MARGEN_IZQUIERDO - PADDING_FRAME, y + 4, etiqueta)
+
+    def _dibujar_marcas_corte(self, c):
+        """Línea punteada a media hoja y marcas en los bordes para cortar"""
+        c.saveState()
+        c.setStrokeColor(colors.grey)
+        c.setLineWidth(0.5)
+        c.line(0, Y_MITAD, LARGO_MARCA_CORTE, Y_MITAD)
+        c.line(ANCHO_PAGINA - LARGO_MARCA_CORTE, Y_MITAD, ANCHO_PAGINA, Y_MITAD)
+        c.setDash(4, 3)
+        c.line(MARGEN_IZQUIERDO, Y_MITAD, ANCHO_PAGINA - MARGEN_IZQUIERDO, Y_MITAD)
+        c.restoreState()
+
+    def _dibujar_header(self, c, y, logo, titulo, datos_empresa):
+        """Logo - Título - Datos Empresa centrados verticalmente en una fila"""
+        cols = self.cols_header
+        celdas = []
+        if logo:
+            ancho, alto = logo.dimensiones(0.8*inch)
+            celdas.append((alto, lambda y0, alto=alto, ancho=ancho: c.drawImage(
+                logo.imagen, cols[0] + 6, y0, ancho, alto, mask='auto')))
+        for col, parrafo in ((1, titulo), (2, datos_empresa)):
+            _, alto = parrafo.wrapOn(c, cols[col + 1] - cols[col] - 12, ALTO_PAGINA)
+            celdas.append((alto, lambda y0, parrafo=parrafo, col=col: parrafo.drawOn(c, cols[col] + 6, y0)))
+
+        alto_fila = max(alto for alto, _ in celdas) + 6
+        bottom = y - alto_fila
+        for alto, dibujar in celdas:
+            dibujar(bottom + (alto_fila - alto) / 2.0)
+        return bottom
+
+    def _dibujar_empleado(self, c, boleta, y):
+        """Tabla de datos del empleado"""
+        cols = self.cols_empleado
+        alto_fila = self.alto_fila_empleado
+        fecha = boleta.fecha_emision.strftime("%d/%m/%Y")
+        filas = [
+            ('Nombre:', boleta.nombre_completo, 'C.I.:', boleta.ci),
+            ('Cargo:', boleta.cargo, 'Período:', f"{boleta.mes_pago} {boleta.anio}"),
+            ('Rango:', boleta.rango_fechas, 'Fecha:', fecha) if boleta.rango_fechas else ('', '', 'Fecha:', fecha),
+            ('Método Pago:', getattr(boleta, 'metodo_pago', 'EFECTIVO'), '', ''),
+        ]
+        bottom = y - alto_fila * len(filas)
+
+        c.setFillColor(GRIS_FONDO)
+        c.rect(cols[0], bottom, cols[-1] - cols[0], y - bottom, stroke=0, fill=1)
+
+        c.setFillColor(colors.black)
+        for i, fila in enumerate(filas):
+            base = y - alto_fila * (i + 1) + self.base_empleado
+            for col, texto in enumerate(fila):
+                if texto:
+                    c.setFont('Helvetica-Bold' if col in (0, 2) else 'Helvetica', 8, LEADING)
+                    c.drawString(cols[col] + 6, base, str(texto))
+
+        c.setStrokeColor(colors.grey)
+        c.setLineWidth(0.5)
+        c.grid(cols, [y - alto_fila * i for i in range(len(filas) + 1)])
+        return bottom
+
+    def _dibujar_montos(self, c, boleta, y):
+        """Tabla combinada de ingresos y egresos"""
+        p = self.plantilla
+        cols = self.cols_montos
+        montos_ingresos = [boleta.haber_basico, boleta.horas_extra, boleta.bono_antiguedad,
+                           boleta.otros_ingresos, boleta.calcular_total_ingresos()]
+        montos_egresos = [boleta.faltas, boleta.retrasos, boleta.reposiciones,
+                          boleta.otros_egresos, boleta.calcular_total_egresos()]
+
+        filas_y = [y, y - self.alto_titulo_montos]
+        for _ in range(5):
+            filas_y.append(filas_y[-1] - self.alto_fila_montos)
+        bottom = filas_y[-1]
+
+        # Fondos: encabezado, detalle y total de cada lado
+        for x0, x1, colores in ((cols[0], cols[2], (VERDE, VERDE_CLARO, VERDE_OSCURO)),
+                                (cols[2], cols[4], (ROJO, ROJO_CLARO, ROJO_OSCURO))):
+            for (top, fondo_bottom), color in zip(((filas_y[0], filas_y[1]),
+                                                   (filas_y[1], filas_y[5]),
+                                                   (filas_y[5], filas_y[6])), colores):
+                c.setFillColor(color)
+                c.rect(x0, fondo_bottom, x1 - x0, top - fondo_bottom, stroke=0, fill=1)
+
+        c.setFillColor(colors.black)
+        c.setFont('Helvetica-Bold', 8, LEADING)
+        base = filas_y[1] + self.base_titulo_montos
+        for col, texto in enumerate((p.etiquetas_ingresos[0], 'Bs.', p.etiquetas_egresos[0], 'Bs.')):
+            self._texto_celda(c, cols, col, base, texto)
+
+        for i in range(5):
+            c.setFont('Helvetica-Bold' if i == 4 else 'Helvetica', 7, LEADING)
+            base = filas_y[i + 2] + self.base_fila_montos
+            fila = (p.etiquetas_ingresos[i + 1], f"{montos_ingresos[i]:.2f}",
+                    p.etiquetas_egresos[i + 1], f"{montos_egresos[i]:.2f}")
+            for col, texto in enumerate(fila):
+                self._texto_celda(c, cols, col, base, texto)
+
+        c.setStrokeColor(colors.black)
+        c.setLineWidth(0.5)
+        c.grid(cols, filas_y)
+        return bottom
+
+    def _texto_celda(self, c, cols, col, base, texto):
+        """Etiquetas a la izquierda (columnas pares) y montos a la derecha"""
+        if col % 2 == 0:
+            c.drawString(cols[col] + 6, base, texto)
+        else:
+            c.drawRightString(cols[col + 1] - 6, base, texto)
+
+    def _dibujar_liquido(self, c, boleta, y):
+        """Fila de líquido pagable"""
+        cols = self.cols_liquido
+        bottom = y - self.alto_liquido
+
+        c.setFillColor(AZUL)
+        c.rect(cols[0], bottom, cols[-1] - cols[0], self.alto_liquido, stroke=0, fill=1)
+
+        c.setFillColor(colors.black)
+        c.setFont('Helvetica-Bold', 10, LEADING)
+        base = bottom + self.base_liquido
+        c.drawString(cols[0] + 6, base, 'LÍQUIDO PAGABLE')
+        c.drawRightString(cols[2] - 6, base, f"{boleta.calcular_liquido_pagable():.2f} Bs.")
+
+        c.setStrokeColor(colors.black)
+        c.setLineWidth(1.5)
+        c.grid(cols, [y, bottom])
+        return bottom
+
+    def _dibujar_firmas(self, c, y):
+        """Líneas y leyendas de firma de empleador y empleado"""
+        cols = self.cols_firmas
+        centros = ((cols[0] + cols[1]) / 2.0, (cols[2] + cols[3]) / 2.0)
+        c.setFillColor(colors.black)
+        for fila, (alto, base, fuente, tamano) in zip(self.plantilla.firmas_data, self.firmas_filas):
+            y -= alto
+            c.setFont(fuente, tamano, LEADING)
+            c.drawCentredString(centros[0], y + base, fila[0])
+            c.drawCentredString(centros[1], y + base, fila[2])
+        return y
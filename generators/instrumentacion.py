@@ -0,0 +1,267 @@
+"""
+Instrumentación por etapas de la generación de PDFs
+Registra cuánto tarda cada etapa de una boleta (recursos, flowables, layout
+e I/O) como log estructurado y en histogramas agregados por tipo
+
+Se activa con la variable de entorno BOLETAS_INSTRUMENTACION=1 o con
+instrumentacion.activar(); desactivada, cada punto de medición solo
+consulta un booleano. Al activarla, si el logger boletas.instrumentacion no
+fue configurado por la aplicación, se le asigna el nivel INFO y un handler
+que escribe una línea JSON por boleta en stderr.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+# Etapas medidas; 'otros' es el tiempo no atribuido a ninguna etapa
+ETAPAS = ('recursos', 'flowables', 'layout', 'io', 'otros')
+
+# Límites superiores de los buckets de los histogramas, en milisegundos
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+logger = logging.getLogger('boletas.instrumentacion')
+
+_NULO = nullcontext()
+
+
+def _configurar_logger():
+    """
+    Habilita el log de mediciones si nadie lo configuró
+
+    Un logger sin nivel hereda WARNING de la raíz y descartaría los
+    registros INFO; si ya tiene nivel o handlers propios se respeta esa
+    configuración.
+    """
+    if logger.level != logging.NOTSET or logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    # El handler propio ya escribe cada medición: no se repite en los de la raíz
+    logger.propagate = False
+
+
+class Histograma:
+    """Histograma acumulado de duraciones en milisegundos"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.cantidad = 0
+        self.suma_ms = 0.0
+        self.maximo_ms = 0.0
+
+    def agregar(self, ms):
+        """Registra una duración"""
+        for i, limite in enumerate(BUCKETS_MS):
+            if ms <= limite:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        self.cantidad += 1
+        self.suma_ms += ms
+        self.maximo_ms = max(self.maximo_ms, ms)
+
+    def percentil(self, p):
+        """Estimación del percentil p (0-100): límite del bucket que lo contiene"""
+        if not self.cantidad:
+            return 0.0
+        objetivo = self.cantidad * p / 100.0
+        acumulado = 0
+        for limite, cantidad in zip(BUCKETS_MS, self.buckets):
+            acumulado += cantidad
+            if acumulado >= objetivo:
+                return float(limite)
+        return self.maximo_ms
+
+    def to_dict(self):
+        """Convierte el histograma a diccionario"""
+        limites = [str(limite) for limite in BUCKETS_MS] + ['+Inf']
+        return {
+            'cantidad': self.cantidad,
+            'suma_ms': round(self.suma_ms, 3),
+            'promedio_ms': round(self.suma_ms / self.cantidad, 3) if self.cantidad else 0.0,
+            'maximo_ms': round(self.maximo_ms, 3),
+            'p50_ms': self.percentil(50),
+            'p95_ms': self.percentil(95),
+            'buckets': dict(zip(limites, self.buckets))
+        }
+
+
+class Medicion:
+    """Duraciones de las etapas de una boleta; las etapas anidadas se excluyen de la externa"""
+
+    def __init__(self, tipo, motor):
+        self.tipo = tipo
+        self.motor = motor
+        self.etapas = {}
+        self.cache = False
+        self._pila = []
+        self._inicio = time.perf_counter()
+        self.total = 0.0
+
+    def iniciar_etapa(self, nombre):
+        """Inicia una etapa pausando la etapa externa en curso"""
+        ahora = time.perf_counter()
+        if self._pila:
+            externa, inicio = self._pila[-1]
+            self.etapas[externa] = self.etapas.get(externa, 0.0) + ahora - inicio
+        self._pila.append((nombre, ahora))
+
+    def terminar_etapa(self):
+        """Termina la etapa actual y reanuda la externa"""
+        ahora = time.perf_counter()
+        nombre, inicio = self._pila.pop()
+        self.etapas[nombre] = self.etapas.get(nombre, 0.0) + ahora - inicio
+        if self._pila:
+            self._pila[-1] = (self._pila[-1][0], ahora)
+
+    def finalizar(self):
+        """Cierra la medición y atribuye el resto del tiempo a 'otros'"""
+        self.total = time.perf_counter() - self._inicio
+        otros = self.total - sum(self.etapas.values())
+        if otros > 0:
+            self.etapas['otros'] = otros
+
+    def to_dict(self):
+        """Convierte la medición a diccionario para el log"""
+        return {
+            'tipo': self.tipo,
+            'motor': self.motor,
+            'cache': self.cache,
+            'total_ms': round(self.total * 1000, 3),
+            'etapas_ms': {nombre: round(s * 1000, 3) for nombre, s in self.etapas.items()}
+        }
+
+
+class _Etapa:
+    """Context manager de una etapa dentro de la medición del hilo"""
+
+    __slots__ = ('medicion', 'nombre')
+
+    def __init__(self, medicion, nombre):
+        self.medicion = medicion
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.medicion.iniciar_etapa(self.nombre)
+        return self.medicion
+
+    def __exit__(self, *exc):
+        self.medicion.terminar_etapa()
+        return False
+
+
+class _Render:
+    """Context manager de la medición completa de una boleta"""
+
+    __slots__ = ('instrumentacion', 'medicion')
+
+    def __init__(self, instrumentacion, medicion):
+        self.instrumentacion = instrumentacion
+        self.medicion = medicion
+
+    def __enter__(self):
+        self.instrumentacion._local.medicion = self.medicion
+        return self.medicion
+
+    def __exit__(self, exc_type, *exc):
+        self.instrumentacion._local.medicion = None
+        if exc_type is None:
+            self.medicion.finalizar()
+            self.instrumentacion.registrar(self.medicion)
+        return False
+
+
+class Instrumentacion:
+    """Punto único de medición de etapas, desactivable sin costo"""
+
+    def __init__(self, activa=False):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._histogramas = {}
+        self._renders = {}
+        self.activar(activa)
+
+    def activar(self, activa=True):
+        """Activa o desactiva la instrumentación en tiempo de ejecución"""
+        if activa:
+            _configurar_logger()
+        self.activa = activa
+
+    def medir(self, tipo, motor='platypus'):
+        """
+        Abre la medición de una boleta en el hilo actual
+
+        Si ya hay una medición abierta (por ejemplo, renderizar dentro de
+        generar) las etapas se suman a esa.
+        """
+        if not self.activa or getattr(self._local, 'medicion', None) is not None:
+            return _NULO
+        return _Render(self, Medicion(tipo, motor))
+
+    def etapa(self, nombre):
+        """Mide una etapa dentro de la medición abierta del hilo"""
+        if not self.activa:
+            return _NULO
+        medicion = getattr(self._local, 'medicion', None)
+        if medicion is None:
+            return _NULO
+        return _Etapa(medicion, nombre)
+
+    def marcar_cache(self):
+        """Indica que la boleta en medición salió de la caché de PDFs"""
+        if self.activa:
+            medicion = getattr(self._local, 'medicion', None)
+            if medicion is not None:
+                medicion.cache = True
+
+    def registrar(self, medicion):
+        """Agrega una medición a los histogramas y la escribe en el log"""
+        with self._lock:
+            etapas = list(medicion.etapas.items())
+            # Las escrituras diferidas (motor None) no cuentan como renders
+            if medicion.motor is not None:
+                self._renders[medicion.tipo] = self._renders.get(medicion.tipo, 0) + 1
+                etapas.append(('total', medicion.total))
+            for nombre, segundos in etapas:
+                clave = (medicion.tipo, nombre)
+                histograma = self._histogramas.get(clave)
+                if histograma is None:
+                    histograma = self._histogramas[clave] = Histograma()
+                histograma.agregar(segundos * 1000)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(medicion.to_dict(), ensure_ascii=False))
+
+    def estadisticas(self):
+        """
+        Retorna los histogramas agregados
+
+        Returns:
+            dict: {'activa', 'renders': {tipo: n}, 'etapas': {tipo: {etapa: histograma}}}
+        """
+        with self._lock:
+            etapas = {}
+            for (tipo, nombre), histograma in sorted(self._histogramas.items()):
+                etapas.setdefault(tipo, {})[nombre] = histograma.to_dict()
+            return {
+                'activa': self.activa,
+                'renders': dict(self._renders),
+                'etapas': etapas
+            }
+
+    def reiniciar(self):
+        """Descarta los histogramas acumulados"""
+        with self._lock:
+            self._histogramas = {}
+            self._renders = {}
+
+
+# Instancia compartida por todo el proceso
+instrumentacion = Instrumentacion(os.environ.get('BOLETAS_INSTRUMENTACION', '') in ('1', 'true', 'si'))
@@ -0,0 +1,250 @@
+"""
+Generación masiva de boletas mensuales
+Genera las boletas de toda la planilla de un período en paralelo
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from config.empresa import EmpresaConfig
+from models.lote_boletas import LoteBoletas, redondear
+from generators.pdf_generator import PDFGenerator, MOTORES
+from generators.canvas_mensual import MODOS_IMPRESION
+from monitoreo.metricas import metricas
+
+# Campos de la boleta que pueden ajustarse por empleado
+CAMPOS_INGRESOS = ['horas_extra', 'bono_antiguedad', 'otros_ingresos']
+CAMPOS_EGRESOS = ['faltas', 'retrasos', 'reposiciones', 'otros_egresos']
+
+# Los procesos del pool no se crean con fork: el proceso de la aplicación
+# tiene hilos (peticiones, volcado de métricas, cola de trabajos) y un hijo
+# creado con fork hereda tomado cualquier lock que uno de ellos tuviera en ese
+# momento. Cada proceso arma su generador en _inicializar_proceso.
+CONTEXTO_POOL = 'forkserver'
+
+# Generador y motor de renderizado propios de cada proceso del pool
+_pdf_gen = None
+_motor = 'platypus'
+
+
+def _inicializar_proceso(config_file, motor):
+    """Crea el generador de PDFs una sola vez por proceso"""
+    global _pdf_gen, _motor
+    _pdf_gen = PDFGenerator(EmpresaConfig(config_file))
+    _motor = motor
+
+
+def _generar_con(pdf_gen, boleta, motor):
+    """Genera una boleta y retorna (ok, filename o mensaje de error)"""
+    try:
+        return True, pdf_gen.generar_boleta_mensual(boleta, motor)
+    except Exception as e:
+        return False, str(e)
+
+
+def _generar_en_proceso(lote):
+    """Genera las boletas de un trozo del lote dentro de un proceso del pool"""
+    resultados = [_generar_con(_pdf_gen, boleta, _motor) for boleta in lote.boletas()]
+    # Los procesos del pool terminan sin ejecutar atexit: se vuelca en cada trozo
+    metricas.volcar()
+    return resultados
+
+
+def crear_lote_mensual(empleados, periodo, ajustes=None):
+    """
+    Crea el lote columnar de boletas mensuales de los empleados para un período
+
+    Args:
+        empleados: Lista de diccionarios de empleados
+        periodo: Diccionario con mes_pago, anio, fecha_emision y opcionalmente
+                 rango_fechas y metodo_pago
+        ajustes: Diccionario {ci: {campo: monto}} con montos propios de cada
+                 empleado en el período
+
+    Returns:
+        tuple: (LoteBoletas sin números asignados, lista de errores por empleado)
+    """
+    ajustes = ajustes or {}
+    campos = ['nombre_completo', 'ci', 'cargo', 'rango_fechas', 'metodo_pago',
+              'haber_basico'] + CAMPOS_INGRESOS + CAMPOS_EGRESOS
+    columnas = {campo: [] for campo in campos}
+    errores = []
+
+    # Datos comunes del período: si son inválidos, ninguna boleta puede crearse
+    try:
+        anio = int(periodo.get('anio', datetime.now().year))
+        fecha_str = periodo.get('fecha_emision', datetime.now().strftime("%d/%m/%Y"))
+        fecha_emision = datetime.strptime(fecha_str, "%d/%m/%Y")
+    except (KeyError, ValueError) as e:
+        errores = [{'ci': emp.get('ci', ''), 'message': f"Datos inválidos: {e}"} for emp in empleados]
+        return LoteBoletas('mensual', {}), errores
+
+    for emp in empleados:
+        try:
+            propios = ajustes.get(emp['ci']) or {}
+            valores = [
+                emp['nombre_completo'], emp['ci'], emp['cargo'],
+                propios.get('rango_fechas', periodo.get('rango_fechas', '')),
+                propios.get('metodo_pago', periodo.get('metodo_pago', 'EFECTIVO')),
+                # Por defecto el haber básico es el sueldo registrado del empleado
+                float(propios.get('haber_basico', emp.get('sueldo', 0))),
+            ] + [float(propios.get(campo, 0)) for campo in CAMPOS_INGRESOS + CAMPOS_EGRESOS]
+        except (KeyError, ValueError) as e:
+            errores.append({'ci': emp.get('ci', ''), 'message': f"Datos inválidos: {e}"})
+            continue
+        for campo, valor in zip(campos, valores):
+            columnas[campo].append(valor)
+
+    filas = len(columnas['ci'])
+    columnas['mes_pago'] = [periodo.get('mes_pago', '')] * filas
+    columnas['anio'] = np.full(filas, anio, dtype=np.int64)
+    lote = LoteBoletas('mensual', columnas, np.full(filas, fecha_emision, dtype='datetime64[us]'))
+    return lote, errores
+
+
+class GeneradorLoteMensual:
+    """Genera las boletas mensuales de varios empleados en un pool de procesos"""
+
+    def __init__(self, empresa_config, max_procesos=None, motor='platypus'):
+        """
+        Inicializa el generador
+
+        Args:
+            empresa_config: Instancia de EmpresaConfig
+            max_procesos: Cantidad de procesos (por defecto, núcleos de la máquina)
+            motor: Motor de renderizado, 'platypus' o 'canvas'
+        """
+        if motor not in MOTORES:
+            raise ValueError(f"Motor de renderizado desconocido: {motor}")
+        self.empresa_config = empresa_config
+        self.max_procesos = max_procesos or os.cpu_count() or 1
+        self.motor = motor
+
+    def generar(self, empleados, periodo, ajustes=None, impresion=None, individuales=True,
+                consolidado=False):
+        """
+        Genera las boletas del período para todos los empleados
+
+        Args:
+            empleados: Lista de diccionarios de empleados
+            periodo: Datos comunes del período (ver crear_lote_mensual)
+            ajustes: Diccionario {ci: {campo: monto}} con ajustes por empleado
+            impresion: None, o modo del PDF dos por hoja: 'copias' o 'lote'
+            individuales: Si es False solo se generan los PDFs combinados
+            consolidado: Si es True genera además un único PDF con todas las
+                         boletas, con el logo incrustado una sola vez
+
+        Returns:
+            dict: Manifiesto con las boletas generadas, errores y rendimiento
+        """
+        if impresion and impresion not in MODOS_IMPRESION:
+            raise ValueError(f"Modo de impresión desconocido: {impresion}")
+        ajustes = ajustes or {}
+        inicio = time.perf_counter()
+
+        lote, errores = crear_lote_mensual(empleados, periodo, ajustes)
+
+        # La numeración se reserva en un bloque para que sea correlativa y sin duplicados
+        if len(lote):
+            lote.asignar('numero_boleta', self.empresa_config.reservar_numeros_boleta(len(lote)))
+
+        if individuales:
+            procesos = min(self.max_procesos, len(lote)) or 1
+            resultados = self._generar_pdfs(lote, procesos)
+        else:
+            procesos = 0
+            resultados = [(True, None)] * len(lote)
+
+        # El líquido pagable de todo el lote se calcula por columnas
+        generadas = []
+        exitosas = []
+        for i, (numero, ci, nombre, liquido, (ok, resultado)) in enumerate(zip(
+                lote.columna('numero_boleta'), lote.columna('ci'), lote.columna('nombre_completo'),
+                redondear(lote.columna('liquido_pagable')), resultados)):
+            if ok:
+                exitosas.append(i)
+                generadas.append({
+                    'numero_boleta': numero,
+                    'ci': ci,
+                    'nombre_completo': nombre,
+                    'liquido_pagable': liquido,
+                    'filename': os.path.basename(resultado) if resultado else None
+                })
+            else:
+                errores.append({
+                    'ci': ci,
+                    'numero_boleta': numero,
+                    'message': resultado
+                })
+
+        # Sin PDFs individuales las boletas se registran igual, para poder
+        # consultarlas y generar su PDF individual más adelante
+        if not individuales and len(lote):
+            PDFGenerator(self.empresa_config).registrar([('mensual', b) for b in lote.boletas()], self.motor)
+
+        # PDFs combinados, solo con las boletas generadas sin error
+        hoja_impresion = None
+        archivo_consolidado = None
+        if (impresion or consolidado) and generadas:
+            boletas = lote.tomar(exitosas).boletas()
+            if impresion:
+                hoja_impresion = self._generar_impresion(boletas, periodo, impresion)
+            if consolidado:
+                archivo_consolidado = self._generar_consolidado(boletas, periodo)
+
+        duracion = time.perf_counter() - inicio
+        return {
+            'periodo': {
+                'mes_pago': periodo.get('mes_pago', ''),
+                'anio': periodo.get('anio'),
+                'fecha_emision': periodo.get('fecha_emision', '')
+            },
+            'total': len(empleados),
+            'generadas': len(generadas),
+            'procesos': procesos,
+            'motor': self.motor,
+            'duracion_segundos': round(duracion, 3),
+            'boletas_por_segundo': round(len(generadas) / duracion, 2) if duracion > 0 else 0.0,
+            'boletas': generadas,
+            'impresion': hoja_impresion,
+            'consolidado': archivo_consolidado,
+            'errores': errores
+        }
+
+    def _generar_consolidado(self, boletas, periodo):
+        """Genera el PDF consolidado del lote y retorna su nombre de archivo"""
+        nombre = (f"Boletas_Mensuales_{periodo.get('mes_pago', '')}_{periodo.get('anio', '')}"
+                  f"_{boletas[0].numero_boleta}-{boletas[-1].numero_boleta}.pdf")
+        filename = PDFGenerator(self.empresa_config).generar_consolidado(
+            [('mensual', boleta) for boleta in boletas], nombre)
+        return os.path.basename(filename)
+
+    def _generar_impresion(self, boletas, periodo, modo):
+        """Genera el PDF dos por hoja del lote y retorna su descripción"""
+        nombre = (f"Boletas_Mensuales_{periodo.get('mes_pago', '')}_{periodo.get('anio', '')}"
+                  f"_{boletas[0].numero_boleta}-{boletas[-1].numero_boleta}_{modo}.pdf")
+        filename, hojas = PDFGenerator(self.empresa_config).generar_dos_por_hoja(boletas, nombre, modo)
+        return {
+            'modo': modo,
+            'filename': os.path.basename(filename),
+            'hojas': hojas
+        }
+
+    def _generar_pdfs(self, lote, procesos):
+        """Genera los PDFs, en el mismo proceso si no vale la pena el pool"""
+        if procesos <= 1 or len(lote) <= 1:
+            pdf_gen = PDFGenerator(self.empresa_config)
+            return [_generar_con(pdf_gen, b, self.motor) for b in lote.boletas()]
+
+        # Cada proceso recibe un trozo del lote por columnas y crea ahí sus boletas
+        with ProcessPoolExecutor(max_workers=procesos,
+                                 mp_context=multiprocessing.get_context(CONTEXTO_POOL),
+                                 initializer=_inicializar_proceso,
+                                 initargs=(self.empresa_config.config_file, self.motor)) as executor:
+            return [resultado for resultados in executor.map(_generar_en_proceso, lote.dividir(procesos * 4))
+                    for resultado in resultados]
@@ -4,254 +4,406 @@ Crea PDFs profesionales con formato adecuado
 """
 
 import os
+import time
+from io import BytesIO
 from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
+from reportlab.platypus import (SimpleDocTemplate, BaseDocTemplate, PageTemplate, Frame,
+                                NextPageTemplate, PageBreak, Table, Paragraph, Spacer)
 from datetime import datetime
 
+from generators.recursos import recursos_cache
+from generators.cache_render import render_cache
+from generators.almacen import almacen_pdf
+from models.registro_boletas import registro_boletas
+from generators.instrumentacion import instrumentacion
+from generators.plantillas import obtener_plantilla
+from generators.canvas_mensual import RenderizadorCanvasMensual, MODOS_IMPRESION, ETIQUETAS_COPIAS
+from monitoreo.metricas import metricas
+
+# Sufijo del nombre de archivo por tipo de boleta
+TIPOS_BOLETA = {
+    'mensual': 'Mensual',
+    'aguinaldo': 'Aguinaldo',
+    'liquidacion': 'Liquidacion',
+}
+
+# Márgenes de página por tipo de boleta (aguinaldo y liquidación usan los de reportlab)
+MARGENES = {
+    'mensual': {'topMargin': 0.3*inch, 'bottomMargin': 0.3*inch, 'leftMargin': 0.5*inch, 'rightMargin': 0.5*inch},
+    'aguinaldo': {'topMargin': inch, 'bottomMargin': inch, 'leftMargin': inch, 'rightMargin': inch},
+    'liquidacion': {'topMargin': inch, 'bottomMargin': inch, 'leftMargin': inch, 'rightMargin': inch},
+}
+
+# Motores de renderizado: 'platypus' (layout completo) o 'canvas' (solo mensual)
+MOTORES = ('platypus', 'canvas')
+
+_renderizador = None
+
+
+def _metricas_cache():
+    """Aciertos y fallos acumulados de las cachés del proceso para /metrics"""
+    series = []
+    for nombre, cache in (('recursos', recursos_cache), ('render', render_cache)):
+        series.append(('boletas_cache_hits_total', {'cache': nombre}, cache.hits))
+        series.append(('boletas_cache_misses_total', {'cache': nombre}, cache.misses))
+    return series
+
+
+metricas.registrar_colector(_metricas_cache)
+
+def _renderizador_canvas():
+    """Retorna el renderizador canvas del proceso (geometría calculada una vez)"""
+    global _renderizador
+    if _renderizador is None:
+        _renderizador = RenderizadorCanvasMensual()
+    return _renderizador
+
 class PDFGenerator:
-    def __init__(self, empresa_config):
+    def __init__(self, empresa_config, almacen=None, registro=None):
         self.empresa_config = empresa_config
-        self.output_dir = "output"
+        self.almacen = almacen or almacen_pdf
+        self.registro = registro or registro_boletas
+        self.output_dir = self.almacen.base_dir
         os.makedirs(self.output_dir, exist_ok=True)
+        self._elementos = {
+            'mensual': self._elementos_boleta_mensual,
+            'aguinaldo': self._elementos_boleta_aguinaldo,
+            'liquidacion': self._elementos_boleta_liquidacion,
+        }
+    
+    def nombre_archivo(self, tipo, boleta):
+        """Retorna el nombre del archivo PDF de una boleta"""
+        return f"{boleta.numero_boleta}_{TIPOS_BOLETA[tipo]}_{boleta.nombre_completo.replace(' ', '_')}.pdf"
+    
+    def renderizar(self, tipo, boleta, motor='platypus', cache=False):
+        """
+        Genera el PDF de una boleta en memoria
+        
+        Con cache=True, si una boleta idéntica (mismo contenido, datos de
+        empresa y logo) ya se generó en este proceso se retornan los bytes
+        en caché, y si no, el PDF generado se guarda en ella. Se usa solo
+        donde el mismo PDF vuelve a pedirse (ver generators/cache_render.py).
+        
+        Args:
+            tipo: 'mensual', 'aguinaldo' o 'liquidacion'
+            boleta: Instancia de la boleta
+            motor: 'platypus' o 'canvas' (dibujo directo, solo boleta mensual)
+            cache: Si es True usa la caché de PDFs renderizados
+        
+        Returns:
+            bytes: Contenido del PDF
+        """
+        if motor not in MOTORES:
+            raise ValueError(f"Motor de renderizado desconocido: {motor}")
+        if motor == 'canvas' and tipo != 'mensual':
+            raise ValueError("El motor canvas solo está disponible para la boleta mensual")
+        
+        with instrumentacion.medir(tipo, motor):
+            clave = None
+            if cache:
+                clave = render_cache.clave(tipo, boleta, motor, self.empresa_config,
+                                           recursos_cache.huella_logo(self.empresa_config))
+                contenido = render_cache.obtener(clave)
+                if contenido is not None:
+                    instrumentacion.marcar_cache()
+                    return contenido
+            
+            inicio = time.perf_counter()
+            buffer = BytesIO()
+            if motor == 'canvas':
+                self._construir_boleta_mensual_canvas(boleta, buffer)
+            else:
+                self._construir(tipo, boleta, buffer)
+            contenido = buffer.getvalue()
+            if clave is not None:
+                render_cache.guardar(clave, contenido, time.perf_counter() - inicio)
+            metricas.incrementar('boletas_pdfs_generados_total', {'tipo': tipo})
+            return contenido
+    
+    def guardar(self, filename, contenido, tipo, fecha=None, numero_boleta=None):
+        """Escribe un PDF ya generado en el almacén y retorna su ruta"""
+        with instrumentacion.etapa('io'):
+            filepath = self.almacen.guardar(filename, contenido, tipo, fecha, numero_boleta)
+        metricas.incrementar('boletas_pdf_bytes_escritos_total', {'tipo': tipo}, len(contenido))
+        return filepath
+    
+    def registrar(self, boletas, motor='platypus'):
+        """
+        Registra boletas emitidas (con o sin PDF individual) en el registro
+        de boletas, para consultarlas y regenerar su PDF
+        
+        Args:
+            boletas: Lista de tuplas (tipo, boleta)
+            motor: Motor de renderizado del PDF individual
+        """
+        with instrumentacion.etapa('io'):
+            self.registro.registrar([(tipo, boleta, self.nombre_archivo(tipo, boleta)) for tipo, boleta in boletas],
+                                    self.empresa_config, motor)
+    
+    def guardar_boleta(self, tipo, boleta, contenido, motor='platypus', registrar=True):
+        """
+        Escribe el PDF de una boleta en la partición de su fecha de emisión y la registra
+        
+        Args:
+            registrar: Si es False solo se escribe el archivo (la boleta ya se registró)
+        """
+        # Escritura separada del renderizado (respuesta directa): se mide solo la I/O
+        with instrumentacion.medir(tipo, motor=None):
+            filepath = self.guardar(self.nombre_archivo(tipo, boleta), contenido, tipo,
+                                    boleta.fecha_emision, boleta.numero_boleta)
+            if registrar:
+                self.registrar([(tipo, boleta)], motor)
+            return filepath
     
-    def _add_header(self, elements, styles):
+    def generar(self, tipo, boleta, motor='platypus', cache=False):
+        """Genera el PDF de una boleta en el almacén de salida y retorna su ruta"""
+        with instrumentacion.medir(tipo, motor):
+            return self.guardar_boleta(tipo, boleta, self.renderizar(tipo, boleta, motor, cache), motor)
+    
+    def generar_boleta_mensual(self, boleta, motor='platypus'):
+        """Genera PDF para boleta de pago mensual - Diseño compacto mitad de página"""
+        return self.generar('mensual', boleta, motor)
+    
+    def renderizar_dos_por_hoja(self, boletas, modo='lote'):
+        """
+        Genera en memoria un PDF con dos boletas mensuales por hoja carta
+        
+        Args:
+            boletas: Lista de instancias de BoletaMensual
+            modo: 'copias' (original y copia de cada boleta en la misma hoja)
+                  o 'lote' (boletas consecutivas de distintos empleados)
+        
+        Returns:
+            tuple: (bytes del PDF, cantidad de hojas)
+        """
+        if modo not in MODOS_IMPRESION:
+            raise ValueError(f"Modo de impresión desconocido: {modo}")
+        if not boletas:
+            raise ValueError("No hay boletas para imprimir")
+        
+        plantilla = obtener_plantilla('mensual')
+        mitades = []
+        for boleta in boletas:
+            titulo = self._titulo_mensual(boleta, plantilla)
+            if modo == 'copias':
+                mitades.extend((boleta, titulo, etiqueta) for etiqueta in ETIQUETAS_COPIAS)
+            else:
+                mitades.append((boleta, titulo, None))
+        
+        buffer = BytesIO()
+        hojas = _renderizador_canvas().renderizar_dos_por_hoja(
+            mitades, buffer,
+            recursos_cache.logo(self.empresa_config),
+            self._datos_empresa_mensual(plantilla)
+        )
+        metricas.incrementar('boletas_pdfs_generados_total', {'tipo': 'impresion'})
+        return buffer.getvalue(), hojas
+    
+    def generar_dos_por_hoja(self, boletas, nombre, modo='lote'):
+        """
+        Genera el PDF de impresión dos por hoja en el almacén de salida
+        
+        Returns:
+            tuple: (ruta del archivo, cantidad de hojas)
+        """
+        contenido, hojas = self.renderizar_dos_por_hoja(boletas, modo)
+        return self.guardar(nombre, contenido, 'impresion', boletas[0].fecha_emision), hojas
+    
+    def generar_boleta_aguinaldo(self, boleta):
+        """Genera PDF para boleta de aguinaldo"""
+        return self.generar('aguinaldo', boleta)
+    
+    def generar_boleta_liquidacion(self, boleta):
+        """Genera PDF para boleta de liquidación"""
+        return self.generar('liquidacion', boleta)
+    
+    def renderizar_consolidado(self, boletas):
+        """
+        Genera en memoria un único PDF con boletas de cualquier tipo
+        
+        Cada boleta empieza en una página nueva con los márgenes de su tipo.
+        El logo se incrusta una sola vez en el documento y todas las páginas
+        referencian el mismo objeto de imagen (igual que las fuentes).
+        
+        Args:
+            boletas: Lista de tuplas (tipo, boleta) en el orden del documento
+        
+        Returns:
+            bytes: Contenido del PDF
+        """
+        if not boletas:
+            raise ValueError("No hay boletas para consolidar")
+        
+        tipos = []
+        for tipo, _ in boletas:
+            if tipo not in TIPOS_BOLETA:
+                raise ValueError(f"Tipo de boleta desconocido: {tipo}")
+            if tipo not in tipos:
+                tipos.append(tipo)
+        
+        # La primera plantilla de página es la del tipo de la primera boleta
+        buffer = BytesIO()
+        doc = BaseDocTemplate(buffer, pagesize=letter)
+        doc.addPageTemplates([self._plantilla_pagina(tipo) for tipo in tipos])
+        
+        elements = []
+        for i, (tipo, boleta) in enumerate(boletas):
+            if i:
+                elements.append(NextPageTemplate(tipo))
+                elements.append(PageBreak())
+            elements.extend(self._elementos[tipo](boleta))
+        
+        doc.build(elements)
+        metricas.incrementar('boletas_pdfs_generados_total', {'tipo': 'consolidado'})
+        return buffer.getvalue()
+    
+    def generar_consolidado(self, boletas, nombre):
+        """Genera el PDF consolidado en el almacén de salida, registra sus boletas y retorna su ruta"""
+        filepath = self.guardar(nombre, self.renderizar_consolidado(boletas), 'consolidado',
+                                boletas[0][1].fecha_emision)
+        self.registrar(boletas)
+        return filepath
+    
+    def _plantilla_pagina(self, tipo):
+        """Plantilla de página con los márgenes del tipo de boleta"""
+        margenes = MARGENES[tipo]
+        ancho, alto = letter
+        frame = Frame(margenes['leftMargin'], margenes['bottomMargin'],
+                      ancho - margenes['leftMargin'] - margenes['rightMargin'],
+                      alto - margenes['topMargin'] - margenes['bottomMargin'],
+                      id=f"frame_{tipo}")
+        return PageTemplate(id=tipo, frames=[frame], pagesize=letter)
+    
+    def _add_header(self, elements, plantilla):
         """Agrega el encabezado con logo y datos de empresa"""
-        empresa = self.empresa_config.get_empresa_data()
+        styles = plantilla.styles
         
-        # Crear tabla para el encabezado
-        header_data = []
+        # Título de empresa (párrafo en caché)
+        titulo_empresa = recursos_cache.parrafo(
+            self.empresa_config, 'header_titulo',
+            lambda empresa: Paragraph(f"<b>{empresa['nombre']}</b><br/>{empresa['eslogan']}", styles['Title'])
+        )
         
         # Si existe logo, agregarlo
-        if self.empresa_config.logo_exists():
-            try:
-                logo = Image(self.empresa_config.get_logo_path(), width=1*inch, height=1*inch)
-                header_data.append([logo, Paragraph(f"<b>{empresa['nombre']}</b><br/>{empresa['eslogan']}", styles['Title'])])
-            except:
-                header_data.append(['', Paragraph(f"<b>{empresa['nombre']}</b><br/>{empresa['eslogan']}", styles['Title'])])
+        logo = recursos_cache.logo(self.empresa_config)
+        if logo:
+            header_data = [[logo.flowable(1*inch, 1*inch), titulo_empresa]]
         else:
-            header_data.append(['', Paragraph(f"<b>{empresa['nombre']}</b><br/>{empresa['eslogan']}", styles['Title'])])
+            header_data = [['', titulo_empresa]]
         
-        header_table = Table(header_data, colWidths=[1.5*inch, 5*inch])
-        header_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        header_table = Table(header_data, colWidths=plantilla.header_col_widths)
+        header_table.setStyle(plantilla.header_style)
         
         elements.append(header_table)
         elements.append(Spacer(1, 0.2*inch))
         
         # Información de la empresa
-        empresa_info = f"""
+        elements.append(recursos_cache.parrafo(
+            self.empresa_config, 'header_info',
+            lambda empresa: Paragraph(f"""
         <b>NIT:</b> {empresa.get('nit', 'N/A')} | <b>Teléfono:</b> {empresa.get('telefono', 'N/A')}<br/>
         <b>Dirección:</b> {empresa.get('direccion', 'N/A')}<br/>
         <b>Contabilidad:</b> {empresa.get('contabilidad', 'N/A')}
-        """
-        elements.append(Paragraph(empresa_info, styles['Normal']))
+        """, styles['Normal'])
+        ))
         elements.append(Spacer(1, 0.3*inch))
     
-    def generar_boleta_mensual(self, boleta):
-        """Genera PDF para boleta de pago mensual - Diseño compacto mitad de página"""
-        filename = os.path.join(self.output_dir, f"{boleta.numero_boleta}_Mensual_{boleta.nombre_completo.replace(' ', '_')}.pdf")
-        doc = SimpleDocTemplate(filename, pagesize=letter, topMargin=0.3*inch, bottomMargin=0.3*inch, leftMargin=0.5*inch, rightMargin=0.5*inch)
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Estilo para título centrado
-        title_style = ParagraphStyle(
-            'TitleStyle',
-            parent=styles['Normal'],
-            fontSize=14,
-            textColor=colors.HexColor('#2C3E50'),
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        # Estilo para datos de empresa
-        empresa_style = ParagraphStyle(
-            'EmpresaStyle',
-            parent=styles['Normal'],
-            fontSize=7,
-            alignment=TA_RIGHT,
-            leading=9
+    def _add_firmas(self, elements, plantilla):
+        """Agrega la tabla de firmas"""
+        tabla_firmas = Table(plantilla.firmas_data, colWidths=plantilla.firmas_col_widths)
+        tabla_firmas.setStyle(plantilla.firmas_style)
+        elements.append(tabla_firmas)
+    
+    def _titulo_mensual(self, boleta, plantilla):
+        """Párrafo con el título y número de la boleta mensual"""
+        return Paragraph(f"<b>BOLETA DE PAGO</b><br/><font size=9>No. {boleta.numero_boleta}</font>", plantilla.title_style)
+    
+    def _datos_empresa_mensual(self, plantilla):
+        """Párrafo (en caché) con los datos de empresa del header mensual"""
+        return recursos_cache.parrafo(
+            self.empresa_config, 'mensual_datos',
+            lambda empresa: Paragraph(
+                f"<b>{empresa['nombre']}</b><br/>"
+                f"{empresa.get('eslogan', '')}<br/>"
+                f"NIT: {empresa.get('nit', 'N/A')}<br/>"
+                f"Tel: {empresa.get('telefono', 'N/A')}<br/>"
+                f"{empresa.get('direccion', 'N/A')}",
+                plantilla.empresa_style
+            )
         )
+    
+    def _construir_boleta_mensual_canvas(self, boleta, destino):
+        """Dibuja la boleta mensual directamente en un canvas (sin layout platypus)"""
+        with instrumentacion.etapa('flowables'):
+            plantilla = obtener_plantilla('mensual')
+            logo = recursos_cache.logo(self.empresa_config)
+            titulo = self._titulo_mensual(boleta, plantilla)
+            datos_empresa = self._datos_empresa_mensual(plantilla)
+        
+        with instrumentacion.etapa('layout'):
+            _renderizador_canvas().renderizar(boleta, destino, logo, titulo, datos_empresa)
+    
+    def _construir(self, tipo, boleta, destino):
+        """Construye el PDF de una boleta en destino (ruta o buffer)"""
+        with instrumentacion.etapa('flowables'):
+            elements = self._elementos[tipo](boleta)
+        
+        with instrumentacion.etapa('layout'):
+            doc = SimpleDocTemplate(destino, pagesize=letter, **MARGENES[tipo])
+            doc.build(elements)
+    
+    def _elementos_boleta_mensual(self, boleta):
+        """Elementos de la boleta mensual - Diseño compacto mitad de página"""
+        elements = []
+        plantilla = obtener_plantilla('mensual')
         
         # Header horizontal: Logo - Título - Datos Empresa
-        empresa = self.empresa_config.get_empresa_data()
-        
         # Logo (columna izquierda) - flotante con proporciones preservadas
-        if self.empresa_config.logo_exists():
-            try:
-                from PIL import Image as PILImage
-                img = PILImage.open(self.empresa_config.get_logo_path())
-                aspect_ratio = img.width / img.height
-                logo_height = 0.8 * inch
-                logo_width = logo_height * aspect_ratio
-                logo = Image(self.empresa_config.get_logo_path(), width=logo_width, height=logo_height)
-            except:
-                logo = ''
-        else:
-            logo = ''
+        logo = recursos_cache.logo(self.empresa_config)
+        logo = logo.flowable(0.8 * inch) if logo else ''
         
         # Título (columna central)
-        titulo = Paragraph(f"<b>BOLETA DE PAGO</b><br/><font size=9>No. {boleta.numero_boleta}</font>", title_style)
+        titulo = self._titulo_mensual(boleta, plantilla)
         
         # Datos empresa (columna derecha)
-        datos_empresa = Paragraph(
-            f"<b>{empresa['nombre']}</b><br/>"
-            f"{empresa.get('eslogan', '')}<br/>"
-            f"NIT: {empresa.get('nit', 'N/A')}<br/>"
-            f"Tel: {empresa.get('telefono', 'N/A')}<br/>"
-            f"{empresa.get('direccion', 'N/A')}",
-            empresa_style
-        )
+        datos_empresa = self._datos_empresa_mensual(plantilla)
         
         # Tabla de header con 3 columnas (ancho de columna derecha = ancho de logo)
-        header_data = [[logo, titulo, datos_empresa]]
-        header_table = Table(header_data, colWidths=[2.5*inch, 3*inch, 2.5*inch])
-        header_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-            ('ALIGN', (1, 0), (1, 0), 'CENTER'),
-            ('ALIGN', (2, 0), (2, 0), 'RIGHT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        header_table = Table([[logo, titulo, datos_empresa]], colWidths=plantilla.header_col_widths)
+        header_table.setStyle(plantilla.header_style)
         
         elements.append(header_table)
         elements.append(Spacer(1, 0.08*inch))
         
         # Datos del empleado - ultra compacto
+        fecha = boleta.fecha_emision.strftime("%d/%m/%Y")
         data_empleado = [
             ['Nombre:', boleta.nombre_completo, 'C.I.:', boleta.ci],
             ['Cargo:', boleta.cargo, 'Período:', f"{boleta.mes_pago} {boleta.anio}"],
+            ['Rango:', boleta.rango_fechas, 'Fecha:', fecha] if boleta.rango_fechas else ['', '', 'Fecha:', fecha],
+            # Añadir método de pago
+            ['Método Pago:', getattr(boleta, 'metodo_pago', 'EFECTIVO'), '', ''],
         ]
         
-        if boleta.rango_fechas:
-            data_empleado.append(['Rango:', boleta.rango_fechas, 'Fecha:', boleta.fecha_emision.strftime("%d/%m/%Y")])
-        else:
-            data_empleado.append(['', '', 'Fecha:', boleta.fecha_emision.strftime("%d/%m/%Y")])
-        
-        # Añadir método de pago
-        data_empleado.append(['Método Pago:', getattr(boleta, 'metodo_pago', 'EFECTIVO'), '', ''])
-        
-        tabla_empleado = Table(data_empleado, colWidths=[0.9*inch, 2.3*inch, 0.7*inch, 2.6*inch])
-        tabla_empleado.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#ECF0F1')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('TOPPADDING', (0, 0), (-1, -1), 2),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-        ]))
+        tabla_empleado = Table(data_empleado, colWidths=plantilla.empleado_col_widths)
+        tabla_empleado.setStyle(plantilla.empleado_style)
         
         elements.append(tabla_empleado)
         elements.append(Spacer(1, 0.12*inch))
         
-        # INGRESOS Y EGRESOS LADO A LADO - Ultra compacto
-        data_ingresos = [
-            ['INGRESOS', 'Bs.'],
-            ['Haber Básico', f"{boleta.haber_basico:.2f}"],
-            ['Horas Extra', f"{boleta.horas_extra:.2f}"],
-            ['Bono Antigüedad', f"{boleta.bono_antiguedad:.2f}"],
-            ['Otros Ingresos', f"{boleta.otros_ingresos:.2f}"],
-            ['TOTAL INGRESOS', f"{boleta.calcular_total_ingresos():.2f}"],
-        ]
-        
-        data_egresos = [
-            ['EGRESOS', 'Bs.'],
-            ['Faltas', f"{boleta.faltas:.2f}"],
-            ['Retrasos', f"{boleta.retrasos:.2f}"],
-            ['Reposiciones', f"{boleta.reposiciones:.2f}"],
-            ['Otros Egresos', f"{boleta.otros_egresos:.2f}"],
-            ['TOTAL EGRESOS', f"{boleta.calcular_total_egresos():.2f}"],
-        ]
+        # INGRESOS Y EGRESOS LADO A LADO - Ultra compacto (una sola tabla sin separación)
+        montos_ingresos = ['Bs.', f"{boleta.haber_basico:.2f}", f"{boleta.horas_extra:.2f}",
+                           f"{boleta.bono_antiguedad:.2f}", f"{boleta.otros_ingresos:.2f}",
+                           f"{boleta.calcular_total_ingresos():.2f}"]
+        montos_egresos = ['Bs.', f"{boleta.faltas:.2f}", f"{boleta.retrasos:.2f}",
+                          f"{boleta.reposiciones:.2f}", f"{boleta.otros_egresos:.2f}",
+                          f"{boleta.calcular_total_egresos():.2f}"]
+        data_combinada = [list(fila) for fila in zip(plantilla.etiquetas_ingresos, montos_ingresos,
+                                                     plantilla.etiquetas_egresos, montos_egresos)]
         
-        tabla_ingresos = Table(data_ingresos, colWidths=[2.166*inch, 1.084*inch])
-        tabla_ingresos.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.153, 0.682, 0.376, alpha=0.5)),  # Verde con opacidad 0.5
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 8),
-            ('FONTSIZE', (0, 1), (-1, -1), 7),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 4),
-            ('TOPPADDING', (0, 0), (-1, 0), 4),
-            ('BACKGROUND', (0, 1), (-1, -2), colors.Color(0.565, 0.933, 0.565, alpha=0.5)),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.Color(0.118, 0.518, 0.286, alpha=0.5)),
-            ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-            ('TOPPADDING', (0, 1), (-1, -1), 1.5),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 1.5),
-        ]))
-        
-        tabla_egresos = Table(data_egresos, colWidths=[2.166*inch, 1.084*inch])
-        tabla_egresos.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.906, 0.298, 0.235, alpha=0.5)),  # Rojo con opacidad 0.5
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 8),
-            ('FONTSIZE', (0, 1), (-1, -1), 7),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 4),
-            ('TOPPADDING', (0, 0), (-1, 0), 4),
-            ('BACKGROUND', (0, 1), (-1, -2), colors.Color(0.941, 0.502, 0.502, alpha=0.5)),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.Color(0.753, 0.224, 0.169, alpha=0.5)),
-            ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-            ('TOPPADDING', (0, 1), (-1, -1), 1.5),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 1.5),
-        ]))
-        
-        # Combinar ambas tablas en una sola tabla sin separación
-        data_combinada = []
-        for i in range(len(data_ingresos)):
-            data_combinada.append(data_ingresos[i] + data_egresos[i])
-        
-        tabla_combinada = Table(data_combinada, colWidths=[2.166*inch, 1.084*inch, 2.166*inch, 1.084*inch])
-        tabla_combinada.setStyle(TableStyle([
-            # Estilos para columnas de INGRESOS (0, 1)
-            ('BACKGROUND', (0, 0), (1, 0), colors.Color(0.153, 0.682, 0.376, alpha=0.5)),
-            ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (1, 0), 8),
-            ('FONTSIZE', (0, 1), (1, -1), 7),
-            ('BOTTOMPADDING', (0, 0), (1, 0), 4),
-            ('TOPPADDING', (0, 0), (1, 0), 4),
-            ('BACKGROUND', (0, 1), (1, -2), colors.Color(0.565, 0.933, 0.565, alpha=0.5)),
-            ('BACKGROUND', (0, -1), (1, -1), colors.Color(0.118, 0.518, 0.286, alpha=0.5)),
-            ('TEXTCOLOR', (0, -1), (1, -1), colors.black),
-            ('FONTNAME', (0, -1), (1, -1), 'Helvetica-Bold'),
-            ('TOPPADDING', (0, 1), (1, -1), 1.5),
-            ('BOTTOMPADDING', (0, 1), (1, -1), 1.5),
-            # Estilos para columnas de EGRESOS (2, 3)
-            ('BACKGROUND', (2, 0), (3, 0), colors.Color(0.906, 0.298, 0.235, alpha=0.5)),
-            ('TEXTCOLOR', (2, 0), (3, 0), colors.black),
-            ('ALIGN', (2, 0), (2, -1), 'LEFT'),
-            ('ALIGN', (3, 0), (3, -1), 'RIGHT'),
-            ('FONTNAME', (2, 0), (3, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (2, 0), (3, 0), 8),
-            ('FONTSIZE', (2, 1), (3, -1), 7),
-            ('BOTTOMPADDING', (2, 0), (3, 0), 4),
-            ('TOPPADDING', (2, 0), (3, 0), 4),
-            ('BACKGROUND', (2, 1), (3, -2), colors.Color(0.941, 0.502, 0.502, alpha=0.5)),
-            ('BACKGROUND', (2, -1), (3, -1), colors.Color(0.753, 0.224, 0.169, alpha=0.5)),
-            ('TEXTCOLOR', (2, -1), (3, -1), colors.black),
-            ('FONTNAME', (2, -1), (3, -1), 'Helvetica-Bold'),
-            ('TOPPADDING', (2, 1), (3, -1), 1.5),
-            ('BOTTOMPADDING', (2, 1), (3, -1), 1.5),
-            # Bordes
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ]))
+        tabla_combinada = Table(data_combinada, colWidths=plantilla.combinada_col_widths)
+        tabla_combinada.setStyle(plantilla.combinada_style)
         
         elements.append(tabla_combinada)
         elements.append(Spacer(1, 0))
@@ -261,71 +413,28 @@ class PDFGenerator:
             ['LÍQUIDO PAGABLE', f"{boleta.calcular_liquido_pagable():.2f} Bs."],
         ]
         
-        tabla_liquido = Table(data_liquido, colWidths=[4.5*inch, 2*inch])
-        tabla_liquido.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.Color(0.161, 0.502, 0.725, alpha=0.5)),  # Azul con opacidad 0.5
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('GRID', (0, 0), (-1, -1), 1.5, colors.black),
-        ]))
+        tabla_liquido = Table(data_liquido, colWidths=plantilla.liquido_col_widths)
+        tabla_liquido.setStyle(plantilla.liquido_style)
         
         elements.append(tabla_liquido)
         elements.append(Spacer(1, 0.22*inch))
         
         # Firmas - compacto
-        data_firmas = [
-            ['_____________________', '', '_____________________'],
-            ['Firma Empleador', '', 'Firma Empleado'],
-            ['Entregue Conforme', '', 'Recibí Conforme'],
-        ]
-        
-        tabla_firmas = Table(data_firmas, colWidths=[3.0*inch, 1.34*inch, 3.0*inch])
-        tabla_firmas.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('ALIGN', (2, 0), (2, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 1), (-1, 1), 7),
-            ('FONTSIZE', (0, 2), (-1, 2), 6),
-            ('TOPPADDING', (0, 0), (-1, 0), 8),
-            ('TOPPADDING', (0, 2), (-1, 2), 1),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-        ]))
-        
-        elements.append(tabla_firmas)
+        self._add_firmas(elements, plantilla)
         
-        # Construir PDF
-        doc.build(elements)
-        return filename
+        return elements
     
-    def generar_boleta_aguinaldo(self, boleta):
-        """Genera PDF para boleta de aguinaldo"""
-        filename = os.path.join(self.output_dir, f"{boleta.numero_boleta}_Aguinaldo_{boleta.nombre_completo.replace(' ', '_')}.pdf")
-        doc = SimpleDocTemplate(filename, pagesize=letter)
+    def _elementos_boleta_aguinaldo(self, boleta):
+        """Elementos de la boleta de aguinaldo"""
         elements = []
-        styles = getSampleStyleSheet()
-        
-        # Estilo personalizado para título
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#2C3E50'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
+        plantilla = obtener_plantilla('aguinaldo')
+        styles = plantilla.styles
         
         # Header
-        self._add_header(elements, styles)
+        self._add_header(elements, plantilla)
         
         # Título
-        elements.append(Paragraph(f"<b>BOLETA DE PAGO DE AGUINALDO</b>", title_style))
+        elements.append(Paragraph(f"<b>BOLETA DE PAGO DE AGUINALDO</b>", plantilla.title_style))
         elements.append(Paragraph(f"<b>No. {boleta.numero_boleta}</b>", styles['Heading2']))
         elements.append(Spacer(1, 0.2*inch))
         
@@ -343,18 +452,8 @@ class PDFGenerator:
             ['Método de Pago:', getattr(boleta, 'metodo_pago', 'EFECTIVO')],
         ]
         
-        tabla_empleado = Table(data_empleado, colWidths=[2.5*inch, 4*inch])
-        tabla_empleado.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495E')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-        ]))
+        tabla_empleado = Table(data_empleado, colWidths=plantilla.empleado_col_widths)
+        tabla_empleado.setStyle(plantilla.empleado_style)
         
         elements.append(tabla_empleado)
         elements.append(Spacer(1, 0.3*inch))
@@ -367,22 +466,8 @@ class PDFGenerator:
             ['TOTAL AGUINALDO', f"{boleta.calcular_liquido_pagable():.2f}"],
         ]
         
-        tabla_calculo = Table(data_calculo, colWidths=[4.5*inch, 2*inch])
-        tabla_calculo.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.153, 0.682, 0.376, alpha=0.5)),  # Verde con opacidad 0.5
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -2), colors.Color(0.565, 0.933, 0.565, alpha=0.5)),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.Color(0.118, 0.518, 0.286, alpha=0.5)),
-            ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, -1), (-1, -1), 13),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
+        tabla_calculo = Table(data_calculo, colWidths=plantilla.montos_col_widths)
+        tabla_calculo.setStyle(plantilla.calculo_style)
         
         elements.append(tabla_calculo)
         elements.append(Spacer(1, 0.3*inch))
@@ -392,78 +477,32 @@ class PDFGenerator:
             ['LÍQUIDO PAGABLE', f"{boleta.calcular_liquido_pagable():.2f} Bs."],
         ]
         
-        tabla_liquido = Table(data_liquido, colWidths=[4.5*inch, 2*inch])
-        tabla_liquido.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.Color(0.161, 0.502, 0.725, alpha=0.5)),  # Azul con opacidad 0.5
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 2, colors.black),
-        ]))
+        tabla_liquido = Table(data_liquido, colWidths=plantilla.montos_col_widths)
+        tabla_liquido.setStyle(plantilla.liquido_style)
         
         elements.append(tabla_liquido)
         elements.append(Spacer(1, 0.37*inch))
         
         # Nota legal
-        nota = """
-        <i>Nota: El aguinaldo corresponde al pago del doceavo del total ganado durante el año, 
-        conforme a la legislación laboral vigente.</i>
-        """
-        elements.append(Paragraph(nota, styles['Normal']))
+        elements.append(Paragraph(plantilla.nota, styles['Normal']))
         elements.append(Spacer(1, 0.3*inch))
         
         # Firmas
-        data_firmas = [
-            ['_____________________', '', '_____________________'],
-            ['Firma Empleador', '', 'Firma Empleado'],
-            ['Entregue Conforme', '', 'Recibí Conforme'],
-        ]
+        self._add_firmas(elements, plantilla)
         
-        tabla_firmas = Table(data_firmas, colWidths=[3.0*inch, 1.34*inch, 3.0*inch])
-        tabla_firmas.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('ALIGN', (2, 0), (2, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 2), (-1, 2), 9),
-            ('TOPPADDING', (0, 0), (-1, 0), 20),
-            ('TOPPADDING', (0, 2), (-1, 2), 1),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-        ]))
-        
-        elements.append(tabla_firmas)
-        
-        # Construir PDF
-        doc.build(elements)
-        return filename
+        return elements
     
-    def generar_boleta_liquidacion(self, boleta):
-        """Genera PDF para boleta de liquidación"""
-        filename = os.path.join(self.output_dir, f"{boleta.numero_boleta}_Liquidacion_{boleta.nombre_completo.replace(' ', '_')}.pdf")
-        doc = SimpleDocTemplate(filename, pagesize=letter)
+    def _elementos_boleta_liquidacion(self, boleta):
+        """Elementos de la boleta de liquidación"""
         elements = []
-        styles = getSampleStyleSheet()
-        
-        # Estilo personalizado para título
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#2C3E50'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
+        plantilla = obtener_plantilla('liquidacion')
+        styles = plantilla.styles
         
         # Header
-        self._add_header(elements, styles)
+        self._add_header(elements, plantilla)
         
         # Título
-        elements.append(Paragraph(f"<b>BOLETA DE LIQUIDACIÓN</b>", title_style))
+        elements.append(Paragraph(f"<b>BOLETA DE LIQUIDACIÓN</b>", plantilla.title_style))
         elements.append(Paragraph(f"<b>No. {boleta.numero_boleta}</b>", styles['Heading2']))
         elements.append(Spacer(1, 0.2*inch))
         
@@ -482,18 +521,8 @@ class PDFGenerator:
             ['Método de Pago:', getattr(boleta, 'metodo_pago', 'EFECTIVO')],
         ]
         
-        tabla_empleado = Table(data_empleado, colWidths=[2.5*inch, 4*inch])
-        tabla_empleado.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495E')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-        ]))
+        tabla_empleado = Table(data_empleado, colWidths=plantilla.empleado_col_widths)
+        tabla_empleado.setStyle(plantilla.empleado_style)
         
         elements.append(tabla_empleado)
         elements.append(Spacer(1, 0.3*inch))
@@ -505,18 +534,8 @@ class PDFGenerator:
             ['Promedio últimos 3 sueldos', f"{boleta.promedio_ultimos_3_sueldos:.2f}"],
         ]
         
-        tabla_remuneraciones = Table(data_remuneraciones, colWidths=[4.5*inch, 2*inch])
-        tabla_remuneraciones.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#8E44AD')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lavender),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
+        tabla_remuneraciones = Table(data_remuneraciones, colWidths=plantilla.montos_col_widths)
+        tabla_remuneraciones.setStyle(plantilla.remuneraciones_style)
         
         elements.append(tabla_remuneraciones)
         elements.append(Spacer(1, 0.2*inch))
@@ -531,21 +550,8 @@ class PDFGenerator:
             ['TOTAL BENEFICIOS', f"{boleta.calcular_total_beneficios():.2f}"],
         ]
         
-        tabla_beneficios = Table(data_beneficios, colWidths=[4.5*inch, 2*inch])
-        tabla_beneficios.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.153, 0.682, 0.376, alpha=0.5)),  # Verde con opacidad 0.5
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -2), colors.Color(0.565, 0.933, 0.565, alpha=0.5)),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.Color(0.118, 0.518, 0.286, alpha=0.5)),
-            ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
+        tabla_beneficios = Table(data_beneficios, colWidths=plantilla.montos_col_widths)
+        tabla_beneficios.setStyle(plantilla.beneficios_style)
         
         elements.append(tabla_beneficios)
         elements.append(Spacer(1, 0.2*inch))
@@ -559,21 +565,8 @@ class PDFGenerator:
             ['TOTAL DEDUCCIONES', f"{boleta.calcular_total_deducciones():.2f}"],
         ]
         
-        tabla_deducciones = Table(data_deducciones, colWidths=[4.5*inch, 2*inch])
-        tabla_deducciones.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.906, 0.298, 0.235, alpha=0.5)),  # Rojo con opacidad 0.5
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -2), colors.Color(0.941, 0.502, 0.502, alpha=0.5)),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.Color(0.753, 0.224, 0.169, alpha=0.5)),
-            ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
+        tabla_deducciones = Table(data_deducciones, colWidths=plantilla.montos_col_widths)
+        tabla_deducciones.setStyle(plantilla.deducciones_style)
         
         elements.append(tabla_deducciones)
         elements.append(Spacer(1, 0.3*inch))
@@ -583,44 +576,13 @@ class PDFGenerator:
             ['LÍQUIDO PAGABLE', f"{boleta.calcular_liquido_pagable():.2f} Bs."],
         ]
         
-        tabla_liquido = Table(data_liquido, colWidths=[4.5*inch, 2*inch])
-        tabla_liquido.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.Color(0.161, 0.502, 0.725, alpha=0.5)),  # Azul con opacidad 0.5
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 2, colors.black),
-        ]))
+        tabla_liquido = Table(data_liquido, colWidths=plantilla.montos_col_widths)
+        tabla_liquido.setStyle(plantilla.liquido_style)
         
         elements.append(tabla_liquido)
         elements.append(Spacer(1, 0.37*inch))
         
         # Firmas
-        data_firmas = [
-            ['_____________________', '', '_____________________'],
-            ['Firma Empleador', '', 'Firma Empleado'],
-            ['Entregue Conforme', '', 'Recibí Conforme'],
-        ]
-        
-        tabla_firmas = Table(data_firmas, colWidths=[3.0*inch, 1.34*inch, 3.0*inch])
-        tabla_firmas.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-            ('ALIGN', (2, 0), (2, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 2), (-1, 2), 9),
-            ('TOPPADDING', (0, 0), (-1, 0), 20),
-            ('TOPPADDING', (0, 2), (-1, 2), 1),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-        ]))
+        self._add_firmas(elements, plantilla)
         
-        elements.append(tabla_firmas)
-        
-        # Construir PDF
-        doc.build(elements)
-        return filename
+        return elements
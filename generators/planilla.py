@@ -0,0 +1,222 @@
+"""
+Planilla de sueldos mensual
+Reúne las boletas mensuales emitidas en un período (registro de boletas) y
+genera la planilla consolidada: una fila por empleado (su última boleta del
+período) con ingresos, egresos y líquido pagable, más los totales por columna
+
+Los montos se leen del registro en bloques, cada uno un LoteBoletas con
+arreglos NumPy por columna, de modo que los totales de todas las filas de
+un bloque se calculan de una vez. La planilla se genera como PDF de varias páginas
+(LongTable) o como CSV en streaming.
+"""
+
+import csv
+import io
+
+import numpy as np
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import (BaseDocTemplate, PageTemplate, Frame, LongTable, Table, TableStyle,
+                                Paragraph, Spacer)
+
+from models.lote_boletas import LoteBoletas, formatear
+from models.registro_boletas import registro_boletas, rango_periodo
+from monitoreo.metricas import metricas
+
+CAMPOS_INGRESOS = ('haber_basico', 'horas_extra', 'bono_antiguedad', 'otros_ingresos')
+CAMPOS_EGRESOS = ('faltas', 'retrasos', 'reposiciones', 'otros_egresos')
+CAMPOS_MONTOS = CAMPOS_INGRESOS + CAMPOS_EGRESOS
+
+# Columnas de montos de la planilla, en orden
+COLUMNAS_MONTOS = (CAMPOS_INGRESOS + ('total_ingresos',) + CAMPOS_EGRESOS
+                   + ('total_egresos', 'liquido_pagable'))
+
+ENCABEZADOS_CSV = (['numero_boleta', 'ci', 'nombre_completo', 'cargo'] + list(COLUMNAS_MONTOS))
+ENCABEZADOS_PDF = ['N°', 'Boleta', 'C.I.', 'Nombre', 'Haber\nbásico', 'Horas\nextra', 'Bono\nantigüedad',
+                   'Otros\ningresos', 'Total\ningresos', 'Faltas', 'Retrasos', 'Reposi-\nciones',
+                   'Otros\negresos', 'Total\negresos', 'Líquido\npagable']
+ANCHOS_PDF = [0.35*inch, 0.75*inch, 0.65*inch, 1.6*inch] + [0.61*inch] * 11
+
+NOMBRES_MES = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 'Julio', 'Agosto',
+               'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
+
+# Filas leídas del registro por consulta; cada bloque es una tabla del PDF
+BLOQUE = 500
+
+# Alto fijo de fila: evita que reportlab mida cada celda al armar la tabla
+ALTO_FILA = 11
+ALTO_ENCABEZADO = 18
+MAX_NOMBRE = 30
+
+ESTILO_ENCABEZADO = TableStyle([
+    ('FONT', (0, 0), (-1, -1), 'Helvetica-Bold', 6.5, 7.5),
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#D9E2F3')),
+    ('ALIGN', (4, 0), (-1, -1), 'RIGHT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+    ('TOPPADDING', (0, 0), (-1, -1), 1),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+])
+ESTILO_TABLA = TableStyle([
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 6.5),
+    ('ALIGN', (4, 0), (-1, -1), 'RIGHT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+    ('TOPPADDING', (0, 0), (-1, -1), 1),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+])
+ESTILO_TOTALES = TableStyle([
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 6.5),
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F2F2F2')),
+    ('ALIGN', (4, 0), (-1, -1), 'RIGHT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+    ('TOPPADDING', (0, 0), (-1, -1), 1),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+])
+
+
+def validar_periodo(periodo):
+    """Verifica que el período sea un mes 'AAAA-MM' y lo retorna"""
+    desde, hasta = rango_periodo(periodo or '')
+    if desde != hasta:
+        raise ValueError(f"La planilla es mensual: indique el período como AAAA-MM, no {periodo}")
+    return periodo
+
+
+def nombre_periodo(periodo):
+    """Retorna 'Enero 2025' para el período '2025-01'"""
+    anio, mes = periodo.split('-')
+    return f"{NOMBRES_MES[int(mes) - 1]} {anio}"
+
+
+def bloques_planilla(periodo, registro=None, tamano=BLOQUE):
+    """
+    Recorre las boletas mensuales del período en lotes columnares
+
+    Yields:
+        LoteBoletas: Lote mensual de hasta tamano filas
+    """
+    registro = registro or registro_boletas
+    campos = ('numero_boleta', 'ci', 'nombre_completo', 'cargo') + CAMPOS_MONTOS
+    for filas in registro.bloques_mensuales(validar_periodo(periodo), CAMPOS_MONTOS, tamano):
+        yield LoteBoletas.desde_filas('mensual', campos, filas)
+
+
+def _encabezado():
+    """Fila de encabezados de columna del PDF"""
+    return Table([ENCABEZADOS_PDF], colWidths=ANCHOS_PDF, rowHeights=[ALTO_ENCABEZADO], style=ESTILO_ENCABEZADO)
+
+
+def _montos(lote):
+    """Columnas de montos del lote formateadas, en el orden de COLUMNAS_MONTOS"""
+    return [formatear(lote.columna(columna)) for columna in COLUMNAS_MONTOS]
+
+
+def csv_planilla(periodo, registro=None, tamano=BLOQUE):
+    """
+    Genera el CSV de la planilla por partes, un bloque de filas a la vez
+
+    La última fila tiene los totales de cada columna.
+
+    Yields:
+        str: Texto del CSV
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(ENCABEZADOS_CSV)
+    sumas = np.zeros(len(COLUMNAS_MONTOS))
+    filas = 0
+    for lote in bloques_planilla(periodo, registro, tamano):
+        sumas += lote.sumas(COLUMNAS_MONTOS)
+        filas += len(lote)
+        writer.writerows(zip(lote.columna('numero_boleta'), lote.columna('ci'),
+                             lote.columna('nombre_completo'), lote.columna('cargo'), *_montos(lote)))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    writer.writerow(['TOTAL', '', f"{filas} boletas", ''] + formatear(sumas))
+    yield buffer.getvalue()
+    metricas.incrementar('boletas_planillas_generadas_total', {'formato': 'csv'})
+
+
+def renderizar_planilla(periodo, empresa_config, registro=None, tamano=BLOQUE):
+    """
+    Genera en memoria el PDF de la planilla (carta horizontal, varias páginas)
+
+    Cada bloque de filas es una LongTable sin encabezado, con alto de fila
+    y anchos fijos, así el armado crece en forma lineal con la cantidad de
+    filas. El encabezado de columnas va una vez debajo del título y se
+    dibuja arriba de cada página siguiente (en el marco de la página, no en
+    las tablas), por lo que no se repite donde empieza un bloque.
+
+    Returns:
+        bytes: Contenido del PDF
+    """
+    empresa = empresa_config.get_empresa_data()
+    titulo = f"PLANILLA DE SUELDOS - {nombre_periodo(validar_periodo(periodo)).upper()}"
+    styles = getSampleStyleSheet()
+    elementos = [
+        Paragraph(f"<b>{empresa.get('nombre', '')}</b> &nbsp; NIT: {empresa.get('nit', 'N/A')}", styles['Normal']),
+        Paragraph(f"<b>{titulo}</b>", styles['Heading3']),
+        Spacer(1, 4),
+        _encabezado(),
+    ]
+
+    sumas = np.zeros(len(COLUMNAS_MONTOS))
+    filas = 0
+    for lote in bloques_planilla(periodo, registro, tamano):
+        sumas += lote.sumas(COLUMNAS_MONTOS)
+        datos = [
+            [str(n), numero, ci, nombre[:MAX_NOMBRE], *montos]
+            for n, numero, ci, nombre, *montos in zip(
+                range(filas + 1, filas + len(lote) + 1), lote.columna('numero_boleta'), lote.columna('ci'),
+                lote.columna('nombre_completo'), *_montos(lote))
+        ]
+        filas += len(lote)
+        elementos.append(LongTable(datos, colWidths=ANCHOS_PDF, rowHeights=[ALTO_FILA] * len(lote),
+                                   style=ESTILO_TABLA))
+
+    if not filas:
+        raise ValueError(f"No hay boletas mensuales registradas para {nombre_periodo(periodo)}")
+
+    totales = ['', 'TOTAL', '', f"{filas} boletas"] + formatear(sumas)
+    elementos.append(Table([totales], colWidths=ANCHOS_PDF, rowHeights=[ALTO_FILA], style=ESTILO_TOTALES))
+
+    buffer = io.BytesIO()
+    doc = BaseDocTemplate(buffer, pagesize=landscape(letter), title=titulo,
+                          topMargin=0.4*inch, bottomMargin=0.5*inch,
+                          leftMargin=0.4*inch, rightMargin=0.4*inch)
+
+    def pie(canvas, doc):
+        canvas.saveState()
+        canvas.setFont('Helvetica', 7)
+        canvas.drawString(doc.leftMargin, 0.3*inch, titulo)
+        canvas.drawRightString(doc.pagesize[0] - doc.rightMargin, 0.3*inch, f"Página {doc.page}")
+        canvas.restoreState()
+
+    # En las páginas siguientes el marco empieza debajo del encabezado de
+    # columnas, que se dibuja alineado con las tablas (centradas en el marco)
+    marco = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height)
+    marco_siguientes = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height - ALTO_ENCABEZADO)
+    x_encabezado = doc.leftMargin + (doc.width - sum(ANCHOS_PDF)) / 2
+    y_encabezado = doc.bottomMargin + doc.height - ALTO_ENCABEZADO - marco_siguientes.topPadding
+
+    def encabezado_y_pie(canvas, doc):
+        encabezado = _encabezado()
+        encabezado.wrapOn(canvas, doc.width, ALTO_ENCABEZADO)
+        encabezado.drawOn(canvas, x_encabezado, y_encabezado)
+        pie(canvas, doc)
+
+    doc.addPageTemplates([
+        PageTemplate('primera', [marco], onPage=pie, autoNextPageTemplate='siguientes'),
+        PageTemplate('siguientes', [marco_siguientes], onPage=encabezado_y_pie),
+    ])
+    doc.build(elementos)
+    metricas.incrementar('boletas_planillas_generadas_total', {'formato': 'pdf'})
+    return buffer.getvalue()
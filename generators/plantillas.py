@@ -0,0 +1,334 @@
+"""
+Plantillas de diseño de las boletas
+Construye una sola vez por proceso los estilos, anchos de columna y filas
+fijas de cada tipo de boleta; cada PDF solo completa las celdas variables
+"""
+
+import threading
+
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.platypus import TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+
+# Colores compartidos (con opacidad 0.5)
+VERDE = colors.Color(0.153, 0.682, 0.376, alpha=0.5)
+VERDE_CLARO = colors.Color(0.565, 0.933, 0.565, alpha=0.5)
+VERDE_OSCURO = colors.Color(0.118, 0.518, 0.286, alpha=0.5)
+ROJO = colors.Color(0.906, 0.298, 0.235, alpha=0.5)
+ROJO_CLARO = colors.Color(0.941, 0.502, 0.502, alpha=0.5)
+ROJO_OSCURO = colors.Color(0.753, 0.224, 0.169, alpha=0.5)
+AZUL = colors.Color(0.161, 0.502, 0.725, alpha=0.5)
+
+FIRMAS_DATA = [
+    ['_____________________', '', '_____________________'],
+    ['Firma Empleador', '', 'Firma Empleado'],
+    ['Entregue Conforme', '', 'Recibí Conforme'],
+]
+FIRMAS_COL_WIDTHS = [3.0*inch, 1.34*inch, 3.0*inch]
+
+
+class PlantillaBase:
+    """Elementos comunes a todas las boletas"""
+
+    def __init__(self):
+        self.styles = getSampleStyleSheet()
+        self.firmas_data = FIRMAS_DATA
+        self.firmas_col_widths = FIRMAS_COL_WIDTHS
+
+
+class PlantillaMensual(PlantillaBase):
+    """Diseño compacto de media página de la boleta mensual"""
+
+    def __init__(self):
+        super().__init__()
+        styles = self.styles
+
+        # Estilo para título centrado
+        self.title_style = ParagraphStyle(
+            'TitleStyle',
+            parent=styles['Normal'],
+            fontSize=14,
+            textColor=colors.HexColor('#2C3E50'),
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        )
+
+        # Estilo para datos de empresa
+        self.empresa_style = ParagraphStyle(
+            'EmpresaStyle',
+            parent=styles['Normal'],
+            fontSize=7,
+            alignment=TA_RIGHT,
+            leading=9
+        )
+
+        # Header horizontal: Logo - Título - Datos Empresa
+        self.header_col_widths = [2.5*inch, 3*inch, 2.5*inch]
+        self.header_style = TableStyle([
+            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+            ('ALIGN', (1, 0), (1, 0), 'CENTER'),
+            ('ALIGN', (2, 0), (2, 0), 'RIGHT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ])
+
+        # Datos del empleado
+        self.empleado_col_widths = [0.9*inch, 2.3*inch, 0.7*inch, 2.6*inch]
+        self.empleado_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#ECF0F1')),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('TOPPADDING', (0, 0), (-1, -1), 2),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+        ])
+
+        # Ingresos y egresos lado a lado: filas de etiquetas fijas
+        self.etiquetas_ingresos = ['INGRESOS', 'Haber Básico', 'Horas Extra',
+                                   'Bono Antigüedad', 'Otros Ingresos', 'TOTAL INGRESOS']
+        self.etiquetas_egresos = ['EGRESOS', 'Faltas', 'Retrasos',
+                                  'Reposiciones', 'Otros Egresos', 'TOTAL EGRESOS']
+        self.combinada_col_widths = [2.166*inch, 1.084*inch, 2.166*inch, 1.084*inch]
+        self.combinada_style = TableStyle([
+            # Estilos para columnas de INGRESOS (0, 1)
+            ('BACKGROUND', (0, 0), (1, 0), VERDE),
+            ('TEXTCOLOR', (0, 0), (1, 0), colors.black),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (1, 0), 8),
+            ('FONTSIZE', (0, 1), (1, -1), 7),
+            ('BOTTOMPADDING', (0, 0), (1, 0), 4),
+            ('TOPPADDING', (0, 0), (1, 0), 4),
+            ('BACKGROUND', (0, 1), (1, -2), VERDE_CLARO),
+            ('BACKGROUND', (0, -1), (1, -1), VERDE_OSCURO),
+            ('TEXTCOLOR', (0, -1), (1, -1), colors.black),
+            ('FONTNAME', (0, -1), (1, -1), 'Helvetica-Bold'),
+            ('TOPPADDING', (0, 1), (1, -1), 1.5),
+            ('BOTTOMPADDING', (0, 1), (1, -1), 1.5),
+            # Estilos para columnas de EGRESOS (2, 3)
+            ('BACKGROUND', (2, 0), (3, 0), ROJO),
+            ('TEXTCOLOR', (2, 0), (3, 0), colors.black),
+            ('ALIGN', (2, 0), (2, -1), 'LEFT'),
+            ('ALIGN', (3, 0), (3, -1), 'RIGHT'),
+            ('FONTNAME', (2, 0), (3, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (2, 0), (3, 0), 8),
+            ('FONTSIZE', (2, 1), (3, -1), 7),
+            ('BOTTOMPADDING', (2, 0), (3, 0), 4),
+            ('TOPPADDING', (2, 0), (3, 0), 4),
+            ('BACKGROUND', (2, 1), (3, -2), ROJO_CLARO),
+            ('BACKGROUND', (2, -1), (3, -1), ROJO_OSCURO),
+            ('TEXTCOLOR', (2, -1), (3, -1), colors.black),
+            ('FONTNAME', (2, -1), (3, -1), 'Helvetica-Bold'),
+            ('TOPPADDING', (2, 1), (3, -1), 1.5),
+            ('BOTTOMPADDING', (2, 1), (3, -1), 1.5),
+            # Bordes
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ])
+
+        # Líquido pagable
+        self.liquido_col_widths = [4.5*inch, 2*inch]
+        self.liquido_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), AZUL),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 1.5, colors.black),
+        ])
+
+        # Firmas - compacto
+        self.firmas_style = TableStyle([
+            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+            ('ALIGN', (2, 0), (2, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 1), (-1, 1), 7),
+            ('FONTSIZE', (0, 2), (-1, 2), 6),
+            ('TOPPADDING', (0, 0), (-1, 0), 8),
+            ('TOPPADDING', (0, 2), (-1, 2), 1),
+            ('LEFTPADDING', (0, 0), (-1, -1), 10),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+        ])
+
+
+class PlantillaPaginaCompleta(PlantillaBase):
+    """Elementos comunes de las boletas de página completa (aguinaldo y liquidación)"""
+
+    def __init__(self):
+        super().__init__()
+        styles = self.styles
+
+        # Estilo personalizado para título
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=16,
+            textColor=colors.HexColor('#2C3E50'),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        )
+
+        # Encabezado con logo y datos de empresa
+        self.header_col_widths = [1.5*inch, 5*inch]
+        self.header_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ])
+
+        # Datos del empleado
+        self.empleado_col_widths = [2.5*inch, 4*inch]
+        self.empleado_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495E')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+        ])
+
+        # Tablas de montos
+        self.montos_col_widths = [4.5*inch, 2*inch]
+
+        # Líquido pagable
+        self.liquido_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), AZUL),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 14),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 2, colors.black),
+        ])
+
+        # Firmas
+        self.firmas_style = TableStyle([
+            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+            ('ALIGN', (2, 0), (2, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 2), (-1, 2), 9),
+            ('TOPPADDING', (0, 0), (-1, 0), 20),
+            ('TOPPADDING', (0, 2), (-1, 2), 1),
+            ('LEFTPADDING', (0, 0), (-1, -1), 10),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+        ])
+
+
+class PlantillaAguinaldo(PlantillaPaginaCompleta):
+    """Diseño de la boleta de aguinaldo"""
+
+    def __init__(self):
+        super().__init__()
+
+        # Cálculo del aguinaldo
+        self.calculo_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), VERDE),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -2), VERDE_CLARO),
+            ('BACKGROUND', (0, -1), (-1, -1), VERDE_OSCURO),
+            ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, -1), (-1, -1), 13),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ])
+
+        self.nota = """
+        <i>Nota: El aguinaldo corresponde al pago del doceavo del total ganado durante el año,
+        conforme a la legislación laboral vigente.</i>
+        """
+
+
+class PlantillaLiquidacion(PlantillaPaginaCompleta):
+    """Diseño de la boleta de liquidación"""
+
+    def __init__(self):
+        super().__init__()
+
+        # Remuneraciones
+        self.remuneraciones_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#8E44AD')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.lavender),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ])
+
+        # Beneficios sociales
+        self.beneficios_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), VERDE),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -2), VERDE_CLARO),
+            ('BACKGROUND', (0, -1), (-1, -1), VERDE_OSCURO),
+            ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ])
+
+        # Deducciones
+        self.deducciones_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), ROJO),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -2), ROJO_CLARO),
+            ('BACKGROUND', (0, -1), (-1, -1), ROJO_OSCURO),
+            ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ])
+
+
+# Registro de plantillas por tipo de boleta
+PLANTILLAS = {
+    'mensual': PlantillaMensual,
+    'aguinaldo': PlantillaAguinaldo,
+    'liquidacion': PlantillaLiquidacion,
+}
+
+_plantillas = {}
+_lock = threading.Lock()
+
+
+def obtener_plantilla(tipo):
+    """
+    Retorna la plantilla compilada del tipo de boleta, creándola la primera vez
+
+    Args:
+        tipo: 'mensual', 'aguinaldo' o 'liquidacion'
+    """
+    plantilla = _plantillas.get(tipo)
+    if plantilla is None:
+        with _lock:
+            plantilla = _plantillas.get(tipo)
+            if plantilla is None:
+                plantilla = _plantillas[tipo] = PLANTILLAS[tipo]()
+    return plantilla
@@ -0,0 +1,158 @@
+"""
+Caché de recursos estáticos de la empresa
+Mantiene en memoria el logo decodificado y los párrafos con datos de empresa
+para que ningún PDF vuelva a leerlos del disco
+"""
+
+import copy
+import hashlib
+import threading
+from io import BytesIO
+
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Flowable
+
+from generators.instrumentacion import instrumentacion
+
+
+class LogoFlowable(Flowable):
+    """Dibuja el logo en caché con un tamaño fijo"""
+
+    def __init__(self, imagen, width, height):
+        Flowable.__init__(self)
+        self.imagen = imagen
+        self.width = width
+        self.height = height
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        self.canv.drawImage(self.imagen, 0, 0, self.width, self.height, mask='auto')
+
+
+class LogoEmpresa:
+    """Logo decodificado una sola vez junto con sus dimensiones"""
+
+    def __init__(self, contenido):
+        """
+        Args:
+            contenido: Bytes del archivo de imagen
+        """
+        self.huella = hashlib.md5(contenido).hexdigest()
+        self.imagen = ImageReader(BytesIO(contenido))
+        self.ancho_px, self.alto_px = self.imagen.getSize()
+        # Forzar la decodificación para que los PDFs solo copien los datos
+        self.imagen.getRGBData()
+        self._tamanos = {}
+
+    @property
+    def aspect_ratio(self):
+        return self.ancho_px / self.alto_px
+
+    def dimensiones(self, alto):
+        """Retorna (ancho, alto) escalado a la altura dada, preservando proporciones"""
+        if alto not in self._tamanos:
+            self._tamanos[alto] = (alto * self.aspect_ratio, alto)
+        return self._tamanos[alto]
+
+    def flowable(self, alto, ancho=None):
+        """Crea el flowable del logo; sin ancho se preservan las proporciones"""
+        if ancho is None:
+            ancho, alto = self.dimensiones(alto)
+        return LogoFlowable(self.imagen, ancho, alto)
+
+
+class _EntradaCache:
+    """Recursos de una versión concreta de la configuración"""
+
+    def __init__(self, version, logo):
+        self.version = version
+        self.logo = logo
+        self.parrafos = {}
+
+
+class CacheRecursos:
+    """Caché por proceso de logo y párrafos de empresa, invalidada por versión"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entradas = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _entrada(self, empresa_config):
+        """Obtiene (o reconstruye) la entrada vigente para la configuración"""
+        entrada = self._entradas.get(empresa_config.config_file)
+        if entrada is not None and entrada.version == empresa_config.version:
+            return entrada
+
+        with self._lock:
+            entrada = self._entradas.get(empresa_config.config_file)
+            if entrada is None or entrada.version != empresa_config.version:
+                entrada = _EntradaCache(empresa_config.version, self._cargar_logo(empresa_config))
+                self._entradas[empresa_config.config_file] = entrada
+        return entrada
+
+    def _cargar_logo(self, empresa_config):
+        """Lee y decodifica el logo; retorna None si no existe o es inválido"""
+        try:
+            contenido = empresa_config.leer_logo()
+            return LogoEmpresa(contenido) if contenido else None
+        except Exception:
+            return None
+
+    def logo(self, empresa_config):
+        """
+        Retorna el logo de la empresa
+
+        Returns:
+            LogoEmpresa: Logo decodificado o None si no hay logo
+        """
+        with instrumentacion.etapa('recursos'):
+            entrada = self._entradas.get(empresa_config.config_file)
+            if entrada is not None and entrada.version == empresa_config.version:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return self._entrada(empresa_config).logo
+
+    def huella_logo(self, empresa_config):
+        """Retorna la huella del logo vigente ('' si no hay logo), sin contar aciertos"""
+        with instrumentacion.etapa('recursos'):
+            logo = self._entrada(empresa_config).logo
+            return logo.huella if logo else ''
+
+    def parrafo(self, empresa_config, clave, constructor):
+        """
+        Retorna una copia del párrafo identificado por clave
+
+        Args:
+            empresa_config: Instancia de EmpresaConfig
+            clave: Nombre del párrafo
+            constructor: Función que crea el párrafo a partir de los datos de empresa
+        """
+        with instrumentacion.etapa('recursos'):
+            entrada = self._entrada(empresa_config)
+            parrafo = entrada.parrafos.get(clave)
+            if parrafo is None:
+                self.misses += 1
+                parrafo = constructor(empresa_config.get_empresa_data())
+                entrada.parrafos[clave] = parrafo
+            else:
+                self.hits += 1
+            # Cada documento recibe su propia copia porque wrap() guarda estado
+            return copy.copy(parrafo)
+
+    def estadisticas(self):
+        """Retorna los contadores de aciertos y fallos"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0
+        }
+
+
+# Instancia compartida por todo el proceso
+recursos_cache = CacheRecursos()
@@ -0,0 +1,49 @@
+"""
+Script para importar empleados desde un archivo CSV o XLSX
+Lee el archivo fila por fila, valida cada fila (C.I. único, fecha
+dd/mm/aaaa, sueldo numérico) y guarda los empleados válidos por bloques
+(con --todo-o-nada, en una sola transacción)
+
+Uso:
+    python importar_empleados.py planilla.csv [--validar] [--todo-o-nada]
+"""
+
+import argparse
+import sys
+
+from models.empleado import EmpleadoManager
+from models.importacion import leer_planilla, formato_de
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa empleados desde un archivo CSV o XLSX")
+    parser.add_argument('archivo', help="Archivo .csv o .xlsx con encabezados en la primera fila")
+    parser.add_argument('--validar', action='store_true', help="Solo valida, no guarda")
+    parser.add_argument('--todo-o-nada', action='store_true',
+                        help="No importa nada si alguna fila tiene errores")
+    parser.add_argument('--empleados', default='config/empleados.json',
+                        help="Archivo de empleados (por defecto config/empleados.json)")
+    args = parser.parse_args()
+
+    manager = EmpleadoManager(args.empleados)
+    with open(args.archivo, 'rb') as f:
+        resultado = manager.importar_empleados(
+            leer_planilla(f, formato_de(args.archivo)),
+            parcial=not args.todo_o_nada,
+            solo_validar=args.validar
+        )
+
+    for error in resultado['errores']:
+        print(f"Fila {error['fila']}: {error['message']}")
+    if resultado['total_errores'] > len(resultado['errores']):
+        print(f"... y {resultado['total_errores'] - len(resultado['errores'])} errores más")
+
+    print(f"\n📄 Filas leídas: {resultado['filas']}")
+    print(f"✅ Válidas: {resultado['validos']}")
+    print(f"💾 Importadas: {resultado['importados']}")
+    print(f"❌ Con errores: {resultado['total_errores']}")
+    return 1 if resultado['total_errores'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,750 @@
+"""
+Almacenamiento de empleados
+Backends intercambiables para EmpleadoManager: archivo JSON (formato
+original) con diario de cambios o SQLite con clave primaria en id, índice
+único en ci y escrituras de una sola fila
+
+Todos los backends exponen la misma interfaz: cargar, insertar,
+insertar_lote, importacion, actualizar y eliminar. Además, cambios() informa lo que
+otros procesos (workers de gunicorn) modificaron desde la última consulta
+y generacion() identifica el contenido persistido que ya se aplicó.
+"""
+
+from contextlib import contextmanager
+import json
+import os
+import sqlite3
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: sin bloqueo entre procesos (gunicorn no corre en Windows)
+    fcntl = None
+
+# Backend por defecto: 'sqlite' o 'json'
+BACKEND = os.environ.get('BOLETAS_EMPLEADOS_BACKEND', 'sqlite')
+
+# Líneas del diario del backend JSON a partir de las cuales se compacta
+UMBRAL_COMPACTACION = int(os.environ.get('BOLETAS_EMPLEADOS_COMPACTACION', '1000'))
+
+# Cambios que conserva la tabla de cambios de SQLite; un proceso que se
+# atrasa más que esto vuelve a cargar la planilla completa
+MAX_CAMBIOS = 10000
+
+CAMPOS = ('id', 'nombre_completo', 'ci', 'cargo', 'fecha_ingreso', 'sueldo')
+
+ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS empleados (
+    id INTEGER PRIMARY KEY,
+    nombre_completo TEXT NOT NULL,
+    ci TEXT NOT NULL,
+    cargo TEXT NOT NULL,
+    fecha_ingreso TEXT NOT NULL,
+    sueldo REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_empleados_ci ON empleados (ci);
+
+CREATE TABLE IF NOT EXISTS cambios (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_empleado INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS empleados_alta AFTER INSERT ON empleados
+BEGIN INSERT INTO cambios (id_empleado) VALUES (NEW.id); END;
+CREATE TRIGGER IF NOT EXISTS empleados_modificacion AFTER UPDATE ON empleados
+BEGIN INSERT INTO cambios (id_empleado) VALUES (NEW.id); END;
+CREATE TRIGGER IF NOT EXISTS empleados_baja AFTER DELETE ON empleados
+BEGIN INSERT INTO cambios (id_empleado) VALUES (OLD.id); END;
+CREATE TRIGGER IF NOT EXISTS cambios_recorte AFTER INSERT ON cambios
+BEGIN DELETE FROM cambios WHERE seq <= NEW.seq - {MAX_CAMBIOS}; END;
+"""
+
+SELECCION = f"SELECT {', '.join(CAMPOS)} FROM empleados"
+
+INSERCION = ("INSERT INTO empleados (id, nombre_completo, ci, cargo, fecha_ingreso, sueldo) "
+             "VALUES (:id, :nombre_completo, :ci, :cargo, :fecha_ingreso, :sueldo)")
+
+
+class ConflictoEmpleado(Exception):
+    """La escritura choca con el estado persistido: C.I. o ID repetido, o
+    el empleado fue modificado o eliminado por otro proceso"""
+
+
+@contextmanager
+def _bloqueo(ruta, esperar=True):
+    """
+    Bloqueo exclusivo entre procesos sobre un archivo auxiliar
+
+    Yields:
+        bool: False si esperar es False y otro proceso tiene el bloqueo
+    """
+    if fcntl is None:
+        yield True
+        return
+    with open(ruta, 'a') as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX if esperar else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class AlmacenamientoJSON:
+    """
+    Empleados en un archivo JSON (instantánea) más un diario de cambios
+
+    Cada alta, modificación o baja agrega una línea al diario
+    (empleados.json.diario) en lugar de reescribir el archivo completo; al
+    cargar se aplica el diario sobre la instantánea. Cuando el diario supera
+    UMBRAL_COMPACTACION líneas, un hilo en segundo plano escribe una nueva
+    instantánea y lo descarta.
+
+    La primera línea del diario lo identifica y nombra al diario anterior
+    con su tamaño final: un proceso que ya aplicó todo el diario anterior
+    sigue con el nuevo desde el principio, sin recargar la planilla.
+    """
+
+    def __init__(self, archivo='config/empleados.json', umbral_compactacion=None):
+        """
+        Args:
+            archivo: Ruta del archivo JSON (instantánea)
+            umbral_compactacion: Líneas del diario que disparan la compactación
+        """
+        self.archivo = archivo
+        self.diario = archivo + '.diario'
+        # Diario que se está compactando; si el proceso termina antes de
+        # eliminarlo, se vuelve a aplicar al cargar
+        self.diario_compactando = archivo + '.diario.compactando'
+        self.archivo_bloqueo = archivo + '.lock'
+        self.archivo_bloqueo_compactacion = archivo + '.compactacion.lock'
+        self.umbral_compactacion = umbral_compactacion or UMBRAL_COMPACTACION
+        self._lock = threading.RLock()
+        self._bloqueado = False
+        self._filas = {}
+        self._por_ci = {}
+        # Diario aplicado: identificador, bytes leídos y firma (inodo, tamaño, mtime)
+        self._id_diario = None
+        self._posicion = 0
+        self._firma_diario = None
+        self._lineas_diario = 0
+        # Cambios de otros procesos que el gestor todavía no recibió
+        self._cambiados = set()
+        self._recargado = False
+        self._compactacion = None
+
+    @contextmanager
+    def _bloqueo_diario(self):
+        """Bloqueo del diario entre procesos (reentrante dentro del proceso)"""
+        with self._lock:
+            if self._bloqueado:
+                yield
+                return
+            directorio = os.path.dirname(self.archivo)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            with _bloqueo(self.archivo_bloqueo):
+                self._bloqueado = True
+                try:
+                    yield
+                finally:
+                    self._bloqueado = False
+
+    def cargar(self):
+        """
+        Lee la instantánea y aplica el diario
+
+        Returns:
+            list: Diccionarios de empleados en orden de registro
+        """
+        with self._lock:
+            self._recargar()
+            self._recargado = False
+            filas = list(self._filas.values())
+        # Una compactación que quedó a medias se completa en segundo plano
+        self._compactar_si_corresponde(forzar=os.path.exists(self.diario_compactando))
+        return filas
+
+    def cambios(self):
+        """
+        Aplica lo que otros procesos agregaron al diario
+
+        Returns:
+            tuple: (False, [(id, fila o None si se eliminó), ...]) o
+                   (True, todas las filas) si hubo que recargar la planilla
+        """
+        with self._lock:
+            self._ponerse_al_dia()
+            if self._recargado:
+                self._recargado = False
+                self._cambiados = set()
+                return True, list(self._filas.values())
+            if not self._cambiados:
+                return False, []
+            ids, self._cambiados = self._cambiados, set()
+            return False, [(id_empleado, self._filas.get(id_empleado)) for id_empleado in ids]
+
+    def generacion(self):
+        """Identifica el contenido aplicado; es igual en todos los procesos al día"""
+        with self._lock:
+            return f"{self._id_diario}-{self._posicion}"
+
+    def _firma(self):
+        """Inodo, tamaño y fecha de modificación del diario (None si no existe)"""
+        try:
+            estado = os.stat(self.diario)
+        except FileNotFoundError:
+            return None
+        return estado.st_ino, estado.st_size, estado.st_mtime_ns
+
+    def _firma_instantanea(self):
+        try:
+            estado = os.stat(self.archivo)
+        except FileNotFoundError:
+            return None
+        return estado.st_ino, estado.st_mtime_ns
+
+    def _leer_cabecera(self, f):
+        """Lee la línea de inicio del diario; los diarios sin cabecera retornan {}"""
+        linea = f.readline()
+        if linea.endswith(b'\n'):
+            try:
+                cabecera = json.loads(linea)
+            except ValueError:
+                cabecera = None
+            if isinstance(cabecera, dict) and cabecera.get('op') == 'inicio':
+                return cabecera
+        f.seek(0)
+        return {}
+
+    def _leer_operaciones(self, f, cambiados=None):
+        """
+        Aplica las líneas completas desde la posición actual del archivo
+
+        Una última línea incompleta (otro proceso la está escribiendo o
+        terminó a mitad de la escritura) no se aplica.
+
+        Returns:
+            int: Posición después de la última línea aplicada
+        """
+        posicion = f.tell()
+        for linea in f:
+            if not linea.endswith(b'\n'):
+                break
+            try:
+                operacion = json.loads(linea)
+            except ValueError:
+                break
+            self._aplicar(operacion, cambiados)
+            self._lineas_diario += 1
+            posicion += len(linea)
+        return posicion
+
+    def _recargar(self):
+        """Lee la instantánea y aplica los diarios, con el diario bloqueado"""
+        with self._bloqueo_diario():
+            while True:
+                instantanea = self._firma_instantanea()
+                self._filas = {}
+                self._por_ci = {}
+                if instantanea is not None:
+                    with open(self.archivo, 'r', encoding='utf-8') as f:
+                        for fila in json.load(f):
+                            self._poner(fila)
+                if os.path.exists(self.diario_compactando):
+                    with open(self.diario_compactando, 'rb') as f:
+                        self._leer_cabecera(f)
+                        self._leer_operaciones(f)
+                self._lineas_diario = 0
+                self._firma_diario = self._firma()
+                self._id_diario, self._posicion = None, 0
+                if self._firma_diario is not None:
+                    with open(self.diario, 'rb') as f:
+                        self._id_diario = self._leer_cabecera(f).get('diario')
+                        self._posicion = self._leer_operaciones(f)
+                # Otro proceso terminó una compactación mientras se leía
+                if self._firma_instantanea() == instantanea:
+                    break
+        self._cambiados = set()
+        self._recargado = True
+
+    def _ponerse_al_dia(self):
+        """Aplica las líneas nuevas del diario; solo hace un stat si no cambió"""
+        firma = self._firma()
+        if firma == self._firma_diario:
+            return
+        try:
+            with open(self.diario, 'rb') as f:
+                cabecera = self._leer_cabecera(f)
+                if cabecera.get('diario') == self._id_diario:
+                    f.seek(max(self._posicion, f.tell()))
+                elif (cabecera.get('anterior') == self._id_diario
+                        and cabecera.get('tamano_anterior') == self._posicion):
+                    # Se compactó un diario que ya estaba aplicado por completo
+                    self._lineas_diario = 0
+                else:
+                    self._recargar()
+                    return
+                self._posicion = self._leer_operaciones(f, self._cambiados)
+                self._id_diario = cabecera.get('diario')
+                self._firma_diario = firma
+        except FileNotFoundError:
+            self._recargar()
+
+    def _poner(self, fila, cambiados=None):
+        anterior = self._filas.get(fila['id'])
+        if anterior is not None and self._por_ci.get(anterior['ci']) == fila['id']:
+            del self._por_ci[anterior['ci']]
+        self._filas[fila['id']] = fila
+        self._por_ci[fila['ci']] = fila['id']
+        if cambiados is not None:
+            cambiados.add(fila['id'])
+
+    def _quitar(self, id_empleado, cambiados=None):
+        anterior = self._filas.pop(id_empleado, None)
+        if anterior is not None and self._por_ci.get(anterior['ci']) == id_empleado:
+            del self._por_ci[anterior['ci']]
+        if cambiados is not None:
+            cambiados.add(id_empleado)
+
+    def _aplicar(self, operacion, cambiados=None):
+        """Aplica una operación del diario (idempotente)"""
+        if operacion['op'] == 'insertar':
+            for fila in operacion['filas']:
+                self._poner(fila, cambiados)
+        elif operacion['op'] == 'actualizar':
+            self._poner(operacion['fila'], cambiados)
+        elif operacion['op'] == 'eliminar':
+            self._quitar(operacion['id'], cambiados)
+
+    def _crear_diario(self):
+        """Crea un diario vacío con su cabecera (con el diario bloqueado)"""
+        anterior, tamano_anterior = None, 0
+        if os.path.exists(self.diario_compactando):
+            with open(self.diario_compactando, 'rb') as f:
+                anterior = self._leer_cabecera(f).get('diario')
+            tamano_anterior = os.path.getsize(self.diario_compactando)
+        cabecera = {'op': 'inicio', 'diario': os.urandom(8).hex(),
+                    'anterior': anterior, 'tamano_anterior': tamano_anterior}
+        linea = (json.dumps(cabecera) + '\n').encode('utf-8')
+        temporal = f"{self.diario}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporal, 'wb') as f:
+            f.write(linea)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, self.diario)
+        self._id_diario = cabecera['diario']
+        self._posicion = len(linea)
+        self._lineas_diario = 0
+        self._firma_diario = self._firma()
+
+    def _registrar(self, operacion):
+        """Agrega una operación al diario y la aplica (con el diario bloqueado y al día)"""
+        linea = (json.dumps(operacion, ensure_ascii=False) + '\n').encode('utf-8')
+        if self._firma_diario is None:
+            self._crear_diario()
+        with open(self.diario, 'r+b') as f:
+            # Descarta una línea incompleta que haya dejado un proceso caído
+            f.seek(self._posicion)
+            f.truncate()
+            f.write(linea)
+            f.flush()
+            os.fsync(f.fileno())
+        self._posicion += len(linea)
+        self._firma_diario = self._firma()
+        self._aplicar(operacion)
+        self._lineas_diario += 1
+
+    def insertar(self, fila):
+        """Agrega un empleado"""
+        self.insertar_lote([fila])
+
+    def insertar_lote(self, filas):
+        """Agrega varios empleados en una sola línea del diario"""
+        filas = list(filas)
+        with self._bloqueo_diario():
+            self._ponerse_al_dia()
+            nuevos_ci = set()
+            for fila in filas:
+                if fila['id'] in self._filas:
+                    raise ConflictoEmpleado(f"Ya existe un empleado con el ID {fila['id']}")
+                if fila['ci'] in self._por_ci or fila['ci'] in nuevos_ci:
+                    raise ConflictoEmpleado(f"Ya existe un empleado con el C.I. {fila['ci']}")
+                nuevos_ci.add(fila['ci'])
+            self._registrar({'op': 'insertar', 'filas': filas})
+        self._compactar_si_corresponde()
+
+    @contextmanager
+    def importacion(self):
+        """
+        Alta de empleados por bloques que se confirma toda junta al salir
+
+        Las filas se escriben en una sola línea del diario a medida que
+        llegan, sin guardarlas en memoria: mientras la línea no termina los
+        demás procesos no la aplican, y si hay una excepción se descarta.
+
+        Yields:
+            Función que recibe una lista de filas y las agrega
+        """
+        with self._bloqueo_diario():
+            self._ponerse_al_dia()
+            if self._firma_diario is None:
+                self._crear_diario()
+            agregados = []
+            with open(self.diario, 'r+b') as f:
+                f.seek(self._posicion)
+                f.truncate()
+
+                def insertar(filas):
+                    for fila in filas:
+                        if fila['id'] in self._filas:
+                            raise ConflictoEmpleado(f"Ya existe un empleado con el ID {fila['id']}")
+                        if fila['ci'] in self._por_ci:
+                            raise ConflictoEmpleado(f"Ya existe un empleado con el C.I. {fila['ci']}")
+                        prefijo = b'{"op": "insertar", "filas": [' if not agregados else b', '
+                        f.write(prefijo + json.dumps(fila, ensure_ascii=False).encode('utf-8'))
+                        self._poner(fila)
+                        agregados.append(fila['id'])
+
+                try:
+                    yield insertar
+                    if agregados:
+                        f.write(b']}\n')
+                        f.flush()
+                        os.fsync(f.fileno())
+                except BaseException:
+                    f.seek(self._posicion)
+                    f.truncate()
+                    for id_empleado in agregados:
+                        self._quitar(id_empleado)
+                    raise
+            if agregados:
+                self._posicion = os.path.getsize(self.diario)
+                self._firma_diario = self._firma()
+                self._lineas_diario += 1
+        self._compactar_si_corresponde()
+
+    def actualizar(self, fila, anterior=None):
+        """
+        Reemplaza los datos de un empleado existente
+
+        Args:
+            fila: Datos nuevos
+            anterior: Datos sobre los que se hizo el cambio; si otro proceso
+                      los modificó entretanto se rechaza la escritura
+        """
+        with self._bloqueo_diario():
+            self._ponerse_al_dia()
+            actual = self._filas.get(fila['id'])
+            if actual is None or (anterior is not None and actual != anterior):
+                raise ConflictoEmpleado(f"El empleado {fila['id']} fue modificado o eliminado por otro proceso")
+            if self._por_ci.get(fila['ci'], fila['id']) != fila['id']:
+                raise ConflictoEmpleado(f"Ya existe un empleado con el C.I. {fila['ci']}")
+            self._registrar({'op': 'actualizar', 'fila': fila})
+        self._compactar_si_corresponde()
+
+    def eliminar(self, id_empleado):
+        """Elimina un empleado"""
+        with self._bloqueo_diario():
+            self._ponerse_al_dia()
+            if id_empleado not in self._filas:
+                raise ConflictoEmpleado(f"El empleado {id_empleado} fue eliminado por otro proceso")
+            self._registrar({'op': 'eliminar', 'id': id_empleado})
+        self._compactar_si_corresponde()
+
+    def _compactar_si_corresponde(self, forzar=False):
+        """Inicia la compactación en segundo plano si el diario superó el umbral"""
+        with self._lock:
+            if not forzar and self._lineas_diario < self.umbral_compactacion:
+                return
+            if self._compactacion is not None and self._compactacion.is_alive():
+                return
+            self._compactacion = threading.Thread(target=self.compactar, daemon=True)
+            self._compactacion.start()
+
+    def compactar(self):
+        """
+        Escribe una instantánea con el estado actual y descarta el diario
+
+        El diario se renombra y se crea uno nuevo antes de copiar el estado
+        (con el diario bloqueado), de modo que los cambios posteriores no se
+        pierden. Solo un proceso compacta a la vez.
+        """
+        with _bloqueo(self.archivo_bloqueo_compactacion, esperar=False) as tomado:
+            if not tomado:
+                return
+            with self._bloqueo_diario():
+                self._ponerse_al_dia()
+                if os.path.exists(self.diario_compactando):
+                    # Una compactación anterior quedó a medias; sus cambios ya
+                    # están aplicados y el diario actual la continúa
+                    pass
+                elif self._firma_diario is not None:
+                    os.replace(self.diario, self.diario_compactando)
+                    self._crear_diario()
+                else:
+                    return
+                filas = list(self._filas.values())
+
+            self._escribir_instantanea(filas)
+            os.remove(self.diario_compactando)
+
+    def _escribir_instantanea(self, filas):
+        """Reescribe el archivo JSON completo de forma atómica"""
+        directorio = os.path.dirname(self.archivo)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        temporal = f"{self.archivo}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(filas, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, self.archivo)
+
+
+class AlmacenamientoSQLite:
+    """
+    Tabla SQLite con escrituras de una fila y C.I. único
+
+    Los triggers anotan cada alta, modificación o baja en la tabla cambios;
+    cada proceso recuerda el último cambio aplicado y PRAGMA data_version
+    le indica, sin leer tablas, si otra conexión escribió desde entonces.
+    """
+
+    def __init__(self, db_file='config/empleados.db', migrar_desde=None):
+        """
+        Args:
+            db_file: Ruta de la base SQLite
+            migrar_desde: Archivo JSON anterior; si existe y la tabla está
+                          vacía se importa y se renombra a *.migrado
+        """
+        self.db_file = db_file
+        self.migrar_desde = migrar_desde
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        # Último cambio aplicado y data_version de la conexión en ese momento
+        self._seq = 0
+        self._data_version = None
+        self._pendiente = False
+
+    def _conectar(self):
+        """Retorna la conexión, creando el esquema y migrando la primera vez"""
+        # Tras un fork (workers de gunicorn con --preload) la conexión heredada no se usa
+        if self._conn is None or self._pid != os.getpid():
+            directorio = os.path.dirname(self.db_file)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            conn = sqlite3.connect(self.db_file, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(ESQUEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+            self._data_version = None
+            self._migrar()
+        return self._conn
+
+    def _migrar(self):
+        """Importa el archivo JSON anterior en una sola transacción"""
+        if not self.migrar_desde:
+            return
+        anterior = AlmacenamientoJSON(self.migrar_desde)
+        archivos = [ruta for ruta in (anterior.archivo, anterior.diario_compactando, anterior.diario)
+                    if os.path.exists(ruta)]
+        if not archivos:
+            return
+        if self._conn.execute("SELECT 1 FROM empleados LIMIT 1").fetchone():
+            return
+        # Instantánea más diario, sin disparar una compactación
+        with anterior._lock:
+            anterior._recargar()
+            filas = list(anterior._filas.values())
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO empleados (id, nombre_completo, ci, cargo, fecha_ingreso, sueldo) "
+                "VALUES (:id, :nombre_completo, :ci, :cargo, :fecha_ingreso, :sueldo)",
+                filas
+            )
+        # Se conservan como respaldo, pero no se vuelven a importar
+        for ruta in archivos:
+            os.replace(ruta, ruta + '.migrado')
+
+    def _ultimo_cambio(self, conn):
+        return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM cambios").fetchone()[0]
+
+    def cargar(self):
+        """
+        Lee todos los empleados
+
+        Returns:
+            list: Diccionarios de empleados en orden de registro
+        """
+        with self._lock:
+            conn = self._conectar()
+            self._data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            conn.execute("BEGIN")
+            try:
+                self._seq = self._ultimo_cambio(conn)
+                filas = [dict(zip(CAMPOS, fila)) for fila in conn.execute(f"{SELECCION} ORDER BY rowid")]
+            finally:
+                conn.commit()
+            self._pendiente = False
+            return filas
+
+    def cambios(self):
+        """
+        Lee los empleados que otros procesos modificaron
+
+        Returns:
+            tuple: (False, [(id, fila o None si se eliminó), ...]) o
+                   (True, todas las filas) si el registro de cambios ya no
+                   alcanza para ponerse al día
+        """
+        with self._lock:
+            conn = self._conectar()
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version and not self._pendiente:
+                return False, []
+            self._data_version = data_version
+            self._pendiente = False
+
+            conn.execute("BEGIN")
+            try:
+                minimo, maximo = conn.execute("SELECT MIN(seq), MAX(seq) FROM cambios").fetchone()
+                maximo = maximo or 0
+                if maximo == self._seq:
+                    return False, []
+                if maximo < self._seq or minimo > self._seq + 1:
+                    # Faltan cambios ya recortados (o la base se recreó)
+                    self._seq = maximo
+                    return True, [dict(zip(CAMPOS, fila)) for fila in conn.execute(f"{SELECCION} ORDER BY rowid")]
+
+                ids = [id_empleado for (id_empleado,) in conn.execute(
+                    "SELECT DISTINCT id_empleado FROM cambios WHERE seq > ?", (self._seq,))]
+                filas = {fila[0]: dict(zip(CAMPOS, fila)) for fila in conn.execute(
+                    f"{SELECCION} WHERE id IN (SELECT id_empleado FROM cambios WHERE seq > ?)", (self._seq,))}
+                self._seq = maximo
+                return False, [(id_empleado, filas.get(id_empleado)) for id_empleado in ids]
+            finally:
+                conn.commit()
+
+    def generacion(self):
+        """Identifica el contenido aplicado; es igual en todos los procesos al día"""
+        with self._lock:
+            return str(self._seq)
+
+    def _escribir(self, sql, parametros, varias=False):
+        """
+        Ejecuta una escritura en su propia transacción
+
+        Si nadie más escribió desde el último cambio aplicado, el propio
+        cambio se da por aplicado; si no, cambios() los leerá todos.
+
+        Returns:
+            int: Filas afectadas
+        """
+        with self._lock:
+            conn = self._conectar()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    previo = self._ultimo_cambio(conn)
+                    if varias:
+                        afectadas = conn.executemany(sql, parametros).rowcount
+                    else:
+                        afectadas = conn.execute(sql, parametros).rowcount
+                    ultimo = self._ultimo_cambio(conn)
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+            except sqlite3.IntegrityError as e:
+                raise ConflictoEmpleado(str(e)) from e
+            if previo == self._seq:
+                self._seq = ultimo
+            else:
+                self._pendiente = True
+            return afectadas
+
+    def insertar(self, fila):
+        """Agrega un empleado"""
+        self.insertar_lote([fila])
+
+    def insertar_lote(self, filas):
+        """Agrega varios empleados en una sola transacción"""
+        self._escribir(INSERCION, filas, varias=True)
+
+    @contextmanager
+    def importacion(self):
+        """
+        Alta de empleados por bloques que se confirma toda junta al salir
+
+        Cada bloque se inserta al recibirlo dentro de una misma transacción;
+        si hay una excepción se deshace completa.
+
+        Yields:
+            Función que recibe una lista de filas y las agrega
+        """
+        with self._lock:
+            conn = self._conectar()
+
+            def insertar(filas):
+                try:
+                    conn.executemany(INSERCION, filas)
+                except sqlite3.IntegrityError as e:
+                    raise ConflictoEmpleado(str(e)) from e
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                previo = self._ultimo_cambio(conn)
+                yield insertar
+                ultimo = self._ultimo_cambio(conn)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            if previo == self._seq:
+                self._seq = ultimo
+            else:
+                self._pendiente = True
+
+    def actualizar(self, fila, anterior=None):
+        """
+        Reemplaza los datos de un empleado existente
+
+        Args:
+            fila: Datos nuevos
+            anterior: Datos sobre los que se hizo el cambio; si otro proceso
+                      los modificó entretanto se rechaza la escritura
+        """
+        sql = ("UPDATE empleados SET nombre_completo = :nombre_completo, ci = :ci, cargo = :cargo, "
+               "fecha_ingreso = :fecha_ingreso, sueldo = :sueldo WHERE id = :id")
+        parametros = dict(fila)
+        if anterior is not None:
+            sql += "".join(f" AND {campo} = :anterior_{campo}" for campo in CAMPOS[1:])
+            parametros.update({f"anterior_{campo}": anterior[campo] for campo in CAMPOS[1:]})
+        if not self._escribir(sql, parametros):
+            raise ConflictoEmpleado(f"El empleado {fila['id']} fue modificado o eliminado por otro proceso")
+
+    def eliminar(self, id_empleado):
+        """Elimina un empleado"""
+        if not self._escribir("DELETE FROM empleados WHERE id = ?", (id_empleado,)):
+            raise ConflictoEmpleado(f"El empleado {id_empleado} fue eliminado por otro proceso")
+
+
+def crear_almacenamiento(archivo='config/empleados.json', backend=BACKEND):
+    """
+    Crea el backend configurado
+
+    Args:
+        archivo: Ruta del archivo JSON; la base SQLite usa el mismo nombre con extensión .db
+        backend: 'sqlite' o 'json'
+    """
+    if backend == 'json':
+        return AlmacenamientoJSON(archivo)
+    if backend == 'sqlite':
+        return AlmacenamientoSQLite(os.path.splitext(archivo)[0] + '.db', migrar_desde=archivo)
+    raise ValueError(f"Backend de empleados desconocido: {backend}")
@@ -4,22 +4,28 @@ Modelo para boleta de aguinaldo
 
 from datetime import datetime
 
-class BoletaAguinaldo:
-    def __init__(self):
-        self.nombre_completo = ""
-        self.ci = ""
-        self.cargo = ""
-        self.anio = datetime.now().year
-        self.fecha_inicio = ""  # Formato: dd/mm/yyyy
-        self.fecha_fin = ""     # Formato: dd/mm/yyyy
-        self.fecha_ingreso = ""
-        self.promedio_ultimos_3_pagos = 0.0
-        self.otros = 0.0
+from models.campos import Campo, Modelo, nombres, anio_actual
+
+class BoletaAguinaldo(Modelo):
+    """Boleta de aguinaldo; ver Modelo para el constructor"""
+    
+    CAMPOS = (
+        Campo('nombre_completo', str, ""),
+        Campo('ci', str, ""),
+        Campo('cargo', str, ""),
+        Campo('anio', int, anio_actual),
+        Campo('fecha_inicio', str, ""),  # Formato: dd/mm/yyyy
+        Campo('fecha_fin', str, ""),     # Formato: dd/mm/yyyy
+        Campo('fecha_ingreso', str, ""),
+        Campo('promedio_ultimos_3_pagos', float, 0.0),
+        Campo('otros', float, 0.0),
         
         # Número de boleta
-        self.numero_boleta = ""
-        self.fecha_emision = datetime.now()
-        self.metodo_pago = "EFECTIVO"  # Por defecto EFECTIVO
+        Campo('numero_boleta', str, ""),
+        Campo('fecha_emision', datetime, datetime.now),
+        Campo('metodo_pago', str, "EFECTIVO"),  # Por defecto EFECTIVO
+    )
+    __slots__ = nombres(CAMPOS)
     
     def calcular_liquido_pagable(self):
         """Calcula el líquido pagable"""
@@ -61,3 +67,13 @@ class BoletaAguinaldo:
             "fecha_emision": self.fecha_emision.strftime("%d/%m/%Y"),
             "metodo_pago": self.metodo_pago
         }
+    
+    @classmethod
+    def from_dict(cls, datos):
+        """
+        Crea la boleta a partir de un diccionario generado por to_dict()
+        
+        Los totales calculados del diccionario se ignoran: se vuelven a
+        calcular a partir de los montos.
+        """
+        return cls.from_payload(datos)
@@ -4,37 +4,43 @@ Modelo para boleta de liquidación
 
 from datetime import datetime
 
-class BoletaLiquidacion:
-    def __init__(self):
+from models.campos import Campo, Modelo, nombres
+
+class BoletaLiquidacion(Modelo):
+    """Boleta de liquidación; ver Modelo para el constructor"""
+    
+    CAMPOS = (
         # Datos generales del trabajador
-        self.nombre_completo = ""
-        self.ci = ""
-        self.domicilio_trabajador = ""
-        self.cargo = ""
+        Campo('nombre_completo', str, ""),
+        Campo('ci', str, ""),
+        Campo('domicilio_trabajador', str, ""),
+        Campo('cargo', str, ""),
         
         # Fechas
-        self.fecha_ingreso = ""  # dd/mm/yyyy
-        self.fecha_retiro = ""   # dd/mm/yyyy
+        Campo('fecha_ingreso', str, ""),  # dd/mm/yyyy
+        Campo('fecha_retiro', str, ""),   # dd/mm/yyyy
         
         # Remuneraciones
-        self.promedio_ultimos_3_sueldos = 0.0
-        self.ultimo_sueldo = 0.0
+        Campo('promedio_ultimos_3_sueldos', float, 0.0),
+        Campo('ultimo_sueldo', float, 0.0),
         
         # Beneficios sociales
-        self.indemnizacion = 0.0
-        self.aguinaldo = 0.0
-        self.vacaciones = 0.0
-        self.otros_beneficios = 0.0
+        Campo('indemnizacion', float, 0.0),
+        Campo('aguinaldo', float, 0.0),
+        Campo('vacaciones', float, 0.0),
+        Campo('otros_beneficios', float, 0.0),
         
         # Deducciones
-        self.anticipos = 0.0
-        self.prestamos = 0.0
-        self.otras_deducciones = 0.0
+        Campo('anticipos', float, 0.0),
+        Campo('prestamos', float, 0.0),
+        Campo('otras_deducciones', float, 0.0),
         
         # Número de boleta
-        self.numero_boleta = ""
-        self.fecha_emision = datetime.now()
-        self.metodo_pago = "EFECTIVO"  # Por defecto EFECTIVO
+        Campo('numero_boleta', str, ""),
+        Campo('fecha_emision', datetime, datetime.now),
+        Campo('metodo_pago', str, "EFECTIVO"),  # Por defecto EFECTIVO
+    )
+    __slots__ = nombres(CAMPOS)
     
     def calcular_tiempo_servicio(self):
         """Calcula años, meses y días de servicio"""
@@ -99,3 +105,13 @@ class BoletaLiquidacion:
             "fecha_emision": self.fecha_emision.strftime("%d/%m/%Y"),
             "metodo_pago": self.metodo_pago
         }
+    
+    @classmethod
+    def from_dict(cls, datos):
+        """
+        Crea la boleta a partir de un diccionario generado por to_dict()
+        
+        Los totales calculados del diccionario se ignoran: se vuelven a
+        calcular a partir de los montos.
+        """
+        return cls.from_payload(datos)
@@ -4,31 +4,37 @@ Modelo para boleta de pago mensual
 
 from datetime import datetime
 
-class BoletaMensual:
-    def __init__(self):
-        self.nombre_completo = ""
-        self.ci = ""
-        self.cargo = ""
-        self.mes_pago = ""
-        self.anio = datetime.now().year
-        self.rango_fechas = ""  # Opcional: "01/01/2025 al 31/01/2025"
+from models.campos import Campo, Modelo, nombres, anio_actual
+
+class BoletaMensual(Modelo):
+    """Boleta de pago mensual; ver Modelo para el constructor"""
+    
+    CAMPOS = (
+        Campo('nombre_completo', str, ""),
+        Campo('ci', str, ""),
+        Campo('cargo', str, ""),
+        Campo('mes_pago', str, ""),
+        Campo('anio', int, anio_actual),
+        Campo('rango_fechas', str, ""),  # Opcional: "01/01/2025 al 31/01/2025"
         
         # Ingresos
-        self.haber_basico = 0.0
-        self.horas_extra = 0.0
-        self.bono_antiguedad = 0.0
-        self.otros_ingresos = 0.0
+        Campo('haber_basico', float, 0.0),
+        Campo('horas_extra', float, 0.0),
+        Campo('bono_antiguedad', float, 0.0),
+        Campo('otros_ingresos', float, 0.0),
         
         # Egresos
-        self.faltas = 0.0
-        self.retrasos = 0.0
-        self.reposiciones = 0.0
-        self.otros_egresos = 0.0
+        Campo('faltas', float, 0.0),
+        Campo('retrasos', float, 0.0),
+        Campo('reposiciones', float, 0.0),
+        Campo('otros_egresos', float, 0.0),
         
         # Número de boleta
-        self.numero_boleta = ""
-        self.fecha_emision = datetime.now()
-        self.metodo_pago = "EFECTIVO"  # Por defecto EFECTIVO
+        Campo('numero_boleta', str, ""),
+        Campo('fecha_emision', datetime, datetime.now),
+        Campo('metodo_pago', str, "EFECTIVO"),  # Por defecto EFECTIVO
+    )
+    __slots__ = nombres(CAMPOS)
     
     def calcular_total_ingresos(self):
         """Calcula el total de ingresos"""
@@ -68,3 +74,13 @@ class BoletaMensual:
             "fecha_emision": self.fecha_emision.strftime("%d/%m/%Y"),
             "metodo_pago": self.metodo_pago
         }
+    
+    @classmethod
+    def from_dict(cls, datos):
+        """
+        Crea la boleta a partir de un diccionario generado por to_dict()
+        
+        Los totales calculados del diccionario se ignoran: se vuelven a
+        calcular a partir de los montos.
+        """
+        return cls.from_payload(datos)
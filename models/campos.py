@@ -0,0 +1,109 @@
+"""
+Campos tipados de los modelos
+Cada modelo declara sus campos con tipo y valor por defecto; los valores se
+guardan en __slots__ (sin un __dict__ por instancia, que es lo que más pesa
+al tener en memoria la planilla completa o un lote de boletas) y el
+constructor los convierte y valida
+"""
+
+import math
+from datetime import datetime
+
+FORMATO_FECHA = "%d/%m/%Y"
+
+
+class Campo:
+    """Campo de un modelo: nombre, tipo (str, int, float o datetime) y valor por defecto"""
+
+    __slots__ = ('nombre', 'tipo', 'defecto')
+
+    def __init__(self, nombre, tipo, defecto):
+        """
+        Args:
+            nombre: Nombre del atributo
+            tipo: str, int, float o datetime
+            defecto: Valor por defecto, o función sin argumentos que lo genera
+        """
+        self.nombre = nombre
+        self.tipo = tipo
+        self.defecto = defecto
+
+    def valor_defecto(self):
+        """Retorna el valor por defecto del campo"""
+        return self.defecto() if callable(self.defecto) else self.defecto
+
+    def convertir(self, valor):
+        """
+        Convierte un valor recibido (por ejemplo, de un JSON) al tipo del campo
+
+        Las fechas se aceptan como datetime o como texto dd/mm/aaaa.
+
+        Raises:
+            ValueError: Si el valor no es del tipo del campo
+        """
+        if self.tipo is str:
+            return '' if valor is None else str(valor)
+        if self.tipo is datetime:
+            if isinstance(valor, datetime):
+                return valor
+            try:
+                return datetime.strptime(valor, FORMATO_FECHA)
+            except (TypeError, ValueError):
+                raise ValueError(f"Valor inválido para {self.nombre}: '{valor}' (use dd/mm/aaaa)")
+        try:
+            convertido = self.tipo(valor)
+        except (TypeError, ValueError):
+            convertido = None
+        if convertido is None or (self.tipo is float and not math.isfinite(convertido)):
+            raise ValueError(f"Valor inválido para {self.nombre}: '{valor}'")
+        return convertido
+
+
+def anio_actual():
+    """Año en curso, valor por defecto de las boletas"""
+    return datetime.now().year
+
+
+def nombres(campos):
+    """Nombres de los campos, para declarar __slots__"""
+    return tuple(campo.nombre for campo in campos)
+
+
+class Modelo:
+    """
+    Base de los modelos de boletas
+
+    Las subclases definen CAMPOS (tupla de Campo) y __slots__ = nombres(CAMPOS).
+    """
+
+    __slots__ = ()
+    CAMPOS = ()
+
+    def __init__(self, **valores):
+        """
+        Crea el modelo con los valores indicados; los demás campos toman su valor por defecto
+
+        Raises:
+            ValueError: Si hay campos desconocidos o valores inválidos
+        """
+        for campo in self.CAMPOS:
+            if campo.nombre in valores:
+                setattr(self, campo.nombre, campo.convertir(valores.pop(campo.nombre)))
+            else:
+                setattr(self, campo.nombre, campo.valor_defecto())
+        if valores:
+            raise ValueError(f"Campos desconocidos para {type(self).__name__}: {', '.join(sorted(valores))}")
+
+    @classmethod
+    def from_payload(cls, datos):
+        """
+        Crea el modelo a partir de un diccionario (datos de un formulario o to_dict())
+
+        Se toman solo los campos del modelo; las demás claves (opciones de la
+        petición, totales calculados) se ignoran.
+        """
+        return cls(**{campo.nombre: datos[campo.nombre] for campo in cls.CAMPOS if campo.nombre in datos})
+
+    def __repr__(self):
+        valores = ', '.join(f"{campo.nombre}={getattr(self, campo.nombre)!r}" for campo in self.CAMPOS)
+        return f"{type(self).__name__}({valores})"
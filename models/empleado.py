@@ -3,13 +3,45 @@ Modelo de Empleado
 Gestiona los datos de los empleados registrados
 """
 
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime
-import json
-import os
+import threading
+
+from models.campos import Campo, nombres
+from models.almacenamiento_empleados import crear_almacenamiento, ConflictoEmpleado, CAMPOS
+from models.indice_busqueda import IndiceTrigramas
+from models.importacion import validar_fila
+
+# Máximo de errores por fila que se detallan en el resultado de una importación
+MAX_ERRORES_IMPORTACION = 1000
+
+# Intentos de alta cuando otro worker generó el mismo ID
+MAX_REINTENTOS_ID = 10
+
+# Filas válidas que se guardan juntas durante una importación
+BLOQUE_IMPORTACION = 1000
+
+
+class ImportacionCancelada(Exception):
+    """Una importación completa o nada tuvo filas con errores"""
+
 
 class Empleado:
     """Clase para gestionar empleados"""
     
+    CAMPOS = (
+        Campo('id', int, None),
+        Campo('nombre_completo', str, ''),
+        Campo('ci', str, ''),
+        Campo('cargo', str, ''),
+        Campo('fecha_ingreso', str, ''),
+        Campo('sueldo', float, 0.0),
+    )
+    # Sin __dict__ por instancia: la planilla completa vive en memoria
+    __slots__ = nombres(CAMPOS)
+    
+    _ultimo_id = 0
+    
     def __init__(self, nombre_completo, ci, cargo, fecha_ingreso, sueldo, id_empleado=None):
         """
         Inicializa un empleado
@@ -21,17 +53,19 @@ class Empleado:
             fecha_ingreso: Fecha de ingreso (dd/mm/aaaa)
             sueldo: Sueldo actual
             id_empleado: ID único del empleado
+        
+        Raises:
+            ValueError: Si el sueldo o el ID no son numéricos
         """
-        self.id = id_empleado or self._generar_id()
-        self.nombre_completo = nombre_completo
-        self.ci = ci
-        self.cargo = cargo
-        self.fecha_ingreso = fecha_ingreso
-        self.sueldo = float(sueldo)
+        valores = (id_empleado or self._generar_id(), nombre_completo, ci, cargo, fecha_ingreso, sueldo)
+        for campo, valor in zip(self.CAMPOS, valores):
+            setattr(self, campo.nombre, campo.convertir(valor))
     
     def _generar_id(self):
-        """Genera un ID único basado en timestamp"""
-        return int(datetime.now().timestamp() * 1000)
+        """Genera un ID único basado en timestamp (creciente dentro del proceso)"""
+        # Dos altas en el mismo milisegundo no deben compartir ID
+        Empleado._ultimo_id = max(int(datetime.now().timestamp() * 1000), Empleado._ultimo_id + 1)
+        return Empleado._ultimo_id
     
     def to_dict(self):
         """Convierte el empleado a diccionario"""
@@ -60,45 +94,91 @@ class Empleado:
 class EmpleadoManager:
     """Gestor de empleados"""
     
-    def __init__(self, archivo='config/empleados.json'):
+    def __init__(self, archivo='config/empleados.json', almacenamiento=None):
         """
         Inicializa el gestor
         
         Args:
-            archivo: Ruta del archivo JSON para almacenar empleados
+            archivo: Ruta del archivo JSON de empleados (con el backend SQLite
+                     se migra a una base con el mismo nombre y extensión .db)
+            almacenamiento: Backend de almacenamiento (por defecto, el configurado
+                            en BOLETAS_EMPLEADOS_BACKEND)
         """
         self.archivo = archivo
-        self._crear_directorio()
-        self.empleados = self._cargar_empleados()
-    
-    def _crear_directorio(self):
-        """Crea el directorio si no existe"""
-        directorio = os.path.dirname(self.archivo)
-        if directorio and not os.path.exists(directorio):
-            os.makedirs(directorio)
+        self.almacenamiento = almacenamiento or crear_almacenamiento(archivo)
+        self._lock = threading.RLock()
+        # Índices en memoria: búsquedas por ID y por C.I. en tiempo constante
+        self._por_id = {}
+        self._por_ci = {}
+        # IDs ordenados para paginar por cursor
+        self._ids = []
+        # Índice de trigramas para la búsqueda por nombre o C.I.
+        self.indice = IndiceTrigramas()
+        self._cargar_empleados()
     
     def _cargar_empleados(self):
-        """Carga los empleados desde el archivo"""
-        if os.path.exists(self.archivo):
-            try:
-                with open(self.archivo, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return [Empleado.from_dict(emp) for emp in data]
-            except Exception as e:
-                print(f"Error al cargar empleados: {e}")
-                return []
-        return []
+        """Carga los empleados desde el almacenamiento"""
+        try:
+            filas = self.almacenamiento.cargar()
+        except Exception as e:
+            print(f"Error al cargar empleados: {e}")
+            filas = []
+        self._reemplazar(filas)
     
-    def _guardar_empleados(self):
-        """Guarda los empleados en el archivo"""
+    def _reemplazar(self, filas):
+        """Reconstruye los índices en memoria con la planilla completa"""
+        self._por_id = {}
+        self._por_ci = {}
+        self._ids = []
+        self.indice.limpiar()
+        for fila in filas:
+            self._indexar(Empleado.from_dict(fila))
+        # Una importación masiva (o el alta en otro worker) asigna IDs por
+        # delante del reloj: los nuevos IDs de este proceso deben quedar por
+        # encima de los ya guardados
+        if self._ids:
+            Empleado._ultimo_id = max(Empleado._ultimo_id, self._ids[-1])
+    
+    def _sincronizar(self):
+        """
+        Aplica los cambios que otros procesos guardaron en el almacenamiento
+        
+        Si nadie escribió, el backend lo resuelve sin leer la planilla (un
+        stat del diario o PRAGMA data_version). Se llama con el lock tomado.
+        """
         try:
-            with open(self.archivo, 'w', encoding='utf-8') as f:
-                data = [emp.to_dict() for emp in self.empleados]
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            return True
+            completo, filas = self.almacenamiento.cambios()
         except Exception as e:
-            print(f"Error al guardar empleados: {e}")
-            return False
+            print(f"Error al sincronizar empleados: {e}")
+            return
+        if completo:
+            self._reemplazar(filas)
+            return
+        for id_empleado, fila in filas:
+            emp = self._por_id.get(id_empleado)
+            if emp is not None:
+                self._desindexar(emp)
+            if fila is not None:
+                self._indexar(Empleado.from_dict(fila))
+                Empleado._ultimo_id = max(Empleado._ultimo_id, id_empleado)
+    
+    def _indexar(self, empleado):
+        """Registra un empleado en los índices en memoria"""
+        if empleado.id not in self._por_id:
+            insort(self._ids, empleado.id)
+        self._por_id[empleado.id] = empleado
+        self._por_ci[empleado.ci] = empleado
+        self.indice.agregar(empleado.id, empleado.nombre_completo, empleado.ci)
+    
+    def _desindexar(self, empleado):
+        """Quita un empleado de los índices en memoria"""
+        if self._por_id.pop(empleado.id, None) is not None:
+            posicion = bisect_left(self._ids, empleado.id)
+            if posicion < len(self._ids) and self._ids[posicion] == empleado.id:
+                del self._ids[posicion]
+        if self._por_ci.get(empleado.ci) is empleado:
+            del self._por_ci[empleado.ci]
+        self.indice.quitar(empleado.id)
     
     def agregar_empleado(self, empleado):
         """
@@ -110,14 +190,149 @@ class EmpleadoManager:
         Returns:
             bool: True si se agregó correctamente
         """
-        # Verificar si ya existe un empleado con el mismo CI
-        if any(emp.ci == empleado.ci for emp in self.empleados):
-            return False, "Ya existe un empleado con ese C.I."
-        
-        self.empleados.append(empleado)
-        if self._guardar_empleados():
+        with self._lock:
+            self._sincronizar()
+            # Verificar si ya existe un empleado con el mismo CI
+            if empleado.ci in self._por_ci:
+                return False, "Ya existe un empleado con ese C.I."
+            
+            for _ in range(MAX_REINTENTOS_ID):
+                try:
+                    self.almacenamiento.insertar(empleado.to_dict())
+                    break
+                except ConflictoEmpleado:
+                    # Otro proceso registró el mismo C.I. o, en el mismo
+                    # milisegundo, el mismo ID
+                    self._sincronizar()
+                    if empleado.ci in self._por_ci or empleado.id not in self._por_id:
+                        return False, "Ya existe un empleado con ese C.I."
+                    # Tras sincronizar, el nuevo ID queda por encima de los conocidos
+                    empleado.id = empleado._generar_id()
+                except Exception as e:
+                    print(f"Error al guardar empleados: {e}")
+                    return False, "Error al guardar el empleado"
+            else:
+                return False, "Error al guardar el empleado"
+            
+            self._indexar(empleado)
             return True, "Empleado registrado exitosamente"
-        return False, "Error al guardar el empleado"
+    
+    def importar_empleados(self, filas, parcial=True, solo_validar=False):
+        """
+        Importa empleados guardándolos por bloques a medida que se leen
+        
+        Con parcial=True cada bloque de BLOQUE_IMPORTACION filas válidas se
+        guarda por separado. Si no, los bloques se escriben dentro de una
+        misma importación del almacenamiento que solo se confirma si ninguna
+        fila tuvo errores.
+        
+        Args:
+            filas: Iterable de (número de fila, diccionario de campos), como
+                   los que produce models.importacion.leer_planilla
+            parcial: Si es False, cualquier error cancela toda la importación
+            solo_validar: Valida sin guardar
+            
+        Returns:
+            dict: Filas leídas, importados, errores (hasta MAX_ERRORES_IMPORTACION,
+                  con número de fila) y total de errores
+        """
+        with self._lock:
+            self._sincronizar()
+            resultado = {'filas': 0, 'importados': 0, 'validos': 0, 'errores': [], 'total_errores': 0}
+            
+            if solo_validar:
+                self._leer_importacion(filas, resultado, None)
+            elif parcial:
+                self._leer_importacion(filas, resultado, lambda bloque: self._guardar_bloque(bloque, resultado))
+            else:
+                escritos = []
+                
+                def guardar(bloque):
+                    # Tras el primer error la importación se cancela: no vale la pena escribir más
+                    if resultado['total_errores']:
+                        return
+                    insertar([emp.to_dict() for _, emp in bloque])
+                    for _, emp in bloque:
+                        self._indexar(emp)
+                        escritos.append(emp.id)
+                
+                try:
+                    with self.almacenamiento.importacion() as insertar:
+                        self._leer_importacion(filas, resultado, guardar)
+                        if resultado['total_errores']:
+                            raise ImportacionCancelada()
+                except (ImportacionCancelada, ConflictoEmpleado) as e:
+                    for id_empleado in escritos:
+                        self._desindexar(self._por_id[id_empleado])
+                    self._sincronizar()
+                    if isinstance(e, ConflictoEmpleado):
+                        # Otro proceso registró alguno de los C.I. durante la importación
+                        raise ValueError(f"La importación se canceló por un conflicto: {e}")
+                else:
+                    resultado['importados'] = len(escritos)
+            
+            return resultado
+    
+    def _leer_importacion(self, filas, resultado, guardar):
+        """
+        Valida las filas de una importación y entrega las válidas por bloques
+        
+        Args:
+            filas: Iterable de (número de fila, diccionario de campos)
+            resultado: Diccionario de resultado que se va completando
+            guardar: Función que recibe cada bloque de (número de fila, Empleado),
+                     o None para solo validar
+        """
+        vistos = set()
+        bloque = []
+        for numero, fila in filas:
+            resultado['filas'] += 1
+            try:
+                datos = validar_fila(fila)
+                # C.I. único contra la planilla y contra el propio archivo
+                if datos['ci'] in self._por_ci or datos['ci'] in vistos:
+                    raise ValueError(f"Ya existe un empleado con el C.I. {datos['ci']}")
+            except ValueError as e:
+                resultado['total_errores'] += 1
+                if len(resultado['errores']) < MAX_ERRORES_IMPORTACION:
+                    resultado['errores'].append({'fila': numero, 'ci': str(fila.get('ci') or ''), 'message': str(e)})
+                continue
+            vistos.add(datos['ci'])
+            resultado['validos'] += 1
+            empleado = Empleado(**datos)
+            if guardar is None:
+                continue
+            bloque.append((numero, empleado))
+            if len(bloque) >= BLOQUE_IMPORTACION:
+                guardar(bloque)
+                bloque = []
+        if bloque:
+            guardar(bloque)
+    
+    def _guardar_bloque(self, bloque, resultado):
+        """
+        Guarda un bloque de una importación parcial
+        
+        Si otro proceso registró alguno de los C.I. mientras tanto, las filas
+        del bloque se dan de alta una por una y las repetidas quedan como errores.
+        """
+        try:
+            self.almacenamiento.insertar_lote(emp.to_dict() for _, emp in bloque)
+        except ConflictoEmpleado:
+            self._sincronizar()
+            for numero, emp in bloque:
+                agregado, mensaje = self.agregar_empleado(emp)
+                if agregado:
+                    resultado['importados'] += 1
+                    continue
+                resultado['validos'] -= 1
+                resultado['total_errores'] += 1
+                if len(resultado['errores']) < MAX_ERRORES_IMPORTACION:
+                    resultado['errores'].append({'fila': numero, 'ci': emp.ci, 'message': mensaje})
+            return
+        for _, emp in bloque:
+            self._indexar(emp)
+        resultado['importados'] += len(bloque)
     
     def obtener_empleados(self):
         """
@@ -126,7 +341,60 @@ class EmpleadoManager:
         Returns:
             list: Lista de diccionarios con los datos de empleados
         """
-        return [emp.to_dict() for emp in self.empleados]
+        with self._lock:
+            self._sincronizar()
+            empleados = list(self._por_id.values())
+        return [emp.to_dict() for emp in empleados]
+    
+    def huella(self):
+        """
+        Identifica el contenido actual de la planilla (para ETag)
+        
+        Depende solo de lo persistido, por lo que coincide en todos los
+        workers que están al día.
+        """
+        with self._lock:
+            self._sincronizar()
+            return self.almacenamiento.generacion()
+    
+    def listar_empleados(self, limite=None, cursor=None, campos=None):
+        """
+        Obtiene una página de empleados ordenados por ID
+        
+        Args:
+            limite: Cantidad máxima de empleados (None = todos, en orden de registro)
+            cursor: Valor 'siguiente' de la página anterior (None = primera página)
+            campos: Campos a incluir en cada empleado (None = todos)
+            
+        Returns:
+            tuple: (lista de empleados, cursor de la página siguiente o None)
+        """
+        self._validar_campos(campos)
+        with self._lock:
+            self._sincronizar()
+            if limite is None and cursor is None:
+                empleados = list(self._por_id.values())
+                siguiente = None
+            else:
+                inicio = bisect_right(self._ids, int(cursor)) if cursor else 0
+                fin = len(self._ids) if limite is None else inicio + limite
+                empleados = [self._por_id[i] for i in self._ids[inicio:fin]]
+                siguiente = str(empleados[-1].id) if empleados and fin < len(self._ids) else None
+        return [self._proyectar(emp, campos) for emp in empleados], siguiente
+    
+    def _validar_campos(self, campos):
+        """Verifica que los campos pedidos existan"""
+        if campos is not None:
+            desconocidos = [campo for campo in campos if campo not in CAMPOS]
+            if desconocidos:
+                raise ValueError(f"Campos desconocidos: {', '.join(desconocidos)}")
+    
+    def _proyectar(self, empleado, campos):
+        """Diccionario del empleado con solo los campos pedidos"""
+        datos = empleado.to_dict()
+        if campos is None:
+            return datos
+        return {campo: datos[campo] for campo in campos}
     
     def obtener_empleado_por_id(self, id_empleado):
         """
@@ -138,10 +406,10 @@ class EmpleadoManager:
         Returns:
             dict: Datos del empleado o None si no existe
         """
-        for emp in self.empleados:
-            if emp.id == id_empleado:
-                return emp.to_dict()
-        return None
+        with self._lock:
+            self._sincronizar()
+            emp = self._por_id.get(id_empleado)
+        return emp.to_dict() if emp else None
     
     def obtener_empleado_por_ci(self, ci):
         """
@@ -153,10 +421,10 @@ class EmpleadoManager:
         Returns:
             dict: Datos del empleado o None si no existe
         """
-        for emp in self.empleados:
-            if emp.ci == ci:
-                return emp.to_dict()
-        return None
+        with self._lock:
+            self._sincronizar()
+            emp = self._por_ci.get(ci)
+        return emp.to_dict() if emp else None
     
     def actualizar_empleado(self, id_empleado, datos):
         """
@@ -169,28 +437,47 @@ class EmpleadoManager:
         Returns:
             tuple: (success, message)
         """
-        for i, emp in enumerate(self.empleados):
-            if emp.id == id_empleado:
-                # Verificar si el CI cambió y ya existe
-                if datos.get('ci') != emp.ci:
-                    if any(e.ci == datos.get('ci') for e in self.empleados if e.id != id_empleado):
-                        return False, "Ya existe un empleado con ese C.I."
-                
-                # Actualizar datos
-                self.empleados[i] = Empleado(
-                    nombre_completo=datos.get('nombre_completo', emp.nombre_completo),
-                    ci=datos.get('ci', emp.ci),
-                    cargo=datos.get('cargo', emp.cargo),
-                    fecha_ingreso=datos.get('fecha_ingreso', emp.fecha_ingreso),
-                    sueldo=datos.get('sueldo', emp.sueldo),
-                    id_empleado=id_empleado
-                )
-                
-                if self._guardar_empleados():
-                    return True, "Empleado actualizado exitosamente"
+        with self._lock:
+            self._sincronizar()
+            emp = self._por_id.get(id_empleado)
+            if emp is None:
+                return False, "Empleado no encontrado"
+            
+            # Verificar si el CI cambió y ya existe
+            if datos.get('ci') != emp.ci:
+                otro = self._por_ci.get(datos.get('ci'))
+                if otro is not None and otro.id != id_empleado:
+                    return False, "Ya existe un empleado con ese C.I."
+            
+            # Actualizar datos
+            nuevo = Empleado(
+                nombre_completo=datos.get('nombre_completo', emp.nombre_completo),
+                ci=datos.get('ci', emp.ci),
+                cargo=datos.get('cargo', emp.cargo),
+                fecha_ingreso=datos.get('fecha_ingreso', emp.fecha_ingreso),
+                sueldo=datos.get('sueldo', emp.sueldo),
+                id_empleado=id_empleado
+            )
+            
+            try:
+                # Solo si nadie lo modificó desde que se leyó
+                self.almacenamiento.actualizar(nuevo.to_dict(), anterior=emp.to_dict())
+            except ConflictoEmpleado:
+                self._sincronizar()
+                actual = self._por_id.get(id_empleado)
+                if actual is None:
+                    return False, "Empleado no encontrado"
+                otro = self._por_ci.get(nuevo.ci)
+                if otro is not None and otro.id != id_empleado:
+                    return False, "Ya existe un empleado con ese C.I."
+                return False, "Otro usuario modificó el empleado; revise los datos e intente nuevamente"
+            except Exception as e:
+                print(f"Error al guardar empleados: {e}")
                 return False, "Error al guardar los cambios"
-        
-        return False, "Empleado no encontrado"
+            
+            self._desindexar(emp)
+            self._indexar(nuevo)
+            return True, "Empleado actualizado exitosamente"
     
     def eliminar_empleado(self, id_empleado):
         """
@@ -202,31 +489,40 @@ class EmpleadoManager:
         Returns:
             tuple: (success, message)
         """
-        for i, emp in enumerate(self.empleados):
-            if emp.id == id_empleado:
-                self.empleados.pop(i)
-                if self._guardar_empleados():
-                    return True, "Empleado eliminado exitosamente"
+        with self._lock:
+            self._sincronizar()
+            emp = self._por_id.get(id_empleado)
+            if emp is None:
+                return False, "Empleado no encontrado"
+            
+            try:
+                self.almacenamiento.eliminar(id_empleado)
+            except ConflictoEmpleado:
+                # Otro proceso ya lo eliminó
+                self._sincronizar()
+                return False, "Empleado no encontrado"
+            except Exception as e:
+                print(f"Error al guardar empleados: {e}")
                 return False, "Error al eliminar el empleado"
-        
-        return False, "Empleado no encontrado"
+            
+            self._desindexar(emp)
+            return True, "Empleado eliminado exitosamente"
     
-    def buscar_empleados(self, termino):
+    def buscar_empleados(self, termino, limite=None, campos=None):
         """
-        Busca empleados por nombre o CI
+        Busca empleados por nombre o CI, sin distinguir acentos ni mayúsculas
         
         Args:
             termino: Término de búsqueda
+            limite: Cantidad máxima de resultados (None = todos)
+            campos: Campos a incluir en cada resultado (None = todos)
             
         Returns:
-            list: Lista de empleados que coinciden
+            list: Lista de empleados que coinciden, los más relevantes primero
         """
-        termino = termino.lower()
-        resultados = []
-        
-        for emp in self.empleados:
-            if (termino in emp.nombre_completo.lower() or 
-                termino in emp.ci.lower()):
-                resultados.append(emp.to_dict())
+        self._validar_campos(campos)
         
-        return resultados
+        with self._lock:
+            self._sincronizar()
+            encontrados = [self._por_id.get(id_empleado) for id_empleado in self.indice.buscar(termino, limite)]
+        return [self._proyectar(emp, campos) for emp in encontrados if emp is not None]
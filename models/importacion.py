@@ -0,0 +1,177 @@
+"""
+Importación masiva de empleados
+Lee planillas CSV o XLSX fila por fila (sin cargar el archivo completo en
+memoria) y entrega diccionarios con las columnas reconocidas
+
+XLSX requiere openpyxl; se importa solo al leer un archivo de ese tipo.
+"""
+
+import csv
+import io
+import math
+import re
+from datetime import date, datetime
+
+from models.indice_busqueda import normalizar
+
+# Encabezados aceptados (normalizados) por campo del empleado
+ENCABEZADOS = {
+    'nombre_completo': ('nombre_completo', 'nombre completo', 'nombre', 'nombres y apellidos', 'empleado'),
+    'ci': ('ci', 'c.i.', 'c.i', 'cedula', 'cedula de identidad', 'carnet'),
+    'cargo': ('cargo', 'puesto'),
+    'fecha_ingreso': ('fecha_ingreso', 'fecha de ingreso', 'ingreso', 'fecha ingreso'),
+    'sueldo': ('sueldo', 'haber basico', 'haber_basico', 'salario'),
+}
+
+FORMATOS = ('csv', 'xlsx')
+
+# Monto con punto de miles y sin decimales: '3.500', '1.250.000'
+MILES_CON_PUNTO = re.compile(r'^-?[1-9]\d{0,2}(\.\d{3})+$')
+
+
+def mapear_encabezados(encabezados):
+    """
+    Relaciona cada columna del archivo con un campo del empleado
+
+    Returns:
+        dict: {posición de la columna: campo}
+
+    Raises:
+        ValueError: Si falta alguna columna obligatoria
+    """
+    alias = {nombre: campo for campo, nombres in ENCABEZADOS.items() for nombre in nombres}
+    columnas = {}
+    for posicion, encabezado in enumerate(encabezados):
+        campo = alias.get(normalizar(encabezado or ''))
+        if campo and campo not in columnas.values():
+            columnas[posicion] = campo
+
+    faltantes = [campo for campo in ENCABEZADOS if campo not in columnas.values()]
+    if faltantes:
+        raise ValueError(f"Faltan columnas: {', '.join(faltantes)}")
+    return columnas
+
+
+def _filas(encabezados, valores):
+    """Convierte las filas de valores en (número de fila, diccionario por campo)"""
+    columnas = mapear_encabezados(encabezados)
+    # La fila 1 es la de encabezados
+    for numero, fila in enumerate(valores, start=2):
+        if not any(valor not in (None, '') for valor in fila):
+            continue
+        yield numero, {campo: fila[posicion] if posicion < len(fila) else None
+                       for posicion, campo in columnas.items()}
+
+
+def leer_csv(archivo):
+    """
+    Lee un CSV separado por comas o punto y coma (UTF-8, con o sin BOM)
+
+    Args:
+        archivo: Archivo binario abierto
+
+    Yields:
+        tuple: (número de fila, valores por campo)
+    """
+    texto = io.TextIOWrapper(archivo, encoding='utf-8-sig', newline='')
+    primera = texto.readline()
+    delimitador = ';' if primera.count(';') > primera.count(',') else ','
+    encabezados = next(csv.reader([primera], delimiter=delimitador), [])
+    yield from _filas(encabezados, csv.reader(texto, delimiter=delimitador))
+
+
+def leer_xlsx(archivo):
+    """
+    Lee la primera hoja de un XLSX en modo de solo lectura (por filas)
+
+    Args:
+        archivo: Archivo binario abierto o ruta
+
+    Yields:
+        tuple: (número de fila, valores por campo)
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Para importar archivos XLSX instale openpyxl")
+
+    libro = load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        filas = libro.worksheets[0].iter_rows(values_only=True)
+        encabezados = next(filas, ())
+        yield from _filas(encabezados, filas)
+    finally:
+        libro.close()
+
+
+def leer_planilla(archivo, formato):
+    """Lee un archivo de empleados según su formato ('csv' o 'xlsx')"""
+    if formato == 'csv':
+        return leer_csv(archivo)
+    if formato == 'xlsx':
+        return leer_xlsx(archivo)
+    raise ValueError(f"Formato no soportado: {formato} (use CSV o XLSX)")
+
+
+def formato_de(nombre_archivo):
+    """Deduce el formato a partir de la extensión del archivo"""
+    return nombre_archivo.rsplit('.', 1)[-1].lower() if '.' in nombre_archivo else ''
+
+
+def _numero(valor):
+    """
+    Convierte montos como 3500, '3500.50', '3500,50', '3.500,50' o '3.500'
+
+    Con coma, la coma es el separador decimal y los puntos son de miles. Sin
+    coma, un punto seguido de exactamente tres dígitos en cada grupo
+    ('3.500', '1.250.000') es de miles; en otro caso ('3500.50') es decimal.
+    """
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    texto = str(valor).strip()
+    if ',' in texto or MILES_CON_PUNTO.match(texto):
+        texto = texto.replace('.', '').replace(',', '.')
+    return float(texto)
+
+
+def validar_fila(fila):
+    """
+    Valida y normaliza los valores de una fila
+
+    Returns:
+        dict: Datos listos para crear el Empleado
+
+    Raises:
+        ValueError: Con la descripción del problema
+    """
+    datos = {}
+    for campo in ('nombre_completo', 'ci', 'cargo'):
+        valor = fila.get(campo)
+        # Las celdas numéricas de Excel (C.I.) llegan como int o float
+        if isinstance(valor, float) and valor.is_integer():
+            valor = int(valor)
+        valor = str(valor).strip() if valor is not None else ''
+        if not valor:
+            raise ValueError(f"{campo} vacío")
+        datos[campo] = valor
+
+    fecha = fila.get('fecha_ingreso')
+    if isinstance(fecha, (datetime, date)):
+        fecha = fecha.strftime("%d/%m/%Y")
+    else:
+        fecha = str(fecha or '').strip()
+        try:
+            datetime.strptime(fecha, "%d/%m/%Y")
+        except ValueError:
+            raise ValueError(f"fecha_ingreso inválida: '{fecha}' (use dd/mm/aaaa)")
+    datos['fecha_ingreso'] = fecha
+
+    sueldo = fila.get('sueldo')
+    try:
+        sueldo = _numero(sueldo)
+    except (TypeError, ValueError):
+        raise ValueError(f"sueldo inválido: '{sueldo}'")
+    if not math.isfinite(sueldo) or sueldo < 0:
+        raise ValueError(f"sueldo inválido: '{fila.get('sueldo')}'")
+    datos['sueldo'] = sueldo
+    return datos
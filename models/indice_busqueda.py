@@ -0,0 +1,143 @@
+"""
+Índice de búsqueda de empleados
+Índice invertido de trigramas sobre el nombre y el C.I. normalizados (sin
+acentos ni mayúsculas), mantenido de forma incremental por EmpleadoManager
+
+Una consulta se divide en palabras; cada palabra debe aparecer como
+subcadena del nombre o del C.I. Los trigramas reducen los candidatos y los
+resultados se ordenan: C.I. exacto, luego coincidencias al inicio de una
+palabra y por último coincidencias en medio de una palabra.
+"""
+
+import heapq
+import threading
+import unicodedata
+
+
+def normalizar(texto):
+    """Minúsculas, sin acentos ni espacios repetidos: 'Peréz  Ñuflo' -> 'perez nuflo'"""
+    descompuesto = unicodedata.normalize('NFKD', str(texto))
+    sin_acentos = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return ' '.join(sin_acentos.lower().split())
+
+
+def _trigramas_documento(texto):
+    """Trigramas de cada palabra con un espacio al inicio y al final"""
+    trigramas = set()
+    for palabra in texto.split():
+        rellena = f" {palabra} "
+        trigramas.update(rellena[i:i + 3] for i in range(len(rellena) - 2))
+    return trigramas
+
+
+def _trigramas_consulta(palabras):
+    """
+    Trigramas que debe contener un documento para coincidir con la consulta
+
+    Las palabras de tres o más letras exigen todos sus trigramas. Si la
+    consulta solo tiene palabras más cortas se buscan inicios de palabra
+    (' ab'); una sola letra no restringe los candidatos.
+    """
+    largas = [palabra for palabra in palabras if len(palabra) >= 3]
+    if largas:
+        return {palabra[i:i + 3] for palabra in largas for i in range(len(palabra) - 2)}
+    return {f" {palabra}" for palabra in palabras if len(palabra) == 2}
+
+
+class IndiceTrigramas:
+    """Índice invertido trigrama -> IDs de empleado"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._trigramas = {}
+        self._documentos = {}
+
+    def __len__(self):
+        return len(self._documentos)
+
+    def agregar(self, id_empleado, nombre, ci):
+        """Indexa (o reindexa) un empleado"""
+        with self._lock:
+            self._quitar(id_empleado)
+            nombre, ci = normalizar(nombre), normalizar(ci)
+            trigramas = _trigramas_documento(nombre) | _trigramas_documento(ci)
+            self._documentos[id_empleado] = (nombre, ci, trigramas)
+            for trigrama in trigramas:
+                self._trigramas.setdefault(trigrama, set()).add(id_empleado)
+
+    def quitar(self, id_empleado):
+        """Quita un empleado del índice"""
+        with self._lock:
+            self._quitar(id_empleado)
+
+    def _quitar(self, id_empleado):
+        documento = self._documentos.pop(id_empleado, None)
+        if documento is None:
+            return
+        for trigrama in documento[2]:
+            ids = self._trigramas.get(trigrama)
+            if ids is not None:
+                ids.discard(id_empleado)
+                if not ids:
+                    del self._trigramas[trigrama]
+
+    def limpiar(self):
+        """Vacía el índice"""
+        with self._lock:
+            self._trigramas = {}
+            self._documentos = {}
+
+    def _puntaje(self, palabras, consulta, nombre, ci):
+        """Puntaje de un candidato; None si alguna palabra no aparece"""
+        if ci == consulta:
+            return 100
+        puntaje = 0
+        nombre_relleno, ci_relleno = f" {nombre}", f" {ci}"
+        for palabra in palabras:
+            if f" {palabra}" in nombre_relleno or f" {palabra}" in ci_relleno:
+                puntaje += 2
+            elif palabra in nombre or palabra in ci:
+                puntaje += 1
+            else:
+                return None
+        if nombre.startswith(consulta):
+            puntaje += 1
+        return puntaje
+
+    def buscar(self, consulta, limite=10):
+        """
+        Busca empleados por nombre o C.I.
+
+        Args:
+            consulta: Texto de búsqueda (se normaliza)
+            limite: Cantidad máxima de resultados (None = todos)
+
+        Returns:
+            list: IDs de empleado ordenados por relevancia
+        """
+        consulta = normalizar(consulta)
+        palabras = consulta.split()
+        if not palabras:
+            return []
+
+        requeridos = _trigramas_consulta(palabras)
+
+        with self._lock:
+            if requeridos:
+                conjuntos = sorted((self._trigramas.get(t, set()) for t in requeridos), key=len)
+                candidatos = set(conjuntos[0]).intersection(*conjuntos[1:])
+            else:
+                candidatos = set(self._documentos)
+
+            resultados = []
+            for id_empleado in candidatos:
+                nombre, ci, _ = self._documentos[id_empleado]
+                puntaje = self._puntaje(palabras, consulta, nombre, ci)
+                if puntaje is not None:
+                    resultados.append((-puntaje, nombre, id_empleado))
+
+        if limite is None:
+            resultados.sort()
+        else:
+            resultados = heapq.nsmallest(limite, resultados)
+        return [id_empleado for _, _, id_empleado in resultados]
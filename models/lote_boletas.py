@@ -0,0 +1,358 @@
+"""
+Lote columnar de boletas
+Guarda las boletas de un mismo tipo por columnas (listas de textos y
+arreglos NumPy tipados para montos, años y fechas) y calcula los totales y
+el líquido pagable de todas las filas a la vez
+
+Los cálculos siguen el mismo orden de operaciones que los modelos
+BoletaMensual, BoletaAguinaldo y BoletaLiquidacion, por lo que cada valor
+es idéntico al que calcula la boleta individual; para mostrarlos con dos
+decimales se usan formatear() y redondear(), que aplican el mismo redondeo
+de Python que las boletas y los PDFs.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from models.boleta_mensual import BoletaMensual
+from models.boleta_aguinaldo import BoletaAguinaldo
+from models.boleta_liquidacion import BoletaLiquidacion
+
+# Clase del modelo por tipo de boleta
+CLASES_BOLETA = {
+    'mensual': BoletaMensual,
+    'aguinaldo': BoletaAguinaldo,
+    'liquidacion': BoletaLiquidacion,
+}
+
+# Columnas guardadas por tipo: textos (listas), enteros y montos (arreglos)
+ESQUEMAS = {
+    'mensual': {
+        'textos': ('nombre_completo', 'ci', 'cargo', 'mes_pago', 'rango_fechas', 'numero_boleta',
+                   'metodo_pago'),
+        'enteros': ('anio',),
+        'montos': ('haber_basico', 'horas_extra', 'bono_antiguedad', 'otros_ingresos',
+                   'faltas', 'retrasos', 'reposiciones', 'otros_egresos'),
+    },
+    'aguinaldo': {
+        'textos': ('nombre_completo', 'ci', 'cargo', 'fecha_inicio', 'fecha_fin', 'fecha_ingreso',
+                   'numero_boleta', 'metodo_pago'),
+        'enteros': ('anio',),
+        'montos': ('promedio_ultimos_3_pagos', 'otros'),
+    },
+    'liquidacion': {
+        'textos': ('nombre_completo', 'ci', 'domicilio_trabajador', 'cargo', 'fecha_ingreso',
+                   'fecha_retiro', 'numero_boleta', 'metodo_pago'),
+        'enteros': (),
+        'montos': ('promedio_ultimos_3_sueldos', 'ultimo_sueldo', 'indemnizacion', 'aguinaldo',
+                   'vacaciones', 'otros_beneficios', 'anticipos', 'prestamos', 'otras_deducciones'),
+    },
+}
+
+# Claves de to_dict() por tipo, en el mismo orden que los modelos
+CLAVES_DICT = {
+    'mensual': ('nombre_completo', 'ci', 'cargo', 'mes_pago', 'anio', 'rango_fechas', 'haber_basico',
+                'horas_extra', 'bono_antiguedad', 'otros_ingresos', 'faltas', 'retrasos',
+                'reposiciones', 'otros_egresos', 'total_ingresos', 'total_egresos', 'liquido_pagable',
+                'numero_boleta', 'fecha_emision', 'metodo_pago'),
+    'aguinaldo': ('nombre_completo', 'ci', 'cargo', 'anio', 'fecha_inicio', 'fecha_fin', 'fecha_ingreso',
+                  'promedio_ultimos_3_pagos', 'otros', 'liquido_pagable', 'dias_trabajados',
+                  'meses_trabajados', 'numero_boleta', 'fecha_emision', 'metodo_pago'),
+    'liquidacion': ('nombre_completo', 'ci', 'domicilio_trabajador', 'cargo', 'fecha_ingreso',
+                    'fecha_retiro', 'tiempo_servicio', 'promedio_ultimos_3_sueldos', 'ultimo_sueldo',
+                    'indemnizacion', 'aguinaldo', 'vacaciones', 'otros_beneficios', 'total_beneficios',
+                    'anticipos', 'prestamos', 'otras_deducciones', 'total_deducciones',
+                    'liquido_pagable', 'numero_boleta', 'fecha_emision', 'metodo_pago'),
+}
+
+# Componentes de tiempo_servicio de la liquidación
+TIEMPO_SERVICIO = ('anios', 'meses', 'dias', 'total_dias')
+
+
+def formatear(valores):
+    """Formatea un arreglo de montos con dos decimales, igual que las boletas"""
+    return ['%.2f' % valor for valor in valores.tolist()]
+
+
+def redondear(valores):
+    """Redondea un arreglo de montos a dos decimales con round() de Python"""
+    return [round(valor, 2) for valor in valores.tolist()]
+
+
+def _fechas(textos):
+    """
+    Convierte textos dd/mm/aaaa en un arreglo datetime64[D]
+
+    Los textos vacíos o inválidos quedan como NaT. Cada fecha distinta se
+    interpreta una sola vez (en un lote casi todas se repiten).
+    """
+    posiciones = {}
+    convertidas = []
+    for texto in textos:
+        if texto not in posiciones:
+            posiciones[texto] = len(convertidas)
+            try:
+                convertidas.append(datetime.strptime(texto, "%d/%m/%Y").date() if texto else None)
+            except (TypeError, ValueError):
+                convertidas.append(None)
+    indices = np.fromiter((posiciones[texto] for texto in textos), dtype=np.intp, count=len(textos))
+    return np.array(convertidas, dtype='datetime64[D]')[indices]
+
+
+def _dias_entre(desde, hasta):
+    """
+    Días entre dos columnas de fechas dd/mm/aaaa
+
+    Returns:
+        tuple: (arreglo int64 de días, máscara de filas con ambas fechas válidas)
+    """
+    inicio, fin = _fechas(desde), _fechas(hasta)
+    validas = ~(np.isnat(inicio) | np.isnat(fin))
+    dias = np.where(validas, (fin - inicio).astype(np.int64), 0)
+    return dias, validas
+
+
+def _totales_mensual(lote):
+    """Totales de la boleta mensual (BoletaMensual.calcular_*)"""
+    total_ingresos = (lote.columna('haber_basico') + lote.columna('horas_extra')
+                      + lote.columna('bono_antiguedad') + lote.columna('otros_ingresos'))
+    total_egresos = (lote.columna('faltas') + lote.columna('retrasos')
+                     + lote.columna('reposiciones') + lote.columna('otros_egresos'))
+    return {
+        'total_ingresos': total_ingresos,
+        'total_egresos': total_egresos,
+        'liquido_pagable': total_ingresos - total_egresos,
+    }
+
+
+def _liquido_aguinaldo(lote):
+    """Líquido pagable del aguinaldo (BoletaAguinaldo.calcular_liquido_pagable)"""
+    return {'liquido_pagable': lote.columna('promedio_ultimos_3_pagos') + lote.columna('otros')}
+
+
+def _tiempo_aguinaldo(lote):
+    """Días y meses trabajados (BoletaAguinaldo.calcular_dias_trabajados y calcular_meses_trabajados)"""
+    dias, validas = _dias_entre(lote.columna('fecha_inicio'), lote.columna('fecha_fin'))
+    dias = np.where(validas, dias + 1, 0)
+    # round(dias / 30, 1): dias / 3 nunca termina en ,5, así que el entero
+    # más cercano se obtiene sin ambigüedad con aritmética entera (el signo
+    # se copia para conservar el -0.0 que da round con pocos días negativos)
+    return {
+        'dias_trabajados': dias,
+        'meses_trabajados': np.copysign(((2 * dias + 3) // 6) / 10, dias),
+    }
+
+
+def _totales_liquidacion(lote):
+    """Totales de la liquidación (BoletaLiquidacion.calcular_total_* y calcular_liquido_pagable)"""
+    total_beneficios = (lote.columna('indemnizacion') + lote.columna('aguinaldo')
+                        + lote.columna('vacaciones') + lote.columna('otros_beneficios'))
+    total_deducciones = (lote.columna('anticipos') + lote.columna('prestamos')
+                         + lote.columna('otras_deducciones'))
+    return {
+        'total_beneficios': total_beneficios,
+        'total_deducciones': total_deducciones,
+        'liquido_pagable': total_beneficios - total_deducciones,
+    }
+
+
+def _tiempo_liquidacion(lote):
+    """Tiempo de servicio (BoletaLiquidacion.calcular_tiempo_servicio)"""
+    total_dias, _ = _dias_entre(lote.columna('fecha_ingreso'), lote.columna('fecha_retiro'))
+    anios, dias_restantes = np.divmod(total_dias, 365)
+    meses, dias = np.divmod(dias_restantes, 30)
+    return {'anios': anios, 'meses': meses, 'dias': dias, 'total_dias': total_dias}
+
+
+# Columnas calculadas por tipo: cada función calcula un grupo de columnas,
+# solo cuando se pide alguna de ellas (las fechas no se leen si no hacen falta)
+CALCULOS = {
+    'mensual': {columna: _totales_mensual for columna in ('total_ingresos', 'total_egresos', 'liquido_pagable')},
+    'aguinaldo': {
+        'liquido_pagable': _liquido_aguinaldo,
+        'dias_trabajados': _tiempo_aguinaldo,
+        'meses_trabajados': _tiempo_aguinaldo,
+    },
+    'liquidacion': {
+        **{columna: _totales_liquidacion for columna in ('total_beneficios', 'total_deducciones', 'liquido_pagable')},
+        **{columna: _tiempo_liquidacion for columna in TIEMPO_SERVICIO},
+    },
+}
+
+
+class LoteBoletas:
+    """Boletas de un mismo tipo guardadas por columnas"""
+
+    def __init__(self, tipo, columnas, fecha_emision=None):
+        """
+        Inicializa el lote
+
+        Las columnas que falten toman el valor por defecto del modelo.
+
+        Args:
+            tipo: 'mensual', 'aguinaldo' o 'liquidacion'
+            columnas: Diccionario {campo: lista o arreglo}, todas del mismo largo
+            fecha_emision: Arreglo datetime64 o lista de datetime (por defecto, ahora)
+        """
+        if tipo not in ESQUEMAS:
+            raise ValueError(f"Tipo de boleta desconocido: {tipo}")
+        esquema = ESQUEMAS[tipo]
+        desconocidas = set(columnas) - set(esquema['textos'] + esquema['enteros'] + esquema['montos'])
+        if desconocidas:
+            raise ValueError(f"Columnas desconocidas para {tipo}: {', '.join(sorted(desconocidas))}")
+
+        largos = {len(valores) for valores in columnas.values()}
+        if fecha_emision is not None:
+            largos.add(len(fecha_emision))
+        if len(largos) > 1:
+            raise ValueError("Todas las columnas del lote deben tener el mismo largo")
+        filas = largos.pop() if largos else 0
+
+        self.tipo = tipo
+        self._filas = filas
+        self._calculadas = {}
+        defecto = CLASES_BOLETA[tipo]()
+        self._columnas = {}
+        for campo in esquema['textos']:
+            valores = columnas.get(campo)
+            self._columnas[campo] = list(valores) if valores is not None else [getattr(defecto, campo)] * filas
+        for campo in esquema['enteros']:
+            valores = columnas.get(campo)
+            self._columnas[campo] = (np.asarray(valores, dtype=np.int64) if valores is not None
+                                     else np.full(filas, getattr(defecto, campo), dtype=np.int64))
+        for campo in esquema['montos']:
+            valores = columnas.get(campo)
+            self._columnas[campo] = (np.asarray(valores, dtype=np.float64) if valores is not None
+                                     else np.full(filas, getattr(defecto, campo), dtype=np.float64))
+        self.fecha_emision = (np.asarray(fecha_emision, dtype='datetime64[us]') if fecha_emision is not None
+                              else np.full(filas, defecto.fecha_emision, dtype='datetime64[us]'))
+
+    @classmethod
+    def desde_boletas(cls, tipo, boletas):
+        """Crea el lote a partir de boletas individuales del tipo indicado"""
+        esquema = ESQUEMAS[tipo]
+        columnas = {campo: [getattr(boleta, campo) for boleta in boletas]
+                    for campo in esquema['textos'] + esquema['enteros'] + esquema['montos']}
+        return cls(tipo, columnas, [boleta.fecha_emision for boleta in boletas])
+
+    @classmethod
+    def desde_filas(cls, tipo, campos, filas):
+        """
+        Crea el lote a partir de tuplas con los valores de campos, en orden
+
+        Args:
+            tipo: Tipo de boleta
+            campos: Nombres de las columnas de cada tupla
+            filas: Lista de tuplas (por ejemplo, filas de una consulta SQL)
+        """
+        columnas = list(zip(*filas)) if filas else [()] * len(campos)
+        return cls(tipo, dict(zip(campos, columnas)))
+
+    def __len__(self):
+        return self._filas
+
+    def columna(self, nombre):
+        """
+        Retorna una columna guardada o calculada
+
+        Las columnas calculadas (totales, líquido pagable, tiempo de servicio)
+        se calculan para todas las filas la primera vez que se piden.
+
+        Returns:
+            list o numpy.ndarray: Valores de la columna, uno por fila
+        """
+        if nombre == 'fecha_emision':
+            return self.fecha_emision
+        if nombre in self._columnas:
+            return self._columnas[nombre]
+        if nombre not in self._calculadas:
+            calculo = CALCULOS[self.tipo].get(nombre)
+            if calculo is None:
+                raise KeyError(f"Columna desconocida para {self.tipo}: {nombre}")
+            self._calculadas.update(calculo(self))
+        return self._calculadas[nombre]
+
+    def asignar(self, nombre, valores):
+        """Reemplaza una columna de texto (por ejemplo, los números de boleta asignados)"""
+        if nombre not in ESQUEMAS[self.tipo]['textos']:
+            raise ValueError(f"Solo se pueden asignar columnas de texto: {nombre}")
+        if len(valores) != self._filas:
+            raise ValueError("La columna debe tener una entrada por fila")
+        self._columnas[nombre] = list(valores)
+
+    def tomar(self, indices):
+        """
+        Retorna un lote con las filas indicadas
+
+        Args:
+            indices: slice, o lista de posiciones en el orden deseado
+        """
+        if isinstance(indices, slice):
+            columnas = {campo: valores[indices] for campo, valores in self._columnas.items()}
+            return LoteBoletas(self.tipo, columnas, self.fecha_emision[indices])
+        posiciones = np.asarray(indices, dtype=np.intp)
+        columnas = {}
+        for campo, valores in self._columnas.items():
+            columnas[campo] = (valores[posiciones] if isinstance(valores, np.ndarray)
+                               else [valores[i] for i in posiciones.tolist()])
+        return LoteBoletas(self.tipo, columnas, self.fecha_emision[posiciones])
+
+    def dividir(self, partes):
+        """Divide el lote en hasta partes lotes consecutivos de tamaño similar"""
+        partes = max(1, min(partes, self._filas))
+        limites = np.linspace(0, self._filas, partes + 1).astype(int).tolist()
+        return [self.tomar(slice(inicio, fin)) for inicio, fin in zip(limites, limites[1:])]
+
+    def boleta(self, i):
+        """Crea la boleta individual de la fila i"""
+        boleta = CLASES_BOLETA[self.tipo]()
+        for campo, valores in self._columnas.items():
+            valor = valores[i]
+            setattr(boleta, campo, valor.item() if isinstance(valores, np.ndarray) else valor)
+        boleta.fecha_emision = self.fecha_emision[i].item()
+        return boleta
+
+    def boletas(self):
+        """Crea las boletas individuales de todas las filas, en orden"""
+        columnas = {campo: valores.tolist() if isinstance(valores, np.ndarray) else valores
+                    for campo, valores in self._columnas.items()}
+        fechas = self.fecha_emision.tolist()
+        clase = CLASES_BOLETA[self.tipo]
+        boletas = []
+        for i in range(self._filas):
+            boleta = clase()
+            for campo, valores in columnas.items():
+                setattr(boleta, campo, valores[i])
+            boleta.fecha_emision = fechas[i]
+            boletas.append(boleta)
+        return boletas
+
+    def filas(self):
+        """
+        Recorre las filas como diccionarios iguales a los de to_dict()
+
+        Los totales salen de las columnas calculadas para todo el lote.
+
+        Yields:
+            dict: Datos de una boleta
+        """
+        claves = CLAVES_DICT[self.tipo]
+        columnas = {}
+        for clave in claves:
+            if clave == 'tiempo_servicio':
+                partes = [self.columna(parte).tolist() for parte in TIEMPO_SERVICIO]
+                columnas[clave] = [dict(zip(TIEMPO_SERVICIO, valores)) for valores in zip(*partes)]
+            elif clave == 'fecha_emision':
+                fechas = self.fecha_emision.astype('datetime64[D]').tolist()
+                textos = {fecha: fecha.strftime("%d/%m/%Y") for fecha in set(fechas)}
+                columnas[clave] = [textos[fecha] for fecha in fechas]
+            else:
+                valores = self.columna(clave)
+                columnas[clave] = valores.tolist() if isinstance(valores, np.ndarray) else valores
+        for valores in zip(*(columnas[clave] for clave in claves)):
+            yield dict(zip(claves, valores))
+
+    def sumas(self, nombres):
+        """Retorna la suma de cada columna numérica indicada"""
+        return np.array([self.columna(nombre).sum() for nombre in nombres])
@@ -0,0 +1,361 @@
+"""
+Registro de boletas generadas
+Guarda los datos (to_dict) de cada boleta emitida en una base SQLite
+indexada por número, C.I., tipo y período, junto con el motor de
+renderizado y una copia de los datos de empresa y del logo vigentes, para
+poder listar las boletas de un empleado o de un período y volver a generar
+un PDF idéntico aunque el archivo ya no esté en output/
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from models.lote_boletas import CLASES_BOLETA
+
+# Número de mes por nombre, para el período de la boleta mensual
+MESES = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6, 'julio': 7,
+    'agosto': 8, 'septiembre': 9, 'setiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12,
+}
+
+# Tamaño máximo de una página de consulta
+MAX_PAGINA = 1000
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS boletas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    numero_boleta TEXT NOT NULL UNIQUE,
+    tipo TEXT NOT NULL,
+    ci TEXT NOT NULL,
+    nombre_completo TEXT NOT NULL,
+    periodo TEXT NOT NULL,
+    fecha_emision TEXT NOT NULL,
+    liquido_pagable REAL NOT NULL,
+    filename TEXT NOT NULL,
+    motor TEXT NOT NULL,
+    empresa TEXT NOT NULL,
+    datos TEXT NOT NULL,
+    creado REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_boletas_ci ON boletas (ci, id);
+CREATE INDEX IF NOT EXISTS idx_boletas_periodo ON boletas (periodo, id);
+CREATE INDEX IF NOT EXISTS idx_boletas_tipo_periodo ON boletas (tipo, periodo, id);
+CREATE INDEX IF NOT EXISTS idx_boletas_filename ON boletas (filename);
+CREATE TABLE IF NOT EXISTS empresas (
+    huella TEXT PRIMARY KEY,
+    datos TEXT NOT NULL,
+    logo BLOB
+);
+"""
+
+# Columnas que se devuelven en los listados (sin los datos completos)
+RESUMEN = ("id, numero_boleta, tipo, ci, nombre_completo, periodo, fecha_emision, "
+           "liquido_pagable, filename, motor, creado")
+
+
+def periodo_de(tipo, boleta):
+    """
+    Retorna el período AAAA-MM de una boleta
+
+    La boleta mensual usa su mes de pago y año; si el mes no se reconoce, y
+    para aguinaldo y liquidación, se usa la fecha de emisión.
+    """
+    if tipo == 'mensual':
+        mes = MESES.get(str(boleta.mes_pago).strip().lower())
+        if mes:
+            return f"{int(boleta.anio):04d}-{mes:02d}"
+    return boleta.fecha_emision.strftime("%Y-%m")
+
+
+def rango_periodo(periodo):
+    """
+    Convierte 'AAAA' o 'AAAA-MM' en el rango de períodos que abarca
+
+    Returns:
+        tuple: (desde, hasta) inclusive
+    """
+    try:
+        if len(periodo) == 4:
+            int(periodo)
+            return f"{periodo}-01", f"{periodo}-12"
+        datetime.strptime(periodo, "%Y-%m")
+        return periodo, periodo
+    except ValueError:
+        raise ValueError(f"Período inválido: {periodo} (use AAAA o AAAA-MM)")
+
+
+class EmpresaRegistrada:
+    """
+    Datos de empresa y logo guardados con las boletas
+
+    Reemplaza a EmpresaConfig al regenerar un PDF: expone lo que usan las
+    cachés de recursos y de render, con una clave propia por huella.
+    """
+
+    def __init__(self, huella, datos, logo):
+        self.huella = huella
+        self.config_file = f"registro:{huella}"
+        self.version = 0
+        self._datos = datos
+        self._logo = logo
+
+    def get_empresa_data(self):
+        """Retorna los datos de la empresa"""
+        return self._datos
+
+    def leer_logo(self):
+        """Retorna los bytes del logo o None si no había logo"""
+        return self._logo
+
+
+class RegistroBoletas:
+    """Registro indexado de las boletas emitidas"""
+
+    def __init__(self, db_file="config/boletas.db"):
+        """
+        Inicializa el registro
+
+        Args:
+            db_file: Ruta de la base SQLite
+        """
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._esquema_listo = False
+        # Huellas de empresa ya guardadas por (config_file, version)
+        self._empresas = {}
+
+    def _conectar(self):
+        """Abre una conexión al registro, creando el esquema la primera vez"""
+        if not self._esquema_listo:
+            with self._lock:
+                if not self._esquema_listo:
+                    directorio = os.path.dirname(self.db_file)
+                    if directorio:
+                        os.makedirs(directorio, exist_ok=True)
+                    conn = sqlite3.connect(self.db_file, timeout=30)
+                    try:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(ESQUEMA)
+                    finally:
+                        conn.close()
+                    self._esquema_listo = True
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _huella_empresa(self, conn, empresa_config):
+        """Guarda los datos de empresa y el logo si son nuevos, y retorna su huella"""
+        datos = json.dumps(empresa_config.get_empresa_data(), sort_keys=True, ensure_ascii=False)
+        logo = empresa_config.leer_logo()
+        huella = hashlib.sha256(datos.encode('utf-8') + b'\0' + (logo or b'')).hexdigest()
+        conn.execute("INSERT OR IGNORE INTO empresas (huella, datos, logo) VALUES (?, ?, ?)",
+                     (huella, datos, logo))
+        return huella
+
+    def registrar(self, boletas, empresa_config, motor='platypus'):
+        """
+        Registra boletas emitidas en una sola transacción
+
+        Una boleta ya registrada (mismo número) se conserva tal cual: el
+        número es único y el primer registro es el de la emisión.
+
+        Args:
+            boletas: Lista de tuplas (tipo, boleta, filename)
+            empresa_config: Configuración con la que se generaron
+            motor: Motor de renderizado usado
+
+        Returns:
+            int: Cantidad de boletas nuevas en el registro
+        """
+        # La copia de empresa se guarda una sola vez por versión de la configuración
+        clave = (empresa_config.config_file, empresa_config.version)
+        ahora = time.time()
+        conn = self._conectar()
+        try:
+            with conn:
+                empresa = self._empresas.get(clave) or self._huella_empresa(conn, empresa_config)
+                filas = []
+                for tipo, boleta, filename in boletas:
+                    datos = boleta.to_dict()
+                    filas.append((
+                        boleta.numero_boleta, tipo, boleta.ci, boleta.nombre_completo,
+                        periodo_de(tipo, boleta), boleta.fecha_emision.strftime("%Y-%m-%d"),
+                        datos['liquido_pagable'], filename, motor, empresa,
+                        json.dumps(datos, ensure_ascii=False), ahora
+                    ))
+                antes = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO boletas (numero_boleta, tipo, ci, nombre_completo, periodo, "
+                    "fecha_emision, liquido_pagable, filename, motor, empresa, datos, creado) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    filas
+                )
+                nuevas = conn.total_changes - antes
+        finally:
+            conn.close()
+        self._empresas[clave] = empresa
+        return nuevas
+
+    def buscar(self, ci=None, tipo=None, periodo=None, limite=100, cursor=None):
+        """
+        Lista las boletas registradas, de la más reciente a la más antigua
+
+        Args:
+            ci: Filtra por C.I. del empleado
+            tipo: Filtra por tipo de boleta
+            periodo: Filtra por período 'AAAA' o 'AAAA-MM'
+            limite: Tamaño de la página (máximo MAX_PAGINA)
+            cursor: Valor 'siguiente' de la página anterior
+
+        Returns:
+            tuple: (lista de boletas sin los datos completos, cursor siguiente o None)
+        """
+        condiciones = []
+        parametros = []
+        if ci:
+            condiciones.append("ci = ?")
+            parametros.append(ci)
+        if tipo:
+            if tipo not in CLASES_BOLETA:
+                raise ValueError(f"Tipo de boleta inválido: {tipo}")
+            condiciones.append("tipo = ?")
+            parametros.append(tipo)
+        if periodo:
+            desde, hasta = rango_periodo(periodo)
+            condiciones.append("periodo BETWEEN ? AND ?")
+            parametros.extend((desde, hasta))
+        if cursor:
+            condiciones.append("id < ?")
+            parametros.append(int(cursor))
+        limite = max(1, min(int(limite), MAX_PAGINA))
+
+        consulta = f"SELECT {RESUMEN} FROM boletas"
+        if condiciones:
+            consulta += " WHERE " + " AND ".join(condiciones)
+        consulta += " ORDER BY id DESC LIMIT ?"
+
+        conn = self._conectar()
+        try:
+            filas = conn.execute(consulta, parametros + [limite + 1]).fetchall()
+        finally:
+            conn.close()
+        boletas = [dict(fila) for fila in filas[:limite]]
+        siguiente = str(boletas[-1]['id']) if len(filas) > limite else None
+        return boletas, siguiente
+
+    def bloques_mensuales(self, periodo, campos, tamano=1000):
+        """
+        Recorre en bloques las boletas mensuales de un período, en orden de emisión
+
+        Si a un empleado se le emitió más de una boleta en el período (una
+        boleta corregida vuelve a emitirse con otro número), solo se incluye
+        la última, para que cada empleado figure una vez. Los montos se
+        extraen en la consulta (json_extract), así cada fila llega como una
+        tupla y no hace falta decodificar los datos completos.
+
+        Args:
+            periodo: Período 'AAAA-MM'
+            campos: Nombres de los montos a extraer de los datos
+            tamano: Filas por bloque
+
+        Yields:
+            list: Tuplas (numero_boleta, ci, nombre_completo, cargo, *montos)
+        """
+        montos = ", ".join("COALESCE(json_extract(datos, ?), 0)" for _ in campos)
+        consulta = (f"SELECT numero_boleta, ci, nombre_completo, COALESCE(json_extract(datos, '$.cargo'), ''), {montos} "
+                    "FROM boletas WHERE id IN (SELECT MAX(id) FROM boletas "
+                    "WHERE tipo = 'mensual' AND periodo = ? GROUP BY ci) ORDER BY id")
+        conn = self._conectar()
+        conn.row_factory = None
+        try:
+            cursor = conn.execute(consulta, [f"$.{campo}" for campo in campos] + [periodo])
+            while True:
+                filas = cursor.fetchmany(tamano)
+                if not filas:
+                    break
+                yield filas
+        finally:
+            conn.close()
+
+    def archivos_registrados(self, filenames):
+        """
+        Retorna cuáles de los nombres de archivo son el PDF individual de una boleta registrada
+
+        Args:
+            filenames: Lista de nombres de archivo (a lo sumo unos cientos por llamada)
+
+        Returns:
+            set: Nombres registrados
+        """
+        if not filenames:
+            return set()
+        marcadores = ", ".join("?" for _ in filenames)
+        conn = self._conectar()
+        try:
+            filas = conn.execute(f"SELECT filename FROM boletas WHERE filename IN ({marcadores})",
+                                 list(filenames)).fetchall()
+        finally:
+            conn.close()
+        return {fila['filename'] for fila in filas}
+
+    def _obtener(self, columna, valor):
+        """Retorna la boleta registrada con sus datos completos, o None"""
+        conn = self._conectar()
+        try:
+            fila = conn.execute(
+                f"SELECT {RESUMEN}, empresa, datos FROM boletas WHERE {columna} = ? ORDER BY id LIMIT 1",
+                (valor,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if fila is None:
+            return None
+        boleta = dict(fila)
+        boleta['datos'] = json.loads(boleta['datos'])
+        return boleta
+
+    def obtener(self, numero_boleta):
+        """Retorna la boleta registrada con ese número, o None"""
+        return self._obtener('numero_boleta', numero_boleta)
+
+    def obtener_archivo(self, filename):
+        """Retorna la boleta registrada cuyo PDF individual es filename, o None"""
+        return self._obtener('filename', filename)
+
+    def empresa(self, huella):
+        """
+        Retorna los datos de empresa guardados con una boleta
+
+        Returns:
+            EmpresaRegistrada: Configuración para regenerar el PDF
+        """
+        conn = self._conectar()
+        try:
+            fila = conn.execute("SELECT datos, logo FROM empresas WHERE huella = ?", (huella,)).fetchone()
+        finally:
+            conn.close()
+        if fila is None:
+            raise ValueError(f"Datos de empresa no registrados: {huella}")
+        return EmpresaRegistrada(huella, json.loads(fila['datos']), fila['logo'])
+
+    def reconstruir(self, registro):
+        """
+        Reconstruye la boleta y la configuración de empresa de un registro
+
+        Args:
+            registro: Resultado de obtener() u obtener_archivo()
+
+        Returns:
+            tuple: (boleta, EmpresaRegistrada)
+        """
+        boleta = CLASES_BOLETA[registro['tipo']].from_dict(registro['datos'])
+        return boleta, self.empresa(registro['empresa'])
+
+
+# Instancia compartida por todo el proceso
+registro_boletas = RegistroBoletas()
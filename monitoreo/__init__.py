@@ -0,0 +1 @@
+# Monitoreo module
@@ -0,0 +1,369 @@
+"""
+Métricas de la aplicación en formato de texto de Prometheus
+Cada proceso acumula sus métricas en memoria y las vuelca a un archivo JSON
+propio en un directorio compartido; el endpoint /metrics suma los archivos
+de todos los procesos (workers de gunicorn y procesos del lote)
+
+Los archivos de procesos que ya terminaron se compactan en un acumulado
+para que los contadores no retrocedan.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Directorio compartido por todos los procesos de la aplicación
+DIRECTORIO = os.environ.get('BOLETAS_METRICAS_DIR', os.path.join('config', 'metricas'))
+
+# Cada cuánto se vuelcan a disco las métricas con cambios, en segundos
+INTERVALO_VOLCADO = 5.0
+
+# Límites de los buckets de latencia, en segundos
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+ARCHIVO_ACUMULADO = 'acumulado.json'
+ARCHIVO_BLOQUEO = 'compactacion.lock'
+
+# Espera máxima por el bloqueo de compactación, y antigüedad a partir de la
+# cual se considera abandonado, en segundos
+ESPERA_BLOQUEO = 5.0
+BLOQUEO_ABANDONADO = 60.0
+
+# Nombre: (tipo, descripción)
+DESCRIPCIONES = {
+    'boletas_http_requests_total': ('counter', 'Peticiones HTTP atendidas por ruta, método y estado'),
+    'boletas_http_request_duration_seconds': ('histogram', 'Latencia de las peticiones HTTP por ruta'),
+    'boletas_errores_total': ('counter', 'Respuestas con error (estado >= 400) por ruta y estado'),
+    'boletas_excepciones_total': ('counter', 'Excepciones no controladas por ruta y tipo'),
+    'boletas_pdfs_generados_total': ('counter', 'PDFs renderizados por tipo'),
+    'boletas_pdf_bytes_escritos_total': ('counter', 'Bytes de PDF escritos en output/ por tipo'),
+    'boletas_pdfs_regenerados_total': ('counter', 'PDFs descartados regenerados desde el registro por tipo'),
+    'boletas_planillas_generadas_total': ('counter', 'Planillas de sueldos generadas por formato'),
+    'boletas_numeracion_total': ('counter', 'Números de boleta asignados'),
+    'boletas_cache_hits_total': ('counter', 'Aciertos por caché'),
+    'boletas_cache_misses_total': ('counter', 'Fallos por caché'),
+    'boletas_cache_hit_ratio': ('gauge', 'Proporción de aciertos por caché (todos los procesos)'),
+}
+
+
+def _proceso_vivo(pid):
+    """Indica si existe un proceso con el pid dado"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _clave(nombre, etiquetas):
+    """Clave hashable de una serie: (nombre, ((etiqueta, valor), ...))"""
+    return nombre, tuple(sorted((etiquetas or {}).items()))
+
+
+def _escapar(valor):
+    """Escapa el valor de una etiqueta para el formato de texto"""
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _formatear_etiquetas(etiquetas, extra=None):
+    """Formatea {k="v",...} a partir de una tupla de pares"""
+    pares = list(etiquetas) + (list(extra) if extra else [])
+    if not pares:
+        return ''
+    return '{' + ','.join(f'{k}="{_escapar(v)}"' for k, v in pares) + '}'
+
+
+def _formatear_numero(valor):
+    """Formatea un valor sin decimales innecesarios"""
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return repr(valor)
+
+
+class RegistroMetricas:
+    """Contadores e histogramas del proceso con agregación por directorio"""
+
+    def __init__(self, directorio=DIRECTORIO):
+        """
+        Args:
+            directorio: Carpeta compartida donde cada proceso vuelca sus métricas
+        """
+        self.directorio = directorio
+        self._lock = threading.Lock()
+        self._contadores = {}
+        self._histogramas = {}
+        self._colectores = []
+        self._base_colectores = {}
+        self._pid = None
+        self._archivo = None
+        self._sucio = False
+        self._hilo = None
+
+    def _preparar_proceso(self):
+        """Reinicia el estado si el registro se heredó de otro proceso (fork)"""
+        if self._pid != os.getpid():
+            # Los contadores de los colectores heredados por fork ya los reporta el padre
+            self._base_colectores = self._leer_colectores() if self._pid is not None else {}
+            self._pid = os.getpid()
+            self._archivo = os.path.join(self.directorio, f"{self._pid}_{time.time_ns()}.json")
+            self._contadores = {}
+            self._histogramas = {}
+            self._hilo = None
+
+    def incrementar(self, nombre, etiquetas=None, valor=1):
+        """Suma valor al contador nombre con las etiquetas dadas"""
+        clave = _clave(nombre, etiquetas)
+        with self._lock:
+            self._preparar_proceso()
+            self._contadores[clave] = self._contadores.get(clave, 0) + valor
+            self._marcar_cambio()
+
+    def observar(self, nombre, valor, etiquetas=None):
+        """Registra una observación en el histograma nombre"""
+        clave = _clave(nombre, etiquetas)
+        with self._lock:
+            self._preparar_proceso()
+            histograma = self._histogramas.get(clave)
+            if histograma is None:
+                # Un contador por bucket, más suma y cantidad al final
+                histograma = self._histogramas[clave] = [0] * len(BUCKETS_SEGUNDOS) + [0.0, 0]
+            for i, limite in enumerate(BUCKETS_SEGUNDOS):
+                if valor <= limite:
+                    histograma[i] += 1
+                    break
+            histograma[-2] += valor
+            histograma[-1] += 1
+            self._marcar_cambio()
+
+    def registrar_colector(self, colector):
+        """
+        Registra una función que retorna contadores acumulados del proceso
+
+        Args:
+            colector: Función sin argumentos que retorna una lista de
+                      tuplas (nombre, etiquetas, valor); se consulta en cada volcado
+        """
+        self._colectores.append(colector)
+
+    def _leer_colectores(self):
+        """Consulta los colectores: {(nombre, etiquetas): valor}"""
+        valores = {}
+        for colector in self._colectores:
+            for nombre, etiquetas, valor in colector():
+                valores[_clave(nombre, etiquetas)] = valor
+        return valores
+
+    def _marcar_cambio(self):
+        """Marca cambios pendientes y arranca el volcado periódico (con el lock tomado)"""
+        self._sucio = True
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._volcar_periodicamente, name="metricas", daemon=True)
+            self._hilo.start()
+
+    def _volcar_periodicamente(self):
+        """Vuelca las métricas con cambios cada INTERVALO_VOLCADO segundos"""
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(INTERVALO_VOLCADO)
+            if self._sucio:
+                try:
+                    self.volcar()
+                except OSError:
+                    pass
+
+    def volcar(self):
+        """Escribe las métricas del proceso en su archivo del directorio compartido"""
+        with self._lock:
+            self._preparar_proceso()
+            contadores = [[n, list(e), v] for (n, e), v in self._contadores.items()]
+            histogramas = [[n, list(e), list(h)] for (n, e), h in self._histogramas.items()]
+            archivo = self._archivo
+            base = self._base_colectores
+            self._sucio = False
+
+        for (nombre, etiquetas), valor in self._leer_colectores().items():
+            contadores.append([nombre, list(etiquetas), valor - base.get((nombre, etiquetas), 0)])
+
+        os.makedirs(self.directorio, exist_ok=True)
+        temporal = archivo + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'pid': os.getpid(), 'contadores': contadores, 'histogramas': histogramas}, f)
+        os.replace(temporal, archivo)
+
+    def volcar_pendiente(self):
+        """Vuelca solo si hay cambios sin escribir (al salir del proceso)"""
+        if self._sucio and self._pid == os.getpid():
+            try:
+                self.volcar()
+            except OSError:
+                pass
+
+    def _leer(self, ruta):
+        """Lee un archivo de métricas; None si no existe o está incompleto"""
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _sumar(self, total, datos):
+        """Suma las series de datos en total ({'contadores': {}, 'histogramas': {}})"""
+        for nombre, etiquetas, valor in datos.get('contadores', []):
+            clave = (nombre, tuple(tuple(par) for par in etiquetas))
+            total['contadores'][clave] = total['contadores'].get(clave, 0) + valor
+        for nombre, etiquetas, valores in datos.get('histogramas', []):
+            clave = (nombre, tuple(tuple(par) for par in etiquetas))
+            actual = total['histogramas'].get(clave)
+            if actual is None:
+                total['histogramas'][clave] = list(valores)
+            else:
+                total['histogramas'][clave] = [a + b for a, b in zip(actual, valores)]
+
+    def _serializar(self, total):
+        """Convierte un total agregado al formato de archivo"""
+        return {
+            'contadores': [[n, [list(p) for p in e], v] for (n, e), v in total['contadores'].items()],
+            'histogramas': [[n, [list(p) for p in e], h] for (n, e), h in total['histogramas'].items()]
+        }
+
+    @contextmanager
+    def _bloqueo(self):
+        """
+        Bloqueo entre procesos del acumulado y de los archivos de procesos terminados
+
+        Raises:
+            TimeoutError: Si otro proceso lo retiene más de ESPERA_BLOQUEO segundos
+        """
+        bloqueo = os.path.join(self.directorio, ARCHIVO_BLOQUEO)
+        limite = time.monotonic() + ESPERA_BLOQUEO
+        while True:
+            try:
+                descriptor = os.open(bloqueo, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                # Un bloqueo abandonado (proceso caído a mitad de la compactación) se descarta
+                try:
+                    if time.time() - os.path.getmtime(bloqueo) > BLOQUEO_ABANDONADO:
+                        os.remove(bloqueo)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > limite:
+                    raise TimeoutError("No se pudo tomar el bloqueo de las métricas")
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            os.close(descriptor)
+            os.remove(bloqueo)
+
+    def _compactar(self, acumulado, muertos):
+        """
+        Suma al acumulado los archivos de procesos terminados y los elimina (con el bloqueo tomado)
+
+        Args:
+            acumulado: Contenido actual de acumulado.json
+            muertos: Lista de tuplas (ruta, datos) de los procesos terminados
+        """
+        total = {'contadores': {}, 'histogramas': {}}
+        self._sumar(total, acumulado)
+        for _, datos in muertos:
+            self._sumar(total, datos)
+
+        ruta_acumulado = os.path.join(self.directorio, ARCHIVO_ACUMULADO)
+        temporal = ruta_acumulado + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self._serializar(total), f)
+        os.replace(temporal, ruta_acumulado)
+        for ruta, _ in muertos:
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+
+    def agregar(self):
+        """
+        Suma las métricas de todos los procesos
+
+        Los archivos se leen con el bloqueo de compactación tomado: el total
+        sale de un mismo estado del directorio, sin que otra consulta mueva
+        un proceso terminado al acumulado a mitad de la lectura (se contaría
+        dos veces o ninguna, y los contadores retrocederían). Los procesos
+        terminados se compactan a partir de esa misma lectura.
+
+        Returns:
+            dict: {'contadores': {(nombre, etiquetas): valor}, 'histogramas': {...}}
+        """
+        self.volcar()
+        total = {'contadores': {}, 'histogramas': {}}
+        acumulado = {}
+        muertos = []
+        with self._bloqueo():
+            for entrada in os.scandir(self.directorio):
+                if not entrada.name.endswith('.json'):
+                    continue
+                datos = self._leer(entrada.path)
+                if datos is None:
+                    continue
+                self._sumar(total, datos)
+                if entrada.name == ARCHIVO_ACUMULADO:
+                    acumulado = datos
+                    continue
+                pid = datos.get('pid')
+                if pid and pid != os.getpid() and not _proceso_vivo(pid):
+                    muertos.append((entrada.path, datos))
+
+            if muertos:
+                self._compactar(acumulado, muertos)
+        return total
+
+    def exportar(self):
+        """
+        Genera el texto de exposición de Prometheus con todos los procesos
+
+        Returns:
+            str: Métricas en formato de texto 0.0.4
+        """
+        total = self.agregar()
+
+        # Proporción de aciertos por caché a partir de los contadores sumados
+        for (nombre, etiquetas), hits in list(total['contadores'].items()):
+            if nombre == 'boletas_cache_hits_total':
+                misses = total['contadores'].get(('boletas_cache_misses_total', etiquetas), 0)
+                consultas = hits + misses
+                total['contadores'][('boletas_cache_hit_ratio', etiquetas)] = \
+                    round(hits / consultas, 4) if consultas else 0.0
+
+        series = {}
+        for (nombre, etiquetas), valor in total['contadores'].items():
+            series.setdefault(nombre, []).append((etiquetas, valor))
+        for (nombre, etiquetas), valores in total['histogramas'].items():
+            series.setdefault(nombre, []).append((etiquetas, valores))
+
+        lineas = []
+        for nombre in sorted(series):
+            tipo, ayuda = DESCRIPCIONES.get(nombre, ('untyped', nombre))
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} {tipo}")
+            for etiquetas, valor in sorted(series[nombre]):
+                if tipo == 'histogram':
+                    acumulado = 0
+                    for limite, cantidad in zip(BUCKETS_SEGUNDOS, valor):
+                        acumulado += cantidad
+                        lineas.append(f"{nombre}_bucket{_formatear_etiquetas(etiquetas, [('le', limite)])} {acumulado}")
+                    lineas.append(f"{nombre}_bucket{_formatear_etiquetas(etiquetas, [('le', '+Inf')])} {valor[-1]}")
+                    lineas.append(f"{nombre}_sum{_formatear_etiquetas(etiquetas)} {_formatear_numero(valor[-2])}")
+                    lineas.append(f"{nombre}_count{_formatear_etiquetas(etiquetas)} {valor[-1]}")
+                else:
+                    lineas.append(f"{nombre}{_formatear_etiquetas(etiquetas)} {_formatear_numero(valor)}")
+        return '\n'.join(lineas) + '\n'
+
+
+# Instancia compartida por todo el proceso
+metricas = RegistroMetricas()
+atexit.register(metricas.volcar_pendiente)
@@ -64,11 +64,81 @@ function getCurrentDate() {
     return `${day}/${month}/${year}`;
 }
 
+// Función para pedir sugerencias de empleados al servidor (typeahead)
+// Espera una pausa al escribir y descarta respuestas de consultas anteriores
+let sugerenciasTimer = null;
+let sugerenciasConsulta = 0;
+function sugerirEmpleados(termino, campos, callback) {
+    clearTimeout(sugerenciasTimer);
+    const consulta = ++sugerenciasConsulta;
+    sugerenciasTimer = setTimeout(async () => {
+        try {
+            const params = new URLSearchParams({ q: termino, limite: 10, campos: campos });
+            const response = await fetch(`/api/empleados/sugerencias?${params}`);
+            const result = await response.json();
+            if (result.success && consulta === sugerenciasConsulta) {
+                callback(result.empleados);
+            }
+        } catch (error) {
+            console.error('Error al buscar empleados:', error);
+        }
+    }, 150);
+}
+
+// Función para descartar la consulta de sugerencias pendiente
+function cancelarSugerencias() {
+    clearTimeout(sugerenciasTimer);
+    sugerenciasConsulta++;
+}
+
 // Función para descargar PDF
 function downloadPDF(filename) {
     window.location.href = `/api/download/${filename}`;
 }
 
+// Función para generar una boleta y recibir el PDF en la misma respuesta
+async function generarBoletaPDF(url, data) {
+    const response = await fetch(`${url}?directo=1`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(data)
+    });
+    
+    const contentType = response.headers.get('Content-Type') || '';
+    if (!response.ok || !contentType.includes('application/pdf')) {
+        return await response.json();
+    }
+    
+    return {
+        success: true,
+        message: 'Boleta generada correctamente',
+        numero_boleta: response.headers.get('X-Numero-Boleta'),
+        filename: obtenerNombreArchivo(response.headers.get('Content-Disposition')),
+        pdf: await response.blob()
+    };
+}
+
+// Función para obtener el nombre de archivo de la cabecera Content-Disposition
+function obtenerNombreArchivo(disposition) {
+    const utf8 = /filename\*=UTF-8''([^;]+)/i.exec(disposition || '');
+    if (utf8) return decodeURIComponent(utf8[1]);
+    const simple = /filename="?([^";]+)"?/i.exec(disposition || '');
+    return simple ? simple[1] : 'boleta.pdf';
+}
+
+// Función para descargar un PDF recibido en memoria
+function descargarBlob(blob, filename) {
+    const enlace = document.createElement('a');
+    enlace.href = URL.createObjectURL(blob);
+    enlace.download = filename;
+    document.body.appendChild(enlace);
+    enlace.click();
+    enlace.remove();
+    setTimeout(() => URL.revokeObjectURL(enlace.href), 1000);
+}
+
 // Inicialización cuando el DOM está listo
 document.addEventListener('DOMContentLoaded', function() {
     // Resaltar enlace activo en navegación
@@ -0,0 +1 @@
+# Tareas module
@@ -0,0 +1,344 @@
+"""
+Cola persistente de trabajos en segundo plano
+Los trabajos se guardan en SQLite y los procesan hilos del mismo proceso, de
+modo que la generación de PDFs no ocupa los workers HTTP y los trabajos
+pendientes sobreviven a un reinicio del servidor
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# Estados de un trabajo
+PENDIENTE = 'pendiente'
+EN_PROCESO = 'en_proceso'
+COMPLETADO = 'completado'
+ERROR = 'error'
+
+# Un trabajo interrumpido se reintenta hasta esta cantidad de veces
+MAX_INTENTOS = 3
+
+# Cada cuánto revisan la cola los hilos sin trabajo (trabajos de otros procesos)
+INTERVALO_SONDEO = 1.0
+
+# Tiempo máximo de un trabajo en proceso, en segundos, si su tipo no indica otro
+TIMEOUT_TRABAJO = 3600.0
+
+# Cada cuánto se buscan trabajos vencidos o de procesos caídos, en segundos
+INTERVALO_RECUPERACION = 30.0
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS trabajos (
+    id TEXT PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    estado TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    resultado TEXT,
+    error TEXT,
+    intentos INTEGER NOT NULL DEFAULT 0,
+    pid INTEGER,
+    creado REAL NOT NULL,
+    iniciado REAL,
+    finalizado REAL
+);
+CREATE INDEX IF NOT EXISTS idx_trabajos_estado ON trabajos (estado, creado);
+"""
+
+
+def _proceso_vivo(pid):
+    """Indica si existe un proceso con el pid dado"""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ColaTrabajos:
+    """Cola de trabajos en SQLite con un pool de hilos trabajadores"""
+
+    def __init__(self, db_file="config/trabajos.db", hilos=2):
+        """
+        Inicializa la cola
+
+        Args:
+            db_file: Ruta de la base de datos SQLite de trabajos
+            hilos: Cantidad de hilos trabajadores del proceso
+        """
+        self.db_file = db_file
+        self.hilos = hilos
+        self._manejadores = {}
+        self._timeouts = {}
+        self._despertar = threading.Condition()
+        self._detener = threading.Event()
+        self._workers = []
+        self._vigilante = None
+        self._crear_esquema()
+
+    def _conectar(self):
+        """Abre una conexión en modo autocommit (transacciones explícitas)"""
+        conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _crear_esquema(self):
+        """Crea la tabla de trabajos si no existe"""
+        directorio = os.path.dirname(self.db_file)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        conn = self._conectar()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(ESQUEMA)
+        finally:
+            conn.close()
+
+    def registrar(self, tipo, manejador, timeout=TIMEOUT_TRABAJO):
+        """
+        Registra la función que procesa un tipo de trabajo
+
+        Args:
+            tipo: Nombre del tipo de trabajo
+            manejador: Función que recibe el payload y retorna un dict serializable
+            timeout: Segundos tras los cuales un trabajo en proceso se da por
+                     colgado y se marca con error
+        """
+        self._manejadores[tipo] = manejador
+        self._timeouts[tipo] = timeout
+
+    def iniciar(self):
+        """Recupera los trabajos interrumpidos y arranca los hilos trabajadores"""
+        if self._workers:
+            return
+        self.recuperar()
+        for _ in range(self.hilos):
+            self._agregar_worker()
+        # Hilo aparte: los trabajadores pueden estar todos ocupados en trabajos colgados
+        self._vigilante = threading.Thread(target=self._vigilar, name="trabajos-vigilante", daemon=True)
+        self._vigilante.start()
+
+    def _agregar_worker(self):
+        """Arranca un hilo trabajador más"""
+        worker = threading.Thread(target=self._trabajar, name=f"trabajos-{len(self._workers)}", daemon=True)
+        worker.start()
+        self._workers.append(worker)
+
+    def detener(self, timeout=None):
+        """Detiene los hilos trabajadores al terminar el trabajo en curso"""
+        self._detener.set()
+        with self._despertar:
+            self._despertar.notify_all()
+        for worker in self._workers + ([self._vigilante] if self._vigilante else []):
+            worker.join(timeout)
+        self._workers = []
+        self._vigilante = None
+        self._detener.clear()
+
+    def recuperar(self, propios=True):
+        """
+        Vuelve a encolar los trabajos que quedaron en proceso en un proceso
+        que ya no existe (reinicio o caída del servidor), y marca con error los
+        que superaron el timeout de su tipo aunque su proceso siga vivo (por
+        ejemplo, un pool de procesos colgado)
+
+        Args:
+            propios: Si es True se recuperan también los trabajos con el pid de
+                     este proceso: al iniciar son de un proceso anterior que
+                     tuvo el mismo pid
+
+        Returns:
+            int: Cantidad de trabajos recuperados
+        """
+        ahora = time.time()
+        colgados = 0
+        conn = self._conectar()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            filas = conn.execute(
+                "SELECT id, tipo, pid, intentos, iniciado FROM trabajos WHERE estado = ?", (EN_PROCESO,)
+            ).fetchall()
+            recuperados = 0
+            for fila in filas:
+                timeout = self._timeouts.get(fila['tipo'], TIMEOUT_TRABAJO)
+                if fila['iniciado'] is not None and ahora - fila['iniciado'] > timeout:
+                    # El hilo que lo procesa no puede interrumpirse: si es de
+                    # este proceso se reemplaza por otro
+                    conn.execute(
+                        "UPDATE trabajos SET estado = ?, error = ?, finalizado = ? WHERE id = ?",
+                        (ERROR, f'Trabajo sin terminar después de {timeout:.0f} s', ahora, fila['id'])
+                    )
+                    if fila['pid'] == os.getpid() and not propios:
+                        colgados += 1
+                    continue
+                if (fila['pid'] != os.getpid() or not propios) and _proceso_vivo(fila['pid']):
+                    continue
+                if fila['intentos'] >= MAX_INTENTOS:
+                    conn.execute(
+                        "UPDATE trabajos SET estado = ?, error = ?, finalizado = ? WHERE id = ?",
+                        (ERROR, 'Trabajo interrumpido demasiadas veces', time.time(), fila['id'])
+                    )
+                else:
+                    conn.execute(
+                        "UPDATE trabajos SET estado = ?, pid = NULL, iniciado = NULL WHERE id = ?",
+                        (PENDIENTE, fila['id'])
+                    )
+                    recuperados += 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        for _ in range(colgados):
+            self._agregar_worker()
+        return recuperados
+
+    def encolar(self, tipo, payload):
+        """
+        Agrega un trabajo a la cola
+
+        Args:
+            tipo: Tipo de trabajo registrado
+            payload: Datos del trabajo (serializables a JSON)
+
+        Returns:
+            dict: Estado inicial del trabajo
+        """
+        if tipo not in self._manejadores:
+            raise ValueError(f"Tipo de trabajo desconocido: {tipo}")
+
+        trabajo_id = uuid.uuid4().hex
+        conn = self._conectar()
+        try:
+            conn.execute(
+                "INSERT INTO trabajos (id, tipo, estado, payload, creado) VALUES (?, ?, ?, ?, ?)",
+                (trabajo_id, tipo, PENDIENTE, json.dumps(payload, ensure_ascii=False), time.time())
+            )
+        finally:
+            conn.close()
+
+        with self._despertar:
+            self._despertar.notify()
+        return self.obtener(trabajo_id)
+
+    def obtener(self, trabajo_id):
+        """
+        Obtiene el estado de un trabajo
+
+        Returns:
+            dict: Datos del trabajo o None si no existe
+        """
+        conn = self._conectar()
+        try:
+            fila = conn.execute("SELECT * FROM trabajos WHERE id = ?", (trabajo_id,)).fetchone()
+            if fila is None:
+                return None
+            trabajo = {
+                'id': fila['id'],
+                'tipo': fila['tipo'],
+                'estado': fila['estado'],
+                'intentos': fila['intentos'],
+                'creado': fila['creado'],
+                'iniciado': fila['iniciado'],
+                'finalizado': fila['finalizado'],
+                'resultado': json.loads(fila['resultado']) if fila['resultado'] else None,
+                'error': fila['error']
+            }
+            if fila['estado'] == PENDIENTE:
+                # Posición en la cola (0 = el siguiente en procesarse)
+                trabajo['posicion'] = conn.execute(
+                    "SELECT COUNT(*) FROM trabajos WHERE estado = ? AND creado < ?",
+                    (PENDIENTE, fila['creado'])
+                ).fetchone()[0]
+            return trabajo
+        finally:
+            conn.close()
+
+    def _tomar_siguiente(self):
+        """Marca como en proceso el trabajo pendiente más antiguo y lo retorna"""
+        conn = self._conectar()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            fila = conn.execute(
+                "SELECT id, tipo, payload, intentos FROM trabajos WHERE estado = ? ORDER BY creado LIMIT 1",
+                (PENDIENTE,)
+            ).fetchone()
+            if fila is not None:
+                conn.execute(
+                    "UPDATE trabajos SET estado = ?, pid = ?, iniciado = ?, intentos = intentos + 1 WHERE id = ?",
+                    (EN_PROCESO, os.getpid(), time.time(), fila['id'])
+                )
+            conn.execute("COMMIT")
+            return fila
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _finalizar(self, trabajo_id, intento, estado, resultado=None, error=None):
+        """
+        Guarda el resultado o el error de un trabajo
+
+        Solo si sigue en proceso en el mismo intento: un trabajo recuperado
+        mientras tanto (timeout o proceso dado por caído) no se sobrescribe.
+        """
+        conn = self._conectar()
+        try:
+            conn.execute(
+                "UPDATE trabajos SET estado = ?, resultado = ?, error = ?, finalizado = ? "
+                "WHERE id = ? AND estado = ? AND intentos = ?",
+                (estado, json.dumps(resultado, ensure_ascii=False) if resultado is not None else None,
+                 error, time.time(), trabajo_id, EN_PROCESO, intento)
+            )
+        finally:
+            conn.close()
+
+    def procesar_siguiente(self):
+        """
+        Procesa un trabajo pendiente, si hay alguno
+
+        Returns:
+            bool: True si se procesó un trabajo
+        """
+        fila = self._tomar_siguiente()
+        if fila is None:
+            return False
+
+        intento = fila['intentos'] + 1
+        try:
+            resultado = self._manejadores[fila['tipo']](json.loads(fila['payload']))
+            self._finalizar(fila['id'], intento, COMPLETADO, resultado=resultado)
+        except Exception as e:
+            self._finalizar(fila['id'], intento, ERROR, error=str(e))
+        return True
+
+    def _trabajar(self):
+        """Ciclo de un hilo trabajador"""
+        while not self._detener.is_set():
+            try:
+                if self.procesar_siguiente():
+                    continue
+            except sqlite3.Error:
+                # Base ocupada por otro proceso: reintentar en el próximo ciclo
+                pass
+            with self._despertar:
+                self._despertar.wait(INTERVALO_SONDEO)
+
+    def _vigilar(self):
+        """Ciclo del hilo que recupera trabajos vencidos o de procesos caídos"""
+        while not self._detener.wait(INTERVALO_RECUPERACION):
+            try:
+                if self.recuperar(propios=False):
+                    with self._despertar:
+                        self._despertar.notify_all()
+            except sqlite3.Error:
+                pass